@@ -0,0 +1,12 @@
+-- ===================================================================
+-- MODEL VERSION COLUMN ON DETECTIONS
+-- Inference workers swap models without a restart and tag every
+-- detection with the version of the model that produced it.
+-- Apply to databases created before this column was added.
+-- ===================================================================
+
+ALTER TABLE detections ADD COLUMN IF NOT EXISTS model_version VARCHAR;
+
+CREATE INDEX IF NOT EXISTS idx_detections_model_version 
+ON detections(model_version);
+-- Purpose: Compare detections before and after a model rollout
@@ -0,0 +1,17 @@
+-- ===================================================================
+-- OBJECT TRACK COLUMNS ON DETECTIONS
+-- The inference worker tracks objects and stores one detection row per
+-- track event (start, periodic update, end) instead of one per frame.
+-- Apply to databases created before these columns were added.
+-- ===================================================================
+
+ALTER TABLE detections ADD COLUMN IF NOT EXISTS track_id VARCHAR;
+ALTER TABLE detections ADD COLUMN IF NOT EXISTS track_event VARCHAR;
+ALTER TABLE detections ADD COLUMN IF NOT EXISTS first_seen_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE detections ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE detections ADD COLUMN IF NOT EXISTS dwell_seconds FLOAT;
+ALTER TABLE detections ADD COLUMN IF NOT EXISTS frame_count INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_detections_track_id 
+ON detections(track_id);
+-- Purpose: All events (and dwell time) of one tracked object
@@ -0,0 +1,83 @@
+"""
+CPU core assignment for inference child processes
+Splits the cores this process may run on into one contiguous set per child,
+keeping hyper-threads of a physical core together
+"""
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+CPU_TOPOLOGY = Path('/sys/devices/system/cpu')
+
+
+def available_cpus() -> List[int]:
+    """Logical CPUs this process is allowed to run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _parse_cpu_list(text: str) -> List[int]:
+    """Parse a sysfs CPU list such as '0-3,8' or '2,18'"""
+    cpus = []
+    for part in text.strip().split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            cpus.extend(range(int(first), int(last) + 1))
+        elif part:
+            cpus.append(int(part))
+    return cpus
+
+
+def physical_cores() -> List[List[int]]:
+    """
+    Available logical CPUs grouped by physical core, e.g. [[0, 16], [1, 17], ...]
+
+    Falls back to one group per logical CPU where the topology is not
+    exposed (non-Linux, containers without sysfs).
+    """
+    cpus = available_cpus()
+    allowed = set(cpus)
+    cores, seen = [], set()
+    for cpu in cpus:
+        if cpu in seen:
+            continue
+        siblings_file = CPU_TOPOLOGY / f"cpu{cpu}" / "topology" / "thread_siblings_list"
+        try:
+            siblings = [c for c in _parse_cpu_list(siblings_file.read_text()) if c in allowed]
+        except (OSError, ValueError):
+            siblings = [cpu]
+        siblings = siblings or [cpu]
+        seen.update(siblings)
+        cores.append(siblings)
+    return cores
+
+
+def assign_cores(slot: int, processes: int) -> Tuple[List[int], int]:
+    """
+    Logical CPUs and default thread count for one child process
+
+    Physical cores are split evenly over the children; with more children
+    than physical cores, children share cores round-robin.
+
+    Args:
+        slot: Index of the child process (0 .. processes - 1)
+        processes: Total number of child processes
+
+    Returns:
+        (logical CPUs to pin to, one thread per physical core assigned)
+    """
+    cores = physical_cores()
+    processes = max(1, processes)
+    per_process = max(1, len(cores) // processes)
+    first = (slot * per_process) % len(cores)
+    assigned = cores[first:first + per_process]
+    return sorted(cpu for core in assigned for cpu in core), len(assigned)
+
+
+def pin_to_cpus(cpus: List[int]) -> bool:
+    """Restrict the current process to the given logical CPUs (Linux only)"""
+    if not cpus or not hasattr(os, 'sched_setaffinity'):
+        return False
+    os.sched_setaffinity(0, cpus)
+    return True
@@ -0,0 +1,196 @@
+"""
+Cross-camera micro-batching for the YOLO Inference Worker
+Collects frames from many cameras into a single batched predict call
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Set
+
+from loguru import logger
+
+
+class BatchStats:
+    """Throughput counters for one batch size"""
+
+    def __init__(self):
+        self.batches = 0
+        self.frames = 0
+        self.busy_seconds = 0.0
+
+    def record(self, frames: int, seconds: float):
+        self.batches += 1
+        self.frames += frames
+        self.busy_seconds += seconds
+
+    @property
+    def fps(self) -> float:
+        """Frames per second while inference was running"""
+        if self.busy_seconds <= 0:
+            return 0.0
+        return self.frames / self.busy_seconds
+
+    @property
+    def avg_latency_ms(self) -> float:
+        """Average wall time of one batched predict call"""
+        if self.batches == 0:
+            return 0.0
+        return self.busy_seconds / self.batches * 1000
+
+
+class _PendingFrame:
+    """A frame waiting for a slot in the next batch"""
+
+    __slots__ = ('frame', 'camera_id', 'group', 'future')
+
+    def __init__(self, frame: Any, camera_id: Any, group: Any, future: asyncio.Future):
+        self.frame = frame
+        self.camera_id = camera_id
+        self.group = group
+        self.future = future
+
+
+class FrameBatcher:
+    """
+    Micro-batching stage in front of the model
+    - Frames from any camera are queued via submit()
+    - A batch is dispatched once max_batch_size frames are queued,
+      or max_wait_ms after the first frame arrived
+    - Each caller gets back the result for its own frame
+    - Frames only share a batch with frames of the same group (e.g. the
+      same input size); others wait for the next batch
+    - Up to max_concurrent_batches batches run at once (e.g. one per
+      inference process); the next batch fills while they run
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any], Any], Awaitable[List[Any]]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20,
+        max_concurrent_batches: int = 1
+    ):
+        """
+        Args:
+            run_batch: Coroutine taking a list of frames and their group,
+                returning one result per frame, in the same order
+            max_batch_size: Upper bound on frames per predict call
+            max_wait_ms: How long to hold the first frame while waiting
+                for more frames to join its batch
+            max_concurrent_batches: Batches allowed to run at the same time
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self.queue: asyncio.Queue = asyncio.Queue()
+        # Frames taken off the queue while filling a batch of another group
+        self.deferred: Deque[_PendingFrame] = deque()
+        self.stats: Dict[int, BatchStats] = {}
+
+        # Running _dispatch tasks, referenced so they are not garbage-collected
+        self.dispatching: Set[asyncio.Task] = set()
+
+        # Overall throughput across concurrent batches
+        self.frames_done = 0
+        self.first_dispatch = None
+
+    async def submit(self, frame: Any, camera_id: Any = None, group: Any = None) -> Any:
+        """Queue a frame for the next batch of its group and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put(_PendingFrame(frame, camera_id, group, future))
+        return await future
+
+    async def run(self):
+        """Batch dispatch loop, runs for the lifetime of the worker"""
+        slots = asyncio.Semaphore(self.max_concurrent_batches)
+        while True:
+            # Only start collecting once a batch can actually be run
+            await slots.acquire()
+            batch = await self._collect_batch()
+            task = asyncio.create_task(self._dispatch(batch))
+            self.dispatching.add(task)
+            task.add_done_callback(self.dispatching.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _collect_batch(self) -> List[_PendingFrame]:
+        """
+        Wait for the first frame, then fill the batch with frames of the
+        same group until full or timed out
+
+        Deferred frames go first, so a group never waits behind newer frames.
+        """
+        loop = asyncio.get_running_loop()
+        first = self.deferred.popleft() if self.deferred else await self.queue.get()
+        batch = [first]
+        deadline = loop.time() + self.max_wait
+
+        still_deferred: Deque[_PendingFrame] = deque()
+        while self.deferred:
+            item = self.deferred.popleft()
+            if item.group == first.group and len(batch) < self.max_batch_size:
+                batch.append(item)
+            else:
+                still_deferred.append(item)
+        self.deferred = still_deferred
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self.queue.empty():
+                item = self.queue.get_nowait()
+            else:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            if item.group == first.group:
+                batch.append(item)
+            else:
+                self.deferred.append(item)
+
+        return batch
+
+    async def _dispatch(self, batch: List[_PendingFrame]):
+        """Run one batched predict call and route results back to callers"""
+        start = time.perf_counter()
+        if self.first_dispatch is None:
+            self.first_dispatch = start
+        try:
+            results = await self.run_batch([item.frame for item in batch], batch[0].group)
+        except Exception as e:
+            logger.error(f"❌ Batch inference failed ({len(batch)} frames): {e}")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        elapsed = time.perf_counter() - start
+        self.stats.setdefault(len(batch), BatchStats()).record(len(batch), elapsed)
+        self.frames_done += len(batch)
+
+        for item, result in zip(batch, results):
+            if not item.future.done():
+                item.future.set_result(result)
+
+    def overall_fps(self) -> float:
+        """Frames per second over all batches since the first dispatch"""
+        if self.first_dispatch is None:
+            return 0.0
+        elapsed = time.perf_counter() - self.first_dispatch
+        return self.frames_done / elapsed if elapsed > 0 else 0.0
+
+    def throughput_report(self) -> Dict[int, Dict[str, float]]:
+        """Per batch size throughput, keyed by batch size"""
+        return {
+            size: {
+                'batches': stats.batches,
+                'frames': stats.frames,
+                'fps': round(stats.fps, 1),
+                'avg_latency_ms': round(stats.avg_latency_ms, 1)
+            }
+            for size, stats in sorted(self.stats.items())
+        }
@@ -0,0 +1,108 @@
+"""
+Frame Decode Benchmark
+Compares full-size decode plus resize (what the model's letterbox did on
+every frame) with reduced-scale decode into reused buffers (decoding.py),
+per source resolution: time and bytes allocated per frame
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+
+from decoding import FrameDecoder
+
+RESOLUTIONS = {'720p': (1280, 720), '1080p': (1920, 1080), '1440p': (2560, 1440), '4k': (3840, 2160)}
+
+
+def make_jpeg(width: int, height: int, quality: int) -> bytes:
+    """Synthetic camera-like frame: gradients plus noise, so JPEG has real work to do"""
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    base = np.stack([x + 0 * y, y + 0 * x, (x + y) / 2], axis=-1)
+    frame = np.clip(base + rng.normal(0, 6, base.shape), 0, 255).astype(np.uint8)
+    ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return encoded.tobytes()
+
+
+def full_decode(jpeg: bytes, target: int) -> np.ndarray:
+    """Previous path: full decode, then a fresh resize to the model input"""
+    frame = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+    height, width = frame.shape[:2]
+    scale = target / max(height, width)
+    return cv2.resize(frame, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_LINEAR)
+
+
+def measure(decode, iterations: int):
+    """(ms per frame, peak KiB held by a decode) over iterations, after a warm-up call"""
+    decode()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode()
+    ms = (time.perf_counter() - start) / iterations * 1000
+
+    tracemalloc.start()
+    for _ in range(iterations):
+        decode()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--imgsz', type=int, default=640, help='Model input size')
+    parser.add_argument('--resolutions', nargs='+', choices=list(RESOLUTIONS), default=list(RESOLUTIONS))
+    parser.add_argument('--quality', type=int, default=85, help='JPEG quality of the test frames')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--json', type=Path, help='Write results to this file')
+    args = parser.parse_args()
+
+    print("🦁 Tadoba Wildlife Surveillance - Frame Decode Benchmark")
+    print("=" * 70)
+    print(f"Model input {args.imgsz}px, {args.iterations} frames per measurement")
+
+    results = []
+    for name in args.resolutions:
+        width, height = RESOLUTIONS[name]
+        jpeg = make_jpeg(width, height, args.quality)
+        decoder = FrameDecoder()
+
+        def reduced():
+            frame, _ = decoder.decode(1, jpeg, args.imgsz)
+            decoder.release(1, frame)
+            return frame
+
+        full_ms, full_peak = measure(lambda: full_decode(jpeg, args.imgsz), args.iterations)
+        reduced_ms, reduced_peak = measure(reduced, args.iterations)
+
+        results.append({
+            'resolution': name,
+            'jpeg_kb': round(len(jpeg) / 1024, 1),
+            'full_ms': round(full_ms, 2),
+            'reduced_ms': round(reduced_ms, 2),
+            'speedup': round(full_ms / reduced_ms, 2),
+            'full_peak_kb': round(full_peak, 1),
+            'reduced_peak_kb': round(reduced_peak, 1),
+            'buffers_allocated': decoder.buffers_allocated
+        })
+        print(f"   {name:>6}: full {full_ms:7.2f}ms, {full_peak:8.0f} KiB peak  |  "
+              f"reduced {reduced_ms:6.2f}ms, {reduced_peak:7.0f} KiB peak  "
+              f"({full_ms / reduced_ms:.1f}x, {decoder.buffers_allocated} buffers for "
+              f"{args.iterations * 2 + 1} frames)")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
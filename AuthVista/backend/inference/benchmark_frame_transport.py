@@ -0,0 +1,132 @@
+"""
+Frame Transport Benchmark
+Compares base64 JSON and binary attachment payloads for frame:ingest:
+bytes on the wire and CPU time per frame to encode and decode
+"""
+import argparse
+import base64
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+from socketio import packet
+
+sys.path.append(str(Path(__file__).parent))
+
+from frame_protocol import encode_frame_message, frame_bytes
+
+RESOLUTIONS = {
+    '480p': (640, 480),
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+}
+
+
+def make_jpeg(width: int, height: int, quality: int = 80) -> bytes:
+    """Synthetic camera-like frame: gradient, shapes and sensor noise"""
+    rng = np.random.default_rng(42)
+    gradient = np.linspace(40, 200, width, dtype=np.float32)
+    frame = np.repeat(np.tile(gradient, (height, 1))[:, :, None], 3, axis=2)
+    frame += rng.normal(0, 12, frame.shape)
+    frame = np.clip(frame, 0, 255).astype(np.uint8)
+    cv2.rectangle(frame, (width // 4, height // 4), (width // 2, height // 2), (30, 120, 30), -1)
+    cv2.circle(frame, (3 * width // 4, height // 2), height // 6, (20, 60, 160), -1)
+    ok, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buf.tobytes()
+
+
+def legacy_message(jpeg: bytes) -> dict:
+    return {
+        'frame': base64.b64encode(jpeg).decode('ascii'),
+        'camera_id': 1,
+        'geofence_id': 2,
+        'timestamp': datetime.utcnow().isoformat()
+    }
+
+
+def binary_message(jpeg: bytes) -> dict:
+    return encode_frame_message(jpeg, 1, datetime.utcnow().isoformat(), geofence_id=2)
+
+
+def encode_packet(message: dict):
+    """Serialize a frame:ingest event the way python-socketio puts it on the wire"""
+    return packet.Packet(packet.EVENT, data=['frame:ingest', message], namespace='/').encode()
+
+
+def decode_packet(encoded) -> dict:
+    """Parse a serialized event back into its payload"""
+    if isinstance(encoded, list):
+        pkt = packet.Packet(encoded_packet=encoded[0])
+        for attachment in encoded[1:]:
+            pkt.add_attachment(attachment)
+    else:
+        pkt = packet.Packet(encoded_packet=encoded)
+    return pkt.data[1]
+
+
+def wire_bytes(encoded) -> int:
+    if isinstance(encoded, list):
+        return sum(len(part.encode() if isinstance(part, str) else part) for part in encoded)
+    return len(encoded.encode())
+
+
+def measure(jpeg: bytes, build_message, iterations: int) -> dict:
+    """Bytes on the wire plus sender and receiver CPU time per frame"""
+    encoded = encode_packet(build_message(jpeg))
+    size = wire_bytes(encoded)
+
+    start = time.process_time()
+    for _ in range(iterations):
+        encode_packet(build_message(jpeg))
+    encode_us = (time.process_time() - start) / iterations * 1e6
+
+    start = time.process_time()
+    for _ in range(iterations):
+        frame_bytes(decode_packet(encoded))
+    decode_us = (time.process_time() - start) / iterations * 1e6
+
+    return {
+        'wire_bytes': size,
+        'overhead_pct': round((size / len(jpeg) - 1) * 100, 1),
+        'encode_us': round(encode_us, 1),
+        'decode_us': round(decode_us, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--json', type=Path, help='Write results to this file')
+    args = parser.parse_args()
+
+    print("🦁 Tadoba Wildlife Surveillance - Frame Transport Benchmark")
+    print("=" * 70)
+    print(f"{'frame':<8}{'format':<9}{'jpeg':>10}{'wire':>10}{'overhead':>10}"
+          f"{'encode':>11}{'decode':>11}")
+
+    results = {}
+    for name, (width, height) in RESOLUTIONS.items():
+        jpeg = make_jpeg(width, height)
+        results[name] = {'jpeg_bytes': len(jpeg)}
+
+        for fmt, build_message in (('base64', legacy_message), ('binary', binary_message)):
+            stats = measure(jpeg, build_message, args.iterations)
+            results[name][fmt] = stats
+            print(f"{name:<8}{fmt:<9}{len(jpeg):>10}{stats['wire_bytes']:>10}"
+                  f"{stats['overhead_pct']:>9}%"
+                  f"{stats['encode_us']:>9}us{stats['decode_us']:>9}us")
+
+    print("=" * 70)
+    print("encode = sender CPU per frame, decode = receiver CPU per frame (to JPEG bytes)")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
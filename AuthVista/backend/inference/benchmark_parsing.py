@@ -0,0 +1,111 @@
+"""
+YOLO Result Parsing Micro-Benchmark
+Compares the per-box parsing loop with whole-array parsing (parsing.py)
+on synthetic results with 1 to 300 boxes
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import torch
+from ultralytics.engine.results import Boxes
+
+sys.path.append(str(Path(__file__).parent))
+
+from classes import WILDLIFE_CLASSES
+from parsing import parse_result
+
+BOX_COUNTS = (1, 10, 50, 100, 200, 300)
+FRAME_SHAPE = (720, 1280)
+
+
+def parse_result_per_box(result, class_names):
+    """Previous implementation: tensor -> numpy round trip for every box"""
+    detections = []
+    for box in result.boxes:
+        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+        conf = float(box.conf[0].cpu().numpy())
+        cls_id = int(box.cls[0].cpu().numpy())
+        if cls_id not in class_names:
+            continue
+        width = x2 - x1
+        height = y2 - y1
+        detections.append({
+            'detection_class': class_names[cls_id],
+            'confidence': conf,
+            'bbox': {
+                'x': float(x1 + width / 2), 'y': float(y1 + height / 2),
+                'width': float(width), 'height': float(height),
+                'x1': float(x1), 'y1': float(y1), 'x2': float(x2), 'y2': float(y2)
+            }
+        })
+    return detections
+
+
+def make_result(num_boxes: int):
+    """Fake Results with random boxes over all 80 COCO classes"""
+    generator = torch.Generator().manual_seed(num_boxes)
+    height, width = FRAME_SHAPE
+    corners = torch.rand(num_boxes, 2, generator=generator) * torch.tensor([width - 100, height - 100])
+    sizes = torch.rand(num_boxes, 2, generator=generator) * 100 + 1
+    conf = torch.rand(num_boxes, 1, generator=generator)
+    cls = torch.randint(0, 80, (num_boxes, 1), generator=generator).float()
+    data = torch.cat([corners, corners + sizes, conf, cls], dim=1)
+    return SimpleNamespace(boxes=Boxes(data, FRAME_SHAPE))
+
+
+def time_per_call(fn, result, iterations: int) -> float:
+    """Mean wall time per call in microseconds"""
+    fn(result, WILDLIFE_CLASSES)  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(result, WILDLIFE_CLASSES)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--json', type=Path, help='Write results to this file')
+    args = parser.parse_args()
+
+    print("🦁 Tadoba Wildlife Surveillance - Result Parsing Benchmark")
+    print("=" * 70)
+    print(f"{'boxes':>6}{'kept':>6}{'per-box loop':>16}{'vectorized':>14}{'speedup':>10}")
+
+    results = []
+    for num_boxes in BOX_COUNTS:
+        result = make_result(num_boxes)
+
+        # Both implementations must agree before timing them
+        expected = parse_result_per_box(result, WILDLIFE_CLASSES)
+        actual = parse_result(result, WILDLIFE_CLASSES)
+        assert len(expected) == len(actual)
+        for old, new in zip(expected, actual):
+            assert old['detection_class'] == new['detection_class']
+            assert abs(old['bbox']['x'] - new['bbox']['x']) < 1e-3
+
+        loop_us = time_per_call(parse_result_per_box, result, args.iterations)
+        vector_us = time_per_call(parse_result, result, args.iterations)
+        results.append({
+            'boxes': num_boxes,
+            'kept': len(actual),
+            'per_box_us': round(loop_us, 1),
+            'vectorized_us': round(vector_us, 1),
+            'speedup': round(loop_us / vector_us, 1)
+        })
+        print(f"{num_boxes:>6}{len(actual):>6}{loop_us:>14.1f}us{vector_us:>12.1f}us"
+              f"{loop_us / vector_us:>9.1f}x")
+
+    print("=" * 70)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
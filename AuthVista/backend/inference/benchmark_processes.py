@@ -0,0 +1,89 @@
+"""
+Multi-Process Inference Benchmark
+Measures throughput of the process executor for increasing numbers of
+pinned child processes and reports how close it scales to linear
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import wait
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from affinity import physical_cores
+from classes import WILDLIFE_CLASSES, confidence_threshold
+from executors import create_inference_executor, inference_process_ready, predict_batch_in_process
+from runtime import RUNTIME_FORMATS, ensure_exported, load_sample_frames
+
+DEFAULT_MODEL = Path(__file__).parent.parent / "models" / "yolov8n.pt"
+DEFAULT_FRAMES = Path(__file__).parent.parent / "snapshots"
+CONFIDENCE_THRESHOLD = confidence_threshold()
+
+
+def measure(processes: int, args, frames) -> float:
+    """Frames per second with this many child processes, all kept busy"""
+    executor = create_inference_executor(
+        'process', processes, args.model, args.runtime,
+        warm_up_batch=args.batch_size, pin_cores=not args.no_pin
+    )
+    try:
+        # Start (and warm) every child before timing
+        wait([executor.submit(inference_process_ready) for _ in range(processes)])
+
+        batch = (frames * args.batch_size)[:args.batch_size]
+        batches = args.batches_per_process * processes
+        start = time.perf_counter()
+        wait([
+            executor.submit(predict_batch_in_process, batch, CONFIDENCE_THRESHOLD, WILDLIFE_CLASSES)
+            for _ in range(batches)
+        ])
+        return batches * len(batch) / (time.perf_counter() - start)
+    finally:
+        executor.shutdown(wait=True)
+
+
+def main():
+    cores = len(physical_cores())
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', default=str(DEFAULT_MODEL))
+    parser.add_argument('--runtime', choices=list(RUNTIME_FORMATS), default='torch')
+    parser.add_argument('--processes', type=int, nargs='+',
+                        default=sorted({n for n in (1, 2, 4, 8, 16, 32) if n <= cores} | {cores}),
+                        help='Child process counts to measure')
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--batches-per-process', type=int, default=10)
+    parser.add_argument('--frames', type=Path, default=DEFAULT_FRAMES,
+                        help='Directory of JPEGs to run (synthetic frames if empty)')
+    parser.add_argument('--no-pin', action='store_true', help='Do not pin children to cores')
+    parser.add_argument('--json', type=Path, help='Write results to this file')
+    args = parser.parse_args()
+
+    print("🦁 Tadoba Wildlife Surveillance - Multi-Process Inference Benchmark")
+    print("=" * 70)
+    print(f"🖥️ {cores} physical cores available, runtime {args.runtime}, "
+          f"batch size {args.batch_size}, pinning {'off' if args.no_pin else 'on'}")
+
+    # Export once up front so children never race to export
+    ensure_exported(args.model, args.runtime)
+    frames = load_sample_frames(args.frames, args.batch_size)
+
+    results = []
+    baseline = None
+    for processes in args.processes:
+        fps = measure(processes, args, frames)
+        baseline = baseline or fps / processes
+        efficiency = fps / (baseline * processes)
+        results.append({'processes': processes, 'fps': round(fps, 1),
+                        'scaling_efficiency': round(efficiency, 2)})
+        print(f"   {processes:>3} processes: {fps:8.1f} fps  ({efficiency:.0%} of linear)")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
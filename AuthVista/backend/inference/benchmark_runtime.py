@@ -0,0 +1,48 @@
+"""
+Inference Runtime Benchmark
+Compares predict latency of an exported CPU runtime (ONNX Runtime / OpenVINO)
+against the PyTorch baseline on the same frames
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from runtime import RUNTIME_FORMATS, compare_runtimes, load_sample_frames
+
+DEFAULT_MODEL = Path(__file__).parent.parent / "models" / "yolov8n.pt"
+DEFAULT_FRAMES = Path(__file__).parent.parent / "snapshots"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', default=str(DEFAULT_MODEL))
+    parser.add_argument('--runtime', choices=[r for r in RUNTIME_FORMATS if r != 'torch'],
+                        default='openvino')
+    parser.add_argument('--frames', type=Path, default=DEFAULT_FRAMES,
+                        help='Directory of JPEGs to run (synthetic frames if empty)')
+    parser.add_argument('--limit', type=int, default=16)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--json', type=Path, help='Write results to this file')
+    args = parser.parse_args()
+
+    print("🦁 Tadoba Wildlife Surveillance - Inference Runtime Benchmark")
+    print("=" * 70)
+
+    frames = load_sample_frames(args.frames, args.limit)
+    print(f"📸 {len(frames)} frames, {args.runs} runs each")
+
+    report = compare_runtimes(args.model, args.runtime, frames, args.runs)
+    print(f"   torch:        {report['torch_ms']:.1f} ms/frame")
+    print(f"   {args.runtime + ':':<13} {report[args.runtime + '_ms']:.1f} ms/frame")
+    print(f"   speedup:      {report['speedup']:.2f}x")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Per-camera inference settings for the YOLO Inference Worker
+Kept in sync with the backend through camera:config events
+"""
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from loguru import logger
+
+from parsing import offset_detection
+from tiling import TileLayout
+
+
+class DetectionSettings(NamedTuple):
+    """
+    Filtering of one camera, passed into predict so it happens inside NMS
+    Hashable: frames only share a batch with frames of equal settings
+    """
+    conf: float
+    # Class IDs to keep
+    classes: Tuple[int, ...]
+    # NMS IoU threshold, None for the model default
+    iou: Optional[float] = None
+
+
+class CameraRoi:
+    """
+    Region of interest of one camera
+    - Polygons are lists of [x, y] points normalized to 0-1 of the frame size
+    - Inference runs on the bounding rectangle of all polygons only
+    - Detections are kept when at least min_overlap of their bbox lies
+      inside the polygons
+    """
+
+    def __init__(self, polygons: List[List[List[float]]], min_overlap: float = 0.5):
+        self.polygons = [np.asarray(polygon, dtype=np.float32) for polygon in polygons]
+        self.min_overlap = min_overlap
+        # Width and height of the bounding rectangle, as fractions of the frame
+        points = np.concatenate(self.polygons)
+        span = np.clip(points.max(axis=0), 0, 1) - np.clip(points.min(axis=0), 0, 1)
+        self.extent = (float(span[0]) or 1.0, float(span[1]) or 1.0)
+        # Masks and crop rectangles per frame size, cameras rarely change resolution
+        self._cache: Dict[Tuple[int, int], Tuple[np.ndarray, Tuple[int, int, int, int]]] = {}
+        self._lock = threading.Lock()
+
+    def _geometry(self, width: int, height: int) -> Tuple[np.ndarray, Tuple[int, int, int, int]]:
+        """Full-frame mask and (x1, y1, x2, y2) bounding rectangle for a frame size"""
+        key = (width, height)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        scale = np.array([width, height], dtype=np.float32)
+        points = [np.round(polygon * scale).astype(np.int32) for polygon in self.polygons]
+        mask = np.zeros((height, width), dtype=np.uint8)
+        cv2.fillPoly(mask, points, 1)
+
+        x, y, w, h = cv2.boundingRect(np.concatenate(points))
+        rect = (max(0, x), max(0, y), min(width, x + w), min(height, y + h))
+        with self._lock:
+            self._cache[key] = (mask, rect)
+        return mask, rect
+
+    def crop(self, frame: np.ndarray) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        Bounding region of the ROI (a view, no copy) and its (x, y) offset
+        in the full frame
+        """
+        height, width = frame.shape[:2]
+        _, (x1, y1, x2, y2) = self._geometry(width, height)
+        if x2 <= x1 or y2 <= y1:
+            return frame, (0, 0)
+        return frame[y1:y2, x1:x2], (x1, y1)
+
+    def to_frame(self, detections: List[Dict], origin: Tuple[int, int],
+                 frame_shape: Tuple[int, ...]) -> Tuple[List[Dict], int]:
+        """
+        Move detections from crop to full-frame coordinates and drop the
+        ones outside the ROI
+
+        Returns:
+            (detections kept, number dropped)
+        """
+        height, width = frame_shape[:2]
+        mask, _ = self._geometry(width, height)
+        dx, dy = origin
+
+        kept = []
+        for detection in detections:
+            detection = offset_detection(detection, dx, dy)
+            bbox = detection['bbox']
+
+            x1, y1 = max(0, int(bbox['x1'])), max(0, int(bbox['y1']))
+            x2, y2 = min(width, int(np.ceil(bbox['x2']))), min(height, int(np.ceil(bbox['y2'])))
+            region = mask[y1:y2, x1:x2]
+            if region.size and float(region.mean()) >= self.min_overlap:
+                kept.append(detection)
+
+        return kept, len(detections) - len(kept)
+
+
+class CameraConfigStore:
+    """Latest camera:config per camera, updated from the Socket.IO event handler"""
+
+    def __init__(self, class_names: Optional[Dict[int, str]] = None, conf: float = 0.25):
+        """
+        Args:
+            class_names: Class ID -> name of every class the worker reports
+            conf: Confidence threshold of cameras without their own
+        """
+        self.class_names = class_names or {}
+        self.class_ids = {name: cls_id for cls_id, name in self.class_names.items()}
+        self.default_detection = DetectionSettings(conf, tuple(sorted(self.class_names)))
+        self.rois: Dict[str, CameraRoi] = {}
+        # Model input size per camera: int or 'adaptive'
+        self.imgsz: Dict[str, Any] = {}
+        # Tiled inference for high-resolution cameras
+        self.tilings: Dict[str, TileLayout] = {}
+        # Second-stage cascade on or off per camera (unset: worker default)
+        self.cascades: Dict[str, bool] = {}
+        # Confidence, class allow-list and NMS IoU per camera
+        self.detection: Dict[str, DetectionSettings] = {}
+
+        # Stats
+        self.pixels_total = 0
+        self.pixels_inferred = 0
+        self.detections_dropped = 0
+
+    def update(self, config: Dict[str, Any]) -> Optional[CameraRoi]:
+        """Apply a camera:config payload; returns the camera's ROI, if any"""
+        camera_id = str(config.get('camera_id'))
+        if config.get('imgsz'):
+            self.imgsz[camera_id] = config['imgsz']
+        else:
+            self.imgsz.pop(camera_id, None)
+
+        tiling = config.get('tiling')
+        if tiling:
+            self.tilings[camera_id] = TileLayout(**tiling)
+        else:
+            self.tilings.pop(camera_id, None)
+
+        if config.get('cascade') is not None:
+            self.cascades[camera_id] = bool(config['cascade'])
+        else:
+            self.cascades.pop(camera_id, None)
+
+        detection = self._detection_settings(camera_id, config)
+        if detection != self.default_detection:
+            self.detection[camera_id] = detection
+        else:
+            self.detection.pop(camera_id, None)
+
+        roi_config = config.get('roi') or {}
+        polygons = roi_config.get('polygons') or []
+
+        if not polygons:
+            self.rois.pop(camera_id, None)
+            return None
+
+        roi = CameraRoi(polygons, float(roi_config.get('min_overlap', 0.5)))
+        self.rois[camera_id] = roi
+        return roi
+
+    def _detection_settings(self, camera_id: str, config: Dict[str, Any]) -> DetectionSettings:
+        """DetectionSettings from the confidence, classes and iou of a camera:config"""
+        classes = self.default_detection.classes
+        if config.get('classes'):
+            unknown = [name for name in config['classes'] if name not in self.class_ids]
+            if unknown:
+                logger.warning(f"⚠️ Camera {camera_id}: ignoring unknown classes {', '.join(unknown)}")
+            classes = tuple(sorted(self.class_ids[name] for name in config['classes']
+                                   if name in self.class_ids))
+        conf = config.get('confidence')
+        return DetectionSettings(
+            conf=float(conf) if conf is not None else self.default_detection.conf,
+            classes=classes,
+            iou=float(config['iou']) if config.get('iou') is not None else None
+        )
+
+    def detection_settings(self, camera_id: Any) -> DetectionSettings:
+        return self.detection.get(str(camera_id), self.default_detection)
+
+    def roi(self, camera_id: Any) -> Optional[CameraRoi]:
+        return self.rois.get(str(camera_id))
+
+    def imgsz_setting(self, camera_id: Any, default: Any = None) -> Any:
+        return self.imgsz.get(str(camera_id), default)
+
+    def tiling(self, camera_id: Any) -> Optional[TileLayout]:
+        return self.tilings.get(str(camera_id))
+
+    def cascade(self, camera_id: Any, default: bool = False) -> bool:
+        return self.cascades.get(str(camera_id), default)
+
+    def record(self, frame: np.ndarray, crop: np.ndarray, dropped: int):
+        """Count pixels saved by cropping and detections dropped by the mask"""
+        self.pixels_total += frame.shape[0] * frame.shape[1]
+        self.pixels_inferred += crop.shape[0] * crop.shape[1]
+        self.detections_dropped += dropped
+
+    def totals(self) -> Dict[str, float]:
+        """Share of pixels sent to the model and detections dropped, over all ROI cameras"""
+        share = self.pixels_inferred / self.pixels_total if self.pixels_total else 1.0
+        return {
+            'cameras': len(self.rois),
+            'pixel_share': round(share, 3),
+            'detections_dropped': self.detections_dropped
+        }
@@ -0,0 +1,173 @@
+"""
+Second-stage cascade for the YOLO Inference Worker
+Re-checks first-stage detections of expensive classes (people, vehicles)
+on crops with a heavier classifier or detector, batched across cameras
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from parsing import parse_result
+
+# Verdicts of the second stage on a first-stage detection
+CONFIRMED = 'confirmed'
+RELABELED = 'relabeled'
+REJECTED = 'rejected'
+
+
+def crop_detection(frame: np.ndarray, bbox: Dict, padding: float = 0.15) -> np.ndarray:
+    """Copy of a detection's bbox, grown by padding (fraction of its size) for context"""
+    height, width = frame.shape[:2]
+    pad_x = (bbox['x2'] - bbox['x1']) * padding
+    pad_y = (bbox['y2'] - bbox['y1']) * padding
+    x1, y1 = max(0, int(bbox['x1'] - pad_x)), max(0, int(bbox['y1'] - pad_y))
+    x2 = min(width, int(np.ceil(bbox['x2'] + pad_x)))
+    y2 = min(height, int(np.ceil(bbox['y2'] + pad_y)))
+    return np.ascontiguousarray(frame[y1:max(y2, y1 + 1), x1:max(x2, x1 + 1)])
+
+
+def verdict_from_result(result, conf: float, class_names: Dict[int, str]) -> Optional[Tuple[str, float]]:
+    """
+    (class name, confidence) the second stage sees in one crop, or None
+
+    Classifiers give their top-1 class; detectors the most confident box
+    covering the crop centre (the first-stage object, not a neighbour
+    caught in the padding). Classes outside class_names count as nothing.
+    """
+    probs = getattr(result, 'probs', None)
+    if probs is not None:
+        name = result.names[int(probs.top1)]
+        confidence = float(probs.top1conf)
+        if confidence < conf or name not in class_names.values():
+            return None
+        return name, confidence
+
+    height, width = result.orig_shape[:2]
+    cx, cy = width / 2, height / 2
+    best = None
+    for detection in parse_result(result, class_names):
+        bbox = detection['bbox']
+        if not (bbox['x1'] <= cx <= bbox['x2'] and bbox['y1'] <= cy <= bbox['y2']):
+            continue
+        if best is None or detection['confidence'] > best[1]:
+            best = (detection['detection_class'], detection['confidence'])
+    return best
+
+
+def predict_crops(model, crops: List[np.ndarray], conf: float, class_names: Dict[int, str],
+                  imgsz: Optional[int] = None) -> Tuple[List[Optional[Tuple[str, float]]], float]:
+    """
+    Run the second-stage model on a batch of crops
+
+    Returns:
+        (one verdict_from_result() per crop, in input order, seconds in predict)
+    """
+    options = {'imgsz': imgsz} if imgsz else {}
+    start = time.perf_counter()
+    results = model.predict(crops, conf=conf, verbose=False, **options)
+    seconds = time.perf_counter() - start
+    return [verdict_from_result(result, conf, class_names) for result in results], seconds
+
+
+class CascadeStats:
+    """Second-stage counters for one first-stage class"""
+
+    def __init__(self):
+        self.crops = 0
+        self.confirmed = 0
+        self.relabeled = 0
+        self.rejected = 0
+
+    @property
+    def overturn_rate(self) -> float:
+        """Share of checked detections the second stage relabeled or rejected"""
+        return (self.relabeled + self.rejected) / self.crops if self.crops else 0.0
+
+
+class DetectionCascade:
+    """
+    Decides which detections go through the second stage and applies its verdicts
+    - Only detections of the cascade classes are cropped and re-checked;
+      everything else passes through untouched
+    - Confirmed detections take the second stage's confidence, relabeled
+      ones its class as well, rejected ones are dropped
+    - Counts second-stage cost and how often it overturns the first stage
+    """
+
+    def __init__(self, classes: Iterable[str], padding: float = 0.15):
+        self.classes = set(classes)
+        self.padding = padding
+        self._lock = threading.Lock()
+
+        # Stats
+        self.stats: Dict[str, CascadeStats] = {}
+        self.batches = 0
+        self.busy_seconds = 0.0
+
+    def crops(self, frame: np.ndarray, detections: List[Dict]) -> Tuple[List[int], List[np.ndarray]]:
+        """Indices of the detections to re-check and their crops"""
+        indices = [i for i, detection in enumerate(detections)
+                   if detection['detection_class'] in self.classes]
+        return indices, [crop_detection(frame, detections[i]['bbox'], self.padding) for i in indices]
+
+    def apply(self, detections: List[Dict], indices: List[int],
+              verdicts: List[Optional[Tuple[str, float]]]) -> List[Dict]:
+        """Detections with the second stage's verdicts applied, rejected ones removed"""
+        checked = dict(zip(indices, verdicts))
+        kept = []
+        for i, detection in enumerate(detections):
+            if i not in checked:
+                kept.append(detection)
+                continue
+
+            verdict = checked[i]
+            stats = self._stats(detection['detection_class'])
+            stats.crops += 1
+            if verdict is None:
+                stats.rejected += 1
+                continue
+            name, confidence = verdict
+            outcome = CONFIRMED if name == detection['detection_class'] else RELABELED
+            if outcome == CONFIRMED:
+                stats.confirmed += 1
+            else:
+                stats.relabeled += 1
+            kept.append({**detection, 'detection_class': name, 'confidence': confidence,
+                         'cascade': outcome})
+        return kept
+
+    def record_batch(self, seconds: float):
+        self.batches += 1
+        self.busy_seconds += seconds
+
+    def _stats(self, class_name: str) -> CascadeStats:
+        stats = self.stats.get(class_name)
+        if stats is None:
+            with self._lock:
+                stats = self.stats.setdefault(class_name, CascadeStats())
+        return stats
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Per first-stage class verdict counts and overturn rate"""
+        return {
+            class_name: {
+                'crops': stats.crops,
+                'confirmed': stats.confirmed,
+                'relabeled': stats.relabeled,
+                'rejected': stats.rejected,
+                'overturn_rate': round(stats.overturn_rate, 3)
+            }
+            for class_name, stats in sorted(self.stats.items())
+        }
+
+    def totals(self) -> Dict[str, float]:
+        crops = sum(stats.crops for stats in self.stats.values())
+        overturned = sum(stats.relabeled + stats.rejected for stats in self.stats.values())
+        return {
+            'crops': crops,
+            'batches': self.batches,
+            'avg_crop_ms': round(self.busy_seconds / crops * 1000, 2) if crops else 0.0,
+            'overturn_rate': round(overturned / crops, 3) if crops else 0.0
+        }
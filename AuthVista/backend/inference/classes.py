@@ -0,0 +1,29 @@
+"""
+Classes and default confidence of the YOLO Inference Worker
+Free of side effects, so tools and benchmarks can import it without
+loading the worker
+"""
+import os
+
+# Wildlife classes we care about (COCO dataset)
+WILDLIFE_CLASSES = {
+    0: 'person',      # Human intrusion detection
+    1: 'bicycle',
+    2: 'car',
+    3: 'motorcycle',
+    14: 'bird',
+    15: 'cat',
+    16: 'dog',
+    17: 'horse',
+    18: 'sheep',
+    19: 'cow',
+    20: 'elephant',
+    21: 'bear',
+    22: 'zebra',
+    23: 'giraffe',
+}
+
+
+def confidence_threshold() -> float:
+    """CONFIDENCE_THRESHOLD from the environment, read at call time (after any load_dotenv)"""
+    return float(os.getenv('CONFIDENCE_THRESHOLD', '0.5'))
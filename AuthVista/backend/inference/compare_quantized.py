@@ -0,0 +1,159 @@
+"""
+Quantized Model Accuracy Report
+Runs the full-precision and INT8 models on the same frames and compares their
+detections per class in WILDLIFE_CLASSES, using the full-precision model as
+reference. Exits non-zero if recall on 'person' drops by more than the tolerance.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+
+from classes import WILDLIFE_CLASSES, confidence_threshold
+from parsing import parse_result
+from quantize_model import CALIBRATION_LIST
+from runtime import exported_model_path, load_model
+
+DEFAULT_MODEL = Path(__file__).parent.parent / "models" / "yolov8n.pt"
+DEFAULT_IMAGES = Path(__file__).parent.parent / "snapshots"
+CONFIDENCE_THRESHOLD = confidence_threshold()
+
+
+def iou(a: Dict, b: Dict) -> float:
+    """IoU of two detection bboxes (corner format)"""
+    x1, y1 = max(a['x1'], b['x1']), max(a['y1'], b['y1'])
+    x2, y2 = min(a['x2'], b['x2']), min(a['y2'], b['y2'])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = a['width'] * a['height'] + b['width'] * b['height'] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def match_frame(reference: List[Dict], candidate: List[Dict], iou_threshold: float, counts: Dict):
+    """Greedy same-class IoU matching of one frame's detections"""
+    unmatched = list(candidate)
+    for ref in sorted(reference, key=lambda d: -d['confidence']):
+        stats = counts[ref['detection_class']]
+        stats['reference'] += 1
+        best, best_iou = None, iou_threshold
+        for cand in unmatched:
+            if cand['detection_class'] != ref['detection_class']:
+                continue
+            overlap = iou(ref['bbox'], cand['bbox'])
+            if overlap >= best_iou:
+                best, best_iou = cand, overlap
+        if best is not None:
+            stats['matched'] += 1
+            unmatched.remove(best)
+
+    for cand in candidate:
+        counts[cand['detection_class']]['quantized'] += 1
+
+
+def run_model(model, frames: List[np.ndarray]) -> Tuple[List[List[Dict]], float]:
+    """Detections per frame and mean latency per frame in ms"""
+    model.predict(frames[0], conf=CONFIDENCE_THRESHOLD, verbose=False)  # warm-up
+    detections = []
+    start = time.perf_counter()
+    for frame in frames:
+        result = model.predict(frame, conf=CONFIDENCE_THRESHOLD, verbose=False)[0]
+        detections.append(parse_result(result, WILDLIFE_CLASSES))
+    return detections, (time.perf_counter() - start) / len(frames) * 1000
+
+
+def load_eval_frames(images_dir: Path, int8_dir: Path, limit: int) -> List[np.ndarray]:
+    """Evaluation frames, excluding the images used for calibration"""
+    calibration_file = int8_dir / CALIBRATION_LIST
+    calibration = set()
+    if calibration_file.exists():
+        calibration = set(calibration_file.read_text().split())
+
+    paths = [p for p in sorted(images_dir.glob('**/*.jpg')) if str(p.resolve()) not in calibration]
+    frames = [frame for frame in (cv2.imread(str(p)) for p in paths[:limit]) if frame is not None]
+    if not frames:
+        raise FileNotFoundError(f"No evaluation images (*.jpg) in {images_dir} "
+                                f"outside the calibration set")
+    return frames
+
+
+def build_report(counts: Dict, fp_ms: float, int8_ms: float, tolerance: float) -> Dict:
+    classes = {}
+    for name, stats in counts.items():
+        recall = stats['matched'] / stats['reference'] if stats['reference'] else None
+        precision = stats['matched'] / stats['quantized'] if stats['quantized'] else None
+        classes[name] = {**stats, 'recall': recall, 'precision': precision}
+
+    person_recall = classes['person']['recall']
+    accepted = person_recall is not None and person_recall >= 1 - tolerance
+    return {
+        'fp32_ms': round(fp_ms, 2),
+        'int8_ms': round(int8_ms, 2),
+        'speedup': round(fp_ms / int8_ms, 2),
+        'person_recall_tolerance': tolerance,
+        'accepted': accepted,
+        'classes': classes
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', type=Path, default=DEFAULT_MODEL)
+    parser.add_argument('--images', type=Path, default=DEFAULT_IMAGES,
+                        help='Directory of snapshots to evaluate on')
+    parser.add_argument('--limit', type=int, default=500)
+    parser.add_argument('--iou', type=float, default=0.5,
+                        help='IoU for a quantized detection to match the reference')
+    parser.add_argument('--tolerance', type=float, default=0.02,
+                        help='Max allowed drop in person recall (0.02 = 2 points)')
+    parser.add_argument('--json', type=Path, help='Write the report to this file')
+    args = parser.parse_args()
+
+    print("🦁 Tadoba Wildlife Surveillance - Quantized Model Accuracy Report")
+    print("=" * 70)
+
+    int8_dir = exported_model_path(str(args.model), 'openvino-int8')
+    frames = load_eval_frames(args.images, int8_dir, args.limit)
+    print(f"📸 Evaluating on {len(frames)} frames (calibration images excluded)")
+
+    fp_detections, fp_ms = run_model(load_model(str(args.model), 'torch'), frames)
+    int8_detections, int8_ms = run_model(load_model(str(args.model), 'openvino-int8'), frames)
+
+    counts = {name: {'reference': 0, 'matched': 0, 'quantized': 0}
+              for name in WILDLIFE_CLASSES.values()}
+    for reference, candidate in zip(fp_detections, int8_detections):
+        match_frame(reference, candidate, args.iou, counts)
+
+    report = build_report(counts, fp_ms, int8_ms, args.tolerance)
+
+    print(f"{'class':<12}{'fp32':>7}{'int8':>7}{'matched':>9}{'recall':>9}{'precision':>11}")
+    for name, stats in report['classes'].items():
+        recall = f"{stats['recall']:.1%}" if stats['recall'] is not None else '-'
+        precision = f"{stats['precision']:.1%}" if stats['precision'] is not None else '-'
+        print(f"{name:<12}{stats['reference']:>7}{stats['quantized']:>7}"
+              f"{stats['matched']:>9}{recall:>9}{precision:>11}")
+
+    print("=" * 70)
+    print(f"⏱️ fp32 {report['fp32_ms']}ms/frame, int8 {report['int8_ms']}ms/frame "
+          f"({report['speedup']}x)")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"✅ Report written to {args.json}")
+
+    if report['accepted']:
+        print(f"✅ Person recall within {args.tolerance:.0%}: INT8 model accepted")
+        sys.exit(0)
+
+    print(f"❌ Person recall outside {args.tolerance:.0%} (or no person in the evaluation set): "
+          f"INT8 model rejected")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+JPEG decoding for the YOLO Inference Worker
+Decodes frames at reduced scale when the source is much larger than the
+model input, and resizes into reused per-camera buffers (cv2.imdecode
+itself always returns a new array)
+"""
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# libjpeg can decode directly at 1/2, 1/4 and 1/8 scale (DCT scaling),
+# which skips most of the IDCT and colour conversion work
+REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# JPEG start-of-frame markers (baseline, extended, progressive, lossless ...)
+SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """(width, height) from the JPEG header without decoding, None if not found"""
+    if data[:2] != b'\xff\xd8':
+        return None
+    offset = 2
+    while offset + 9 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker in SOF_MARKERS:
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            return width, height
+        length = struct.unpack('>H', data[offset + 2:offset + 4])[0]
+        offset += 2 + length
+    return None
+
+
+def reduction_factor(width: int, height: int, target: int,
+                     region: Tuple[float, float] = (1.0, 1.0)) -> int:
+    """
+    Largest libjpeg scale-down (1, 2, 4 or 8) that keeps the inferred region
+    (fractions of width and height) at least target pixels on its long side
+    """
+    long_side = max(width * region[0], height * region[1])
+    for factor, _ in REDUCED_FLAGS:
+        if long_side / factor >= target:
+            return factor
+    return 1
+
+
+class FrameDecoder:
+    """
+    Decode stage for relayed JPEG frames
+    - Decodes at 1/2, 1/4 or 1/8 scale when the source is that much larger
+      than the model input (e.g. a 4K frame for imgsz 640 is decoded at 1/4)
+    - Resizes what is still larger than the model input to its exact
+      long side, so the model's own letterbox only pads; the resized frame
+      goes into a buffer reused across frames of the same camera
+    - Only the resize is allocation-free: OpenCV's Python imdecode cannot
+      decode into a given array, so each decode still allocates (at the
+      reduced size), and letterboxing is left to the model
+    - Returns the scale back to source pixels, so detections keep
+      coordinates of the frame the camera sent
+    """
+
+    def __init__(self, enabled: bool = True, buffers_per_camera: int = 4):
+        """
+        Args:
+            enabled: Reduced decode and resize; off decodes at full size
+            buffers_per_camera: Reused buffers kept per camera; frames still
+                held elsewhere (e.g. by a pending snapshot) are not counted
+        """
+        self.enabled = enabled
+        self.buffers_per_camera = buffers_per_camera
+        self.free: Dict[str, List[np.ndarray]] = {}
+        self.owned: Dict[str, List[np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+        # Stats (updated under _lock, decode runs on several CPU threads)
+        self.frames = 0
+        self.reduced = 0
+        self.resized = 0
+        self.buffers_allocated = 0
+
+    def decode(
+        self,
+        camera_id,
+        data: bytes,
+        target: Optional[int] = None,
+        region: Tuple[float, float] = (1.0, 1.0)
+    ) -> Tuple[Optional[np.ndarray], Tuple[float, float]]:
+        """
+        Decode a JPEG for a model input of target pixels (blocking, runs on
+        the CPU executor)
+
+        Args:
+            camera_id: Camera the frame belongs to (owner of the buffers)
+            data: JPEG bytes
+            target: Long side the model needs, None for full resolution
+            region: Part of the frame that is inferred (ROI extent)
+
+        Returns:
+            (frame or None, (sx, sy) to scale frame coordinates to source pixels)
+        """
+        buf = np.frombuffer(data, np.uint8)
+        size = jpeg_size(data) if self.enabled and target else None
+        if size is None:
+            self._record()
+            return cv2.imdecode(buf, cv2.IMREAD_COLOR), (1.0, 1.0)
+
+        width, height = size
+        factor = reduction_factor(width, height, target, region)
+        flags = dict(REDUCED_FLAGS).get(factor, cv2.IMREAD_COLOR)
+        frame = cv2.imdecode(buf, flags)
+        if frame is None:
+            self._record()
+            return None, (1.0, 1.0)
+
+        # Shrink the rest of the way so the inferred region is target on its long side
+        decoded_h, decoded_w = frame.shape[:2]
+        scale = target / max(decoded_w * region[0], decoded_h * region[1])
+        if scale < 1:
+            shape = (max(1, round(decoded_h * scale)), max(1, round(decoded_w * scale)), 3)
+            frame = cv2.resize(frame, shape[1::-1], dst=self._buffer(camera_id, shape),
+                               interpolation=cv2.INTER_AREA)
+
+        self._record(reduced=factor > 1, resized=scale < 1)
+        return frame, (width / frame.shape[1], height / frame.shape[0])
+
+    def _record(self, reduced: bool = False, resized: bool = False):
+        with self._lock:
+            self.frames += 1
+            self.reduced += reduced
+            self.resized += resized
+
+    def _buffer(self, camera_id, shape: Tuple[int, ...]) -> np.ndarray:
+        key = str(camera_id)
+        with self._lock:
+            free = self.free.setdefault(key, [])
+            for i, buffer in enumerate(free):
+                if buffer.shape == shape:
+                    return free.pop(i)
+
+            # No free buffer of this size: free ones are of an old size
+            # (input size changed), so forget them
+            owned = self.owned.setdefault(key, [])
+            owned[:] = [b for b in owned if not any(b is f for f in free)]
+            free.clear()
+
+            buffer = np.empty(shape, dtype=np.uint8)
+            self.buffers_allocated += 1
+            if len(owned) < self.buffers_per_camera:
+                owned.append(buffer)
+            return buffer
+
+    def release(self, camera_id, frame: Optional[np.ndarray], reusable: bool = True):
+        """
+        Hand a frame back once the pipeline is done with it; frames that
+        are still read elsewhere (reusable=False) are dropped from the pool
+        """
+        if frame is None:
+            return
+        key = str(camera_id)
+        with self._lock:
+            owned = self.owned.get(key, [])
+            for i, buffer in enumerate(owned):
+                if buffer is frame:
+                    if reusable:
+                        self.free[key].append(buffer)
+                    else:
+                        del owned[i]
+                    return
+
+    def totals(self) -> Dict[str, int]:
+        return {
+            'frames': self.frames,
+            'reduced': self.reduced,
+            'resized': self.resized,
+            'buffers_allocated': self.buffers_allocated
+        }
@@ -0,0 +1,153 @@
+"""
+Duplicate and frozen frame detection for the YOLO Inference Worker
+Reuses the last result for frames identical to the last inferred frame of a
+camera and flags cameras that keep sending the very same image
+"""
+import hashlib
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def content_digest(frame: np.ndarray, data: Optional[bytes] = None) -> bytes:
+    """
+    Exact fingerprint of a frame: of the JPEG bytes when there are any,
+    else of every 4th pixel of the decoded frame (still changes with sensor
+    noise, so only a stuck source repeats it)
+    """
+    if data is not None:
+        return hashlib.blake2b(data, digest_size=8).digest()
+    return hashlib.blake2b(np.ascontiguousarray(frame[::4, ::4]).data, digest_size=8).digest()
+
+
+class CachedResult:
+    """Inference result of the last inferred frame of a camera"""
+
+    __slots__ = ('digest', 'shape', 'detections', 'imgsz', 'tile_layout', 'stored_at')
+
+    def __init__(self, digest: bytes, shape: Tuple[int, ...], detections: List[Dict],
+                 imgsz: Optional[int], tile_layout: Optional[str]):
+        self.digest = digest
+        self.shape = shape
+        self.detections = detections
+        self.imgsz = imgsz
+        self.tile_layout = tile_layout
+        self.stored_at = time.monotonic()
+
+
+class CameraFrameState:
+    """Duplicate / frozen state of one camera"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.result: Optional[CachedResult] = None
+        self.digest: Optional[bytes] = None
+        self.unchanged_since = time.monotonic()
+        self.frozen = False
+
+        # Stats
+        self.duplicates = 0
+        self.frozen_skipped = 0
+
+
+class FrameCache:
+    """
+    Per-camera result cache keyed by exact content
+    - A frame whose content digest equals that of the last inferred frame
+      (same size) reuses its detections instead of running the model, for
+      at most max_age seconds after that inference. Only exact repeats
+      count: a perceptual hash of a thumbnail cannot see a small, distant
+      intruder
+    - A camera whose frames have been byte-identical for frozen_seconds is
+      flagged frozen: a live sensor never repeats a frame exactly, a hung
+      camera or encoder does. Frozen frames are not inferred at all, so
+      tracks of a stuck image end instead of being reported forever
+    """
+
+    def __init__(self, max_age: float = 5, frozen_seconds: float = 30):
+        self.max_age = max_age
+        self.frozen_seconds = frozen_seconds
+        self.cameras: Dict[Any, CameraFrameState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, camera_id: Any) -> CameraFrameState:
+        state = self.cameras.get(camera_id)
+        if state is None:
+            with self._lock:
+                state = self.cameras.setdefault(camera_id, CameraFrameState())
+        return state
+
+    def check(self, camera_id: Any, frame: np.ndarray,
+              data: Optional[bytes] = None) -> Tuple[bytes, Optional[CachedResult], bool, bool]:
+        """
+        Fingerprint a frame (blocking, runs on the CPU executor)
+
+        Returns:
+            (content digest to store() with the new result,
+             cached result to reuse instead of inferring, or None,
+             camera is frozen,
+             frozen state changed with this frame)
+        """
+        digest = content_digest(frame, data)
+        state = self._state(camera_id)
+
+        with state.lock:
+            now = time.monotonic()
+            if digest != state.digest:
+                state.digest = digest
+                state.unchanged_since = now
+
+            frozen = now - state.unchanged_since >= self.frozen_seconds
+            changed = frozen != state.frozen
+            state.frozen = frozen
+            if frozen:
+                state.frozen_skipped += 1
+                return digest, None, True, changed
+
+            cached = state.result
+            if (cached is not None
+                    and cached.shape == frame.shape
+                    and now - cached.stored_at < self.max_age
+                    and cached.digest == digest):
+                state.duplicates += 1
+                return digest, cached, False, changed
+            return digest, None, False, changed
+
+    def store(self, camera_id: Any, digest: bytes, shape: Tuple[int, ...], detections: List[Dict],
+              imgsz: Optional[int] = None, tile_layout: Optional[str] = None):
+        """Remember the result of an inferred frame for exact repeats of it"""
+        state = self._state(camera_id)
+        with state.lock:
+            state.result = CachedResult(digest, shape, detections, imgsz, tile_layout)
+
+    def invalidate(self, camera_id: Any):
+        """Forget the camera's cached result, e.g. after its settings changed"""
+        state = self.cameras.get(camera_id)
+        if state is not None:
+            with state.lock:
+                state.result = None
+
+    def frozen_seconds_for(self, camera_id: Any) -> float:
+        """How long the camera's image has been unchanged"""
+        state = self.cameras.get(camera_id)
+        return time.monotonic() - state.unchanged_since if state is not None else 0.0
+
+    def per_camera(self) -> Dict[Any, Dict[str, Any]]:
+        return {
+            camera_id: {
+                'duplicates': state.duplicates,
+                'frozen_skipped': state.frozen_skipped,
+                'frozen': state.frozen
+            }
+            for camera_id, state in list(self.cameras.items())
+        }
+
+    def totals(self) -> Dict[str, int]:
+        cameras = self.per_camera().values()
+        return {
+            'duplicates': sum(c['duplicates'] for c in cameras),
+            'frozen_skipped': sum(c['frozen_skipped'] for c in cameras),
+            'frozen_cameras': sum(1 for c in cameras if c['frozen'])
+        }
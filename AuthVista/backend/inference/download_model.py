@@ -55,3 +55,5 @@ if __name__ == "__main__":
     print("=" * 60)
     print("🎯 Model ready for inference!")
     print(f"   Use this path in worker.py: {model_path}")
+    print("   Optional INT8 variant (calibrated on your snapshots):")
+    print("   python quantize_model.py && python compare_quantized.py")
@@ -0,0 +1,163 @@
+"""
+Executors for the YOLO Inference Worker
+Keeps decode, inference and encode work off the asyncio event loop
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from affinity import assign_cores, pin_to_cpus
+from parsing import parse_result
+from runtime import load_model, warm_up
+
+# Model owned by an inference child process (process executor only)
+_process_model = None
+# Shared by the children of one pool; inference_process_ready() waits on it
+_ready_barrier = None
+
+
+def predict_batch(model, frames: List, conf: float, class_names: Dict[int, str],
+                  imgsz: Optional[int] = None, classes: Optional[Sequence[int]] = None,
+                  iou: Optional[float] = None) -> Tuple[List[List[Dict]], Dict[str, float]]:
+    """
+    Run one batched predict call and parse the results
+
+    Args:
+        model: Loaded ultralytics YOLO model
+        frames: Decoded frames
+        conf: Confidence threshold passed to predict
+        class_names: Class ID -> name mapping of classes to keep
+        imgsz: Model input size, None for the model default
+        classes: Class IDs passed to predict, so other classes are dropped
+            before NMS; None for all
+        iou: NMS IoU threshold, None for the model default
+
+    Returns:
+        (one list of detection dicts per frame, in input order,
+         seconds spent in {'inference', 'parse'})
+    """
+    options = {'imgsz': imgsz} if imgsz else {}
+    if classes is not None:
+        options['classes'] = list(classes)
+    if iou is not None:
+        options['iou'] = iou
+    start = time.perf_counter()
+    results = model.predict(frames, conf=conf, verbose=False, **options)
+    predicted = time.perf_counter()
+    detections = [parse_result(result, class_names) for result in results]
+    timings = {'inference': predicted - start, 'parse': time.perf_counter() - predicted}
+    return detections, timings
+
+
+def _claim_slot(slot_counter) -> int:
+    """Next free child index from the counter shared with the parent"""
+    with slot_counter.get_lock():
+        slot = slot_counter.value
+        slot_counter.value += 1
+    return slot
+
+
+def init_inference_process(model_path: str, runtime: str, warm_up_batch: int = 1,
+                           slot_counter=None, processes: int = 1,
+                           pin_cores: bool = True, threads: int = 0, ready_barrier=None):
+    """
+    Process pool initializer: pin the child to its cores, then load and warm
+    the model once per child process
+    """
+    global _process_model, _ready_barrier
+    _ready_barrier = ready_barrier
+    threads = max(0, threads)
+    if slot_counter is not None:
+        slot = _claim_slot(slot_counter) % max(1, processes)
+        cpus, core_threads = assign_cores(slot, processes)
+        threads = threads or core_threads
+        if pin_cores and pin_to_cpus(cpus):
+            logger.info(f"📌 Inference process {os.getpid()} (slot {slot}): "
+                        f"CPUs {cpus}, {threads} threads")
+
+    if threads:
+        # Read by OpenMP-based runtimes when they start their thread pools
+        os.environ['OMP_NUM_THREADS'] = str(threads)
+
+    start = time.perf_counter()
+    _process_model = load_model(model_path, runtime)
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    loaded = time.perf_counter() - start
+    warmed = warm_up(_process_model, warm_up_batch)
+    logger.info(f"⏱️ Inference process {os.getpid()}: model load {loaded:.2f}s, "
+                f"warm-up {warmed:.2f}s")
+
+
+def inference_process_ready() -> int:
+    """
+    Readiness job; submit one per child process
+
+    Returns once this child has run its initializer and every other child
+    of the pool has reached this job too. A child blocks here until then,
+    so the jobs cannot double up on one child and leave another cold.
+    """
+    if _ready_barrier is not None:
+        _ready_barrier.wait()
+    return os.getpid()
+
+
+def predict_batch_in_process(frames: List, conf: float, class_names: Dict[int, str],
+                             imgsz: Optional[int] = None, classes: Optional[Sequence[int]] = None,
+                             iou: Optional[float] = None) -> Tuple[List[List[Dict]], Dict[str, float]]:
+    """predict_batch() against the model owned by this child process"""
+    return predict_batch(_process_model, frames, conf, class_names, imgsz, classes, iou)
+
+
+def create_inference_executor(kind: str, processes: int, model_path: str,
+                              runtime: str = 'torch', warm_up_batch: int = 1,
+                              pin_cores: bool = True, threads: int = 0) -> Executor:
+    """
+    Create the executor that runs model.predict
+
+    Args:
+        kind: 'thread' runs the parent's model on a dedicated thread,
+            'process' loads a model copy in each child process
+        processes: Number of child processes (process executor only)
+        model_path: Model loaded by each child process
+        runtime: Inference runtime each child process loads (see runtime.py)
+        warm_up_batch: Batch size each child process warms up with
+        pin_cores: Pin each child process to its own share of the CPU cores
+            (process executor only)
+        threads: Torch threads per child process, 0 for one per physical
+            core assigned to it (process executor only)
+    """
+    if kind == 'process':
+        processes = max(1, processes)
+        # spawn, not fork: torch thread pools do not survive fork
+        context = multiprocessing.get_context('spawn')
+        # Children take the next slot on start, which decides their cores
+        slot_counter = context.Value('i', 0)
+        return ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=context,
+            initializer=init_inference_process,
+            initargs=(model_path, runtime, warm_up_batch, slot_counter,
+                      processes, pin_cores, threads, context.Barrier(processes))
+        )
+
+    if kind != 'thread':
+        raise ValueError(f"Unknown inference executor: {kind} (expected 'thread' or 'process')")
+
+    # One thread: batches are serialized and the model is not thread-safe
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='inference')
+
+
+def create_cpu_executor(workers: int) -> ThreadPoolExecutor:
+    """Thread pool for JPEG decode (OpenCV releases the GIL)"""
+    return ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='cpu')
+
+
+def create_cascade_executor() -> ThreadPoolExecutor:
+    """Thread for the second-stage cascade model, kept apart from first-stage batches"""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='cascade')
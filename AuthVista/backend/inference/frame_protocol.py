@@ -0,0 +1,57 @@
+"""
+Frame transport protocol for frame:ingest
+Raw JPEG bytes travel as a Socket.IO binary attachment next to a small
+metadata header; base64 'frame' strings are still accepted from older clients
+"""
+import base64
+from typing import Any, Dict, Optional
+
+FRAME_PROTOCOL_VERSION = 1
+
+
+def encode_frame_message(jpeg: bytes, camera_id: Any, timestamp: str, **metadata) -> Dict:
+    """
+    Build a binary frame:ingest payload
+
+    python-socketio and socket.io-client send bytes values as binary
+    attachments, so the JPEG never goes through base64 or JSON.
+
+    Args:
+        jpeg: Encoded JPEG bytes
+        camera_id: Camera ID
+        timestamp: Capture time (ISO format)
+        **metadata: Extra header fields (geofence_id, ...)
+    """
+    return {
+        'v': FRAME_PROTOCOL_VERSION,
+        'camera_id': camera_id,
+        'timestamp': timestamp,
+        **metadata,
+        'jpeg': jpeg
+    }
+
+
+def is_binary_frame(data: Dict) -> bool:
+    """True if the payload carries raw JPEG bytes"""
+    return isinstance(data.get('jpeg'), (bytes, bytearray, memoryview))
+
+
+def frame_bytes(data: Dict) -> Optional[bytes]:
+    """
+    Extract the JPEG bytes from a frame:ingest payload
+
+    Accepts both the binary protocol ('jpeg' attachment) and the legacy
+    base64 'frame' string. Returns None if the payload has no frame.
+    """
+    if is_binary_frame(data):
+        return bytes(data['jpeg'])
+
+    frame_b64 = data.get('frame')
+    if frame_b64:
+        # Legacy clients may send a full data URL
+        if frame_b64.startswith('data:'):
+            frame_b64 = frame_b64.split(',', 1)[1]
+        return base64.b64decode(frame_b64)
+
+    return None
+
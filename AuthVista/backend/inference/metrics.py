@@ -0,0 +1,148 @@
+"""
+Prometheus metrics for the YOLO Inference Worker
+Stage latencies are observed as frames move through the pipeline; queue
+depths and counters are read from the worker when the endpoint is scraped
+"""
+from typing import Any, Dict, List, Optional
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, start_http_server
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# decode/motion/snapshot: CPU and disk, inference/parse: model, batch: time a
+# frame waits for its batch result, cascade: second-stage predict on a crop
+# batch, post: backend, frame: end to end
+STAGES = ('decode', 'motion', 'batch', 'inference', 'parse', 'cascade', 'snapshot', 'post', 'frame')
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class WorkerMetrics:
+    """Histograms and counters observed by the pipeline (thread-safe)"""
+
+    def __init__(self):
+        self.registry = CollectorRegistry()
+        self.stage_seconds = Histogram(
+            'tadoba_worker_stage_seconds', 'Latency of each pipeline stage',
+            ['stage'], buckets=LATENCY_BUCKETS, registry=self.registry
+        )
+        self.batch_size = Histogram(
+            'tadoba_worker_batch_size', 'Frames per predict call',
+            buckets=(1, 2, 4, 8, 16, 32, 64), registry=self.registry
+        )
+        self.posts = Counter(
+            'tadoba_worker_outbox_posts', 'Detection batch POSTs by outcome',
+            ['outcome'], registry=self.registry
+        )
+        # Export every stage from the first scrape, even before it is observed
+        for stage in STAGES:
+            self.stage_seconds.labels(stage)
+
+        # Raw stage latencies, only kept when keep_samples() was called
+        self.samples: Optional[Dict[str, List[float]]] = None
+
+    def keep_samples(self):
+        """Also keep every observed latency, for exact percentiles in benchmarks"""
+        self.samples = {stage: [] for stage in STAGES}
+
+    def observe(self, stage: str, seconds: float):
+        self.stage_seconds.labels(stage).observe(seconds)
+        if self.samples is not None:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def observe_post(self, seconds: float, outcome: str):
+        self.observe('post', seconds)
+        self.posts.labels(outcome).inc()
+
+    def serve(self, port: int, worker: Any):
+        """Expose /metrics on a background thread, including the worker's queues"""
+        self.registry.register(WorkerCollector(worker))
+        start_http_server(port, registry=self.registry)
+
+
+class WorkerCollector:
+    """Scrape-time view of worker queues and counters"""
+
+    def __init__(self, worker: Any):
+        self.worker = worker
+
+    def collect(self):
+        worker = self.worker
+
+        yield GaugeMetricFamily('tadoba_worker_ready', 'Model loaded and warmed up',
+                                value=int(worker.ready))
+        model = GaugeMetricFamily('tadoba_worker_model_info', 'Active model version (always 1)',
+                                  labels=['version'])
+        model.add_metric([worker.model_version], 1)
+        yield model
+        yield CounterMetricFamily('tadoba_worker_model_swaps', 'Models swapped in without a restart',
+                                  value=worker.model_swaps)
+        yield CounterMetricFamily('tadoba_worker_inference_restarts',
+                                  'Inference process pools restarted after a child crashed',
+                                  value=worker.inference_restarts)
+        yield GaugeMetricFamily('tadoba_worker_scheduler_depth',
+                                'Frames waiting for a pipeline slot (at most one per camera)',
+                                value=worker.scheduler.depth)
+        yield GaugeMetricFamily('tadoba_worker_batch_queue_depth', 'Frames waiting for a batch',
+                                value=worker.batcher.queue.qsize() + len(worker.batcher.deferred))
+        yield GaugeMetricFamily('tadoba_worker_in_flight', 'Frames being processed',
+                                value=worker.in_flight)
+        yield GaugeMetricFamily('tadoba_worker_snapshot_pending', 'Queued snapshot writes',
+                                value=worker.snapshots.pending)
+        yield GaugeMetricFamily('tadoba_worker_outbox_pending', 'Detections waiting for the next POST',
+                                value=len(worker.outbox.pending))
+        yield GaugeMetricFamily('tadoba_worker_outbox_spool_backlog',
+                                'Spooled detections still to be replayed (1 = yes)',
+                                value=int(worker.outbox.spool.has_backlog()))
+
+        # Per camera frame counters; rate() of 'dispatched' is the camera's frame rate
+        frames = CounterMetricFamily('tadoba_worker_camera_frames', 'Frames per camera by outcome',
+                                     labels=['camera_id', 'outcome'])
+        for camera_id, counters in worker.scheduler.per_camera().items():
+            for outcome, value in counters.items():
+                frames.add_metric([str(camera_id), outcome], value)
+        if worker.motion is not None:
+            for camera_id, counters in worker.motion.per_camera().items():
+                frames.add_metric([str(camera_id), 'motion_skipped'], counters['skipped'])
+        if worker.frame_cache is not None:
+            frozen = GaugeMetricFamily('tadoba_worker_camera_frozen',
+                                       'Camera keeps sending the identical image (1 = frozen)',
+                                       labels=['camera_id'])
+            for camera_id, counters in worker.frame_cache.per_camera().items():
+                frames.add_metric([str(camera_id), 'duplicate'], counters['duplicates'])
+                frames.add_metric([str(camera_id), 'frozen_skipped'], counters['frozen_skipped'])
+                frozen.add_metric([str(camera_id)], int(counters['frozen']))
+            yield frozen
+        yield frames
+
+        totals = worker.scheduler.totals()
+        dropped = CounterMetricFamily('tadoba_worker_frames_dropped',
+                                      'Frames never processed, by reason', labels=['reason'])
+        dropped.add_metric(['replaced'], totals['replaced'])
+        dropped.add_metric(['stale'], totals['stale'])
+        yield dropped
+
+        yield CounterMetricFamily('tadoba_worker_frames_processed', 'Frames run through the model',
+                                  value=worker.frames_processed)
+
+        if worker.cascade is not None:
+            verdicts = CounterMetricFamily('tadoba_worker_cascade_verdicts',
+                                           'Second-stage verdicts on first-stage detections',
+                                           labels=['detection_class', 'verdict'])
+            for class_name, stats in worker.cascade.report().items():
+                for verdict in ('confirmed', 'relabeled', 'rejected'):
+                    verdicts.add_metric([class_name, verdict], stats[verdict])
+            yield verdicts
+
+        snapshots = CounterMetricFamily('tadoba_worker_snapshots', 'Snapshots by outcome',
+                                        labels=['outcome'])
+        snapshots.add_metric(['written'], worker.snapshots.written)
+        snapshots.add_metric(['skipped'], worker.snapshots.skipped)
+        snapshots.add_metric(['failed'], worker.snapshots.failed)
+        yield snapshots
+
+        detections = CounterMetricFamily('tadoba_worker_detections', 'Detection records by outcome',
+                                         labels=['outcome'])
+        detections.add_metric(['saved'], worker.outbox.saved)
+        detections.add_metric(['rejected'], worker.outbox.rejected)
+        detections.add_metric(['spooled'], worker.outbox.spooled)
+        yield detections
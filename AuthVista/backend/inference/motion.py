@@ -0,0 +1,194 @@
+"""
+Motion pre-filter for the YOLO Inference Worker
+Skips model inference on static frames using a running-average background
+of a downscaled grayscale image, per camera
+"""
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Width of the grayscale image motion is measured on
+MOTION_WIDTH = 160
+
+# Background learning rate for cv2.accumulateWeighted
+BACKGROUND_LEARNING_RATE = 0.05
+
+
+class CameraMotionState:
+    """Background model and counters for one camera"""
+
+    def __init__(self, sensitivity: float, force_interval: float, enabled: bool = True):
+        self.sensitivity = sensitivity
+        self.force_interval = force_interval
+        self.enabled = enabled
+
+        self.background: Optional[np.ndarray] = None
+        self.last_inference = 0.0
+        self.objects_present = False
+        self.lock = threading.Lock()
+
+        # Stats
+        self.inferred = 0
+        self.skipped = 0
+        self.last_motion = 0.0
+
+
+class MotionGate:
+    """
+    Per-camera motion gate in front of the model
+    - A frame is sent to the model when the fraction of changed pixels
+      (vs. a running-average background) reaches the camera's sensitivity
+    - Inference is forced every force_interval seconds regardless, and kept
+      on while the last inference for the camera found objects, so objects
+      standing still are not lost
+    """
+
+    def __init__(
+        self,
+        sensitivity: float = 0.01,
+        pixel_threshold: int = 25,
+        force_interval: float = 10,
+        camera_settings: Optional[Dict[Any, Dict]] = None
+    ):
+        """
+        Args:
+            sensitivity: Default fraction of changed pixels that counts as motion
+            pixel_threshold: Grayscale difference (0-255) for a pixel to count as changed
+            force_interval: Default max seconds between inferences per camera
+            camera_settings: Per camera overrides, camera_id -> {'sensitivity',
+                'force_interval', 'enabled'}
+        """
+        self.sensitivity = sensitivity
+        self.pixel_threshold = pixel_threshold
+        self.force_interval = force_interval
+        self.camera_settings = {str(key): value for key, value in (camera_settings or {}).items()}
+        # Settings from camera:config, on top of camera_settings
+        self.overrides: Dict[str, Dict] = {}
+
+        self.cameras: Dict[Any, CameraMotionState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, camera_id: Any) -> CameraMotionState:
+        state = self.cameras.get(camera_id)
+        if state is None:
+            with self._lock:
+                state = self.cameras.get(camera_id)
+                if state is None:
+                    sensitivity, force_interval, enabled = self._settings(camera_id)
+                    state = self.cameras[camera_id] = CameraMotionState(
+                        sensitivity=sensitivity, force_interval=force_interval, enabled=enabled
+                    )
+        return state
+
+    def _settings(self, camera_id: Any) -> Tuple[float, float, bool]:
+        """(sensitivity, force_interval, enabled) of a camera: camera:config, then camera_settings, then defaults"""
+        settings = {**self.camera_settings.get(str(camera_id), {}),
+                    **{key: value for key, value in self.overrides.get(str(camera_id), {}).items()
+                       if value is not None}}
+        return (
+            float(settings.get('sensitivity', self.sensitivity)),
+            float(settings.get('force_interval', self.force_interval)),
+            bool(settings.get('enabled', True))
+        )
+
+    def configure(self, camera_id: Any, settings: Optional[Dict] = None):
+        """
+        Apply a camera's motion settings from camera:config at runtime
+
+        Args:
+            camera_id: Camera ID
+            settings: {'sensitivity', 'force_interval', 'enabled'}; missing or
+                None fields fall back to camera_settings and the defaults
+        """
+        if settings:
+            self.overrides[str(camera_id)] = dict(settings)
+        else:
+            self.overrides.pop(str(camera_id), None)
+
+        sensitivity, force_interval, enabled = self._settings(camera_id)
+        for key, state in list(self.cameras.items()):
+            if str(key) != str(camera_id):
+                continue
+            with state.lock:
+                state.sensitivity = sensitivity
+                state.force_interval = force_interval
+                state.enabled = enabled
+
+    def should_infer(self, camera_id: Any, frame: np.ndarray) -> Tuple[bool, str]:
+        """
+        Decide whether a frame goes to the model (blocking, runs on the CPU executor)
+
+        Returns:
+            (run inference, reason) where reason is one of 'disabled',
+            'first', 'motion', 'objects', 'forced' or 'static'
+        """
+        state = self._state(camera_id)
+        height, width = frame.shape[:2]
+        small = cv2.resize(
+            frame, (MOTION_WIDTH, max(1, height * MOTION_WIDTH // width)),
+            interpolation=cv2.INTER_AREA
+        )
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+
+        with state.lock:
+            now = time.monotonic()
+            motion = self._update_background(state, gray)
+
+            if not state.enabled:
+                reason = 'disabled'
+            elif motion is None:
+                reason = 'first'
+            elif motion >= state.sensitivity:
+                reason = 'motion'
+            elif state.objects_present:
+                reason = 'objects'
+            elif now - state.last_inference >= state.force_interval:
+                reason = 'forced'
+            else:
+                state.skipped += 1
+                return False, 'static'
+
+            if motion is not None:
+                state.last_motion = motion
+            state.last_inference = now
+            state.inferred += 1
+            return True, reason
+
+    def _update_background(self, state: CameraMotionState, gray: np.ndarray) -> Optional[float]:
+        """Fraction of changed pixels vs. the background, then fold the frame in"""
+        if state.background is None or state.background.shape != gray.shape:
+            state.background = gray.astype(np.float32)
+            return None
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(state.background))
+        changed = float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+        cv2.accumulateWeighted(gray, state.background, BACKGROUND_LEARNING_RATE)
+        return changed
+
+    def record_result(self, camera_id: Any, detections_count: int):
+        """Remember whether the last inference found objects"""
+        state = self._state(camera_id)
+        with state.lock:
+            state.objects_present = detections_count > 0
+
+    def totals(self) -> Dict[str, int]:
+        """Inferred and skipped frames over all cameras"""
+        return {
+            'inferred': sum(state.inferred for state in list(self.cameras.values())),
+            'skipped': sum(state.skipped for state in list(self.cameras.values()))
+        }
+
+    def per_camera(self) -> Dict[Any, Dict[str, float]]:
+        """Counters and settings for each camera seen so far"""
+        return {
+            camera_id: {
+                'inferred': state.inferred,
+                'skipped': state.skipped,
+                'sensitivity': state.sensitivity,
+                'last_motion': round(state.last_motion, 4)
+            }
+            for camera_id, state in list(self.cameras.items())
+        }
@@ -0,0 +1,291 @@
+"""
+Async detection outbox for the YOLO Inference Worker
+Batches detections to the backend and spools them to disk during outages
+"""
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+# Statuses that say nothing about the payload (expired or missing token,
+# backend not deployed yet, timeouts, rate limits): spool and retry
+RETRY_STATUSES = {401, 403, 404, 408, 429}
+
+
+class DetectionSpool:
+    """
+    Append-only JSONL spool of detections the backend has not accepted yet
+    - Records are replayed strictly in the order they were appended
+    - A sidecar .offset file remembers how far replay got, so a restart
+      does not resend detections that were already saved
+    - The file is truncated once the whole backlog has been replayed
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.offset_path = self.path.with_name(self.path.name + '.offset')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.offset = self._load_offset()
+
+    def _load_offset(self) -> int:
+        try:
+            return int(self.offset_path.read_text().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def has_backlog(self) -> bool:
+        """True if spooled detections are still waiting to be replayed"""
+        try:
+            return self.path.stat().st_size > self.offset
+        except FileNotFoundError:
+            return False
+
+    def append(self, detections: List[Dict]):
+        """Append detections to the end of the spool (blocking)"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for detection in detections:
+                f.write(json.dumps(detection, default=str) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read_batch(self, max_records: int) -> Tuple[List[Dict], int]:
+        """
+        Read the next detections to replay (blocking)
+
+        Returns:
+            (detections, offset to commit once they are saved)
+        """
+        detections = []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            offset = self.offset
+            while len(detections) < max_records:
+                line = f.readline()
+                # Stop at EOF or at a partially written last line
+                if not line or not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                try:
+                    detections.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"⚠️ Skipping corrupt spool record at byte {offset - len(line)}")
+        return detections, offset
+
+    def commit(self, offset: int):
+        """Mark everything before offset as saved; compact once fully replayed (blocking)"""
+        self.offset = offset
+        if self.path.stat().st_size <= offset:
+            # Backlog drained: start a fresh spool
+            self.path.unlink(missing_ok=True)
+            self.offset_path.unlink(missing_ok=True)
+            self.offset = 0
+            return
+        self.offset_path.write_text(str(offset))
+
+
+class DetectionOutbox:
+    """
+    Async outbox between the worker and POST /api/detections/batch
+    - Detections are buffered and flushed by size or by time
+    - Uses one pooled httpx.AsyncClient for every request
+    - When the backend is unreachable, batches go to the on-disk spool;
+      while a backlog exists, new batches are spooled behind it so the
+      backend always receives detections in order
+    """
+
+    def __init__(
+        self,
+        backend_url: str,
+        spool_path: Path,
+        batch_size: int = 50,
+        flush_interval_ms: float = 500,
+        retry_seconds: float = 5,
+        api_token: Optional[str] = None,
+        on_saved: Optional[Callable[[List[Dict]], Awaitable[None]]] = None,
+        on_post: Optional[Callable[[float, str], None]] = None
+    ):
+        """
+        Args:
+            backend_url: Backend base URL
+            spool_path: Append-only file used during backend outages
+            batch_size: Flush as soon as this many detections are buffered
+            flush_interval_ms: Flush buffered detections at least this often
+            retry_seconds: Delay between replay attempts while spooled
+            api_token: Optional bearer token for the backend API
+            on_saved: Coroutine called with the records the backend created,
+                after the batch is committed; its errors are logged, not retried
+            on_post: Called after every POST with its duration in seconds and
+                outcome ('saved', 'rejected' or 'failed')
+        """
+        self.backend_url = backend_url.rstrip('/')
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval_ms / 1000
+        self.retry_seconds = retry_seconds
+        self.api_token = api_token
+        self.on_saved = on_saved
+        self.on_post = on_post
+
+        self.spool = DetectionSpool(spool_path)
+        self.pending: List[Dict] = []
+        self.client: Optional[httpx.AsyncClient] = None
+
+        # Serializes posting and spool access between flush and replay
+        self._lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+        # Stats
+        self.saved = 0
+        self.rejected = 0
+        self.spooled = 0
+
+    async def start(self):
+        """Open the HTTP client and start the flush and replay loops"""
+        headers = {}
+        if self.api_token:
+            headers['Authorization'] = f"Bearer {self.api_token}"
+
+        self.client = httpx.AsyncClient(
+            base_url=self.backend_url,
+            headers=headers,
+            timeout=httpx.Timeout(5.0),
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)
+        )
+        self._tasks = [
+            asyncio.create_task(self._flush_loop()),
+            asyncio.create_task(self._replay_loop())
+        ]
+
+        if self.spool.has_backlog():
+            logger.warning(f"📼 Found spooled detections in {self.spool.path}, replaying")
+
+    def add(self, detection: Dict):
+        """Queue a detection for the next flush (never blocks)"""
+        self.pending.append(detection)
+        if len(self.pending) >= self.batch_size:
+            self._flush_requested.set()
+
+    async def flush(self):
+        """Send buffered detections now, or spool them if the backend is down"""
+        if not self.pending:
+            return
+
+        batch, self.pending = self.pending, []
+        created = []
+        async with self._lock:
+            sent = False
+            if not self.spool.has_backlog():
+                sent, created = await self._post(batch)
+            if not sent:
+                await asyncio.to_thread(self.spool.append, batch)
+                self.spooled += len(batch)
+                logger.warning(f"📼 Spooled {len(batch)} detections")
+        await self._notify(created)
+
+    async def close(self):
+        """Flush what is buffered and release the HTTP client"""
+        for task in self._tasks:
+            task.cancel()
+        await self.flush()
+        if self.client is not None:
+            await self.client.aclose()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Outbox flush failed: {e}")
+
+    async def _replay_loop(self):
+        while True:
+            await asyncio.sleep(self.retry_seconds)
+            try:
+                await self._replay()
+            except Exception as e:
+                logger.error(f"❌ Spool replay failed: {e}")
+
+    async def _replay(self):
+        """Replay the spooled backlog in order until it is empty or the backend fails"""
+        async with self._lock:
+            while self.spool.has_backlog():
+                batch, offset = await asyncio.to_thread(self.spool.read_batch, self.batch_size)
+                created = []
+                if batch:
+                    sent, created = await self._post(batch)
+                    if not sent:
+                        return
+                # Commit before notifying: the rows exist now, a failed
+                # notification must not send them again
+                await asyncio.to_thread(self.spool.commit, offset)
+                logger.info(f"📼 Replayed {len(batch)} spooled detections")
+                await self._notify(created)
+
+    async def _notify(self, created: List[Dict]):
+        """Pass saved detections to on_saved; failures are logged, never retried"""
+        if not created or self.on_saved is None:
+            return
+        try:
+            await self.on_saved(created)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not announce {len(created)} saved detections: {e}")
+
+    def _record_post(self, start: float, outcome: str):
+        if self.on_post is not None:
+            self.on_post(time.perf_counter() - start, outcome)
+
+    async def _post(self, batch: List[Dict]) -> Tuple[bool, List[Dict]]:
+        """
+        POST a batch to the backend
+
+        Returns:
+            (sent, created): sent is False if the batch should be retried
+            later (backend unreachable, failing or refusing our credentials),
+            True once the backend has answered definitively (saved, or
+            rejected the payload itself); created are the saved detections
+        """
+        start = time.perf_counter()
+        try:
+            response = await self.client.post('/api/detections/batch', json=batch)
+        except httpx.HTTPError as e:
+            self._record_post(start, 'failed')
+            logger.error(f"❌ Backend unreachable: {e}")
+            return False, []
+
+        if response.status_code >= 500 or response.status_code in RETRY_STATUSES:
+            self._record_post(start, 'failed')
+            hint = " (check BACKEND_API_TOKEN)" if response.status_code in (401, 403) else ""
+            logger.error(f"❌ Backend error saving detections: {response.status_code}{hint}")
+            return False, []
+
+        if not response.is_success:
+            # A malformed batch (400 / 422) would block the spool forever if retried;
+            # per-item validation errors come back in 'rejected' instead
+            self._record_post(start, 'rejected')
+            self.rejected += len(batch)
+            logger.error(f"❌ Detections rejected: {response.status_code} {response.text[:200]}")
+            return True, []
+
+        self._record_post(start, 'saved')
+
+        result = response.json()
+        created = result.get('created', [])
+        for rejection in result.get('rejected', []):
+            logger.error(f"❌ Detection rejected: {rejection.get('error')}")
+        self.rejected += len(result.get('rejected', []))
+        self.saved += len(created)
+
+        if created:
+            logger.success(f"✅ Saved {len(created)} detections")
+        return True, created
@@ -0,0 +1,152 @@
+"""
+YOLO result parsing for the inference worker
+Turns ultralytics Results into plain, picklable detection dicts
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class ClassLookup:
+    """
+    Array lookup for the classes we keep
+    - mask[cls_id] is True for kept classes
+    - names[cls_id] is the class name
+    """
+
+    def __init__(self, class_names: Dict[int, str]):
+        size = max(class_names, default=-1) + 1
+        self.mask = np.zeros(size, dtype=bool)
+        self.names = np.empty(size, dtype=object)
+        for cls_id, name in class_names.items():
+            self.mask[cls_id] = True
+            self.names[cls_id] = name
+
+    def keep(self, cls_ids: np.ndarray) -> np.ndarray:
+        """Boolean mask of boxes whose class is kept"""
+        keep = np.zeros(len(cls_ids), dtype=bool)
+        known = (cls_ids >= 0) & (cls_ids < len(self.mask))
+        keep[known] = self.mask[cls_ids[known]]
+        return keep
+
+
+_lookups: Dict[Tuple, ClassLookup] = {}
+
+
+def class_lookup(class_names: Dict[int, str]) -> ClassLookup:
+    """Cached ClassLookup for a class mapping"""
+    key = tuple(sorted(class_names.items()))
+    lookup = _lookups.get(key)
+    if lookup is None:
+        lookup = _lookups[key] = ClassLookup(class_names)
+    return lookup
+
+
+def parse_arrays(
+    xyxy: np.ndarray,
+    conf: np.ndarray,
+    cls_ids: np.ndarray,
+    class_names: Dict[int, str]
+) -> List[Dict]:
+    """
+    Parse whole-result box arrays into detection dicts
+
+    Class filtering and bbox math run once over all boxes; dicts are only
+    built for the boxes that survive the class filter.
+
+    Args:
+        xyxy: (N, 4) corners
+        conf: (N,) confidences
+        cls_ids: (N,) class IDs
+        class_names: Class ID -> name mapping of classes to keep
+
+    Returns:
+        List of {'detection_class', 'confidence', 'bbox'} dicts
+    """
+    lookup = class_lookup(class_names)
+    cls_ids = cls_ids.astype(np.intp, copy=False)
+
+    # Filter for wildlife classes
+    keep = lookup.keep(cls_ids)
+    if not keep.any():
+        return []
+
+    xyxy = xyxy[keep].astype(np.float64, copy=False)
+    names = lookup.names[cls_ids[keep]]
+
+    # Calculate bbox in YOLO format (center_x, center_y, width, height)
+    size = xyxy[:, 2:] - xyxy[:, :2]
+    center = xyxy[:, :2] + size / 2
+    rows = np.hstack([center, size, xyxy]).tolist()
+
+    return [
+        {
+            'detection_class': name,
+            'confidence': confidence,
+            'bbox': {
+                'x': cx, 'y': cy, 'width': w, 'height': h,
+                # Also include corners for drawing
+                'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2
+            }
+        }
+        for name, confidence, (cx, cy, w, h, x1, y1, x2, y2)
+        in zip(names, conf[keep].astype(np.float64).tolist(), rows)
+    ]
+
+
+def parse_result(result, class_names: Dict[int, str]) -> List[Dict]:
+    """
+    Parse one ultralytics Results object into detection dicts
+
+    Box tensors are moved to numpy once per result, not once per box.
+
+    Args:
+        result: ultralytics Results for a single frame
+        class_names: Class ID -> name mapping of classes to keep
+
+    Returns:
+        List of {'detection_class', 'confidence', 'bbox'} dicts
+    """
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return []
+
+    return parse_arrays(
+        boxes.xyxy.cpu().numpy(),
+        boxes.conf.cpu().numpy(),
+        boxes.cls.cpu().numpy(),
+        class_names
+    )
+
+
+def offset_detection(detection: Dict, dx: float, dy: float) -> Dict:
+    """Copy of a detection with its bbox moved by (dx, dy), e.g. from a crop to the full frame"""
+    if not dx and not dy:
+        return detection
+    bbox = detection['bbox']
+    return {
+        **detection,
+        'bbox': {
+            **bbox,
+            'x': bbox['x'] + dx, 'y': bbox['y'] + dy,
+            'x1': bbox['x1'] + dx, 'y1': bbox['y1'] + dy,
+            'x2': bbox['x2'] + dx, 'y2': bbox['y2'] + dy
+        }
+    }
+
+
+def scale_detection(detection: Dict, sx: float, sy: float) -> Dict:
+    """Copy of a detection with its bbox scaled, e.g. from a reduced decode to source pixels"""
+    if sx == 1 and sy == 1:
+        return detection
+    bbox = detection['bbox']
+    return {
+        **detection,
+        'bbox': {
+            **bbox,
+            'x': bbox['x'] * sx, 'y': bbox['y'] * sy,
+            'width': bbox['width'] * sx, 'height': bbox['height'] * sy,
+            'x1': bbox['x1'] * sx, 'y1': bbox['y1'] * sy,
+            'x2': bbox['x2'] * sx, 'y2': bbox['y2'] * sy
+        }
+    }
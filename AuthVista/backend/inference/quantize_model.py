@@ -0,0 +1,92 @@
+"""
+INT8 Model Quantization Script
+Builds an INT8 OpenVINO variant of MODEL_PATH, calibrated on our own snapshots
+Use it with INFERENCE_RUNTIME=openvino-int8 once compare_quantized.py accepts it
+"""
+import argparse
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import yaml
+
+sys.path.append(str(Path(__file__).parent))
+
+from runtime import exported_model_path
+
+DEFAULT_MODEL = Path(__file__).parent.parent / "models" / "yolov8n.pt"
+DEFAULT_IMAGES = Path(__file__).parent.parent / "snapshots"
+
+# Written into the INT8 model directory so evaluation can skip these images
+CALIBRATION_LIST = "calibration_images.txt"
+
+
+def select_calibration_images(images_dir: Path, limit: int, seed: int = 0) -> list:
+    """Random, reproducible sample of JPEGs to calibrate on"""
+    paths = sorted(images_dir.glob('**/*.jpg'))
+    random.Random(seed).shuffle(paths)
+    return paths[:limit]
+
+
+def write_calibration_dataset(images: list, root: Path, class_names: dict) -> Path:
+    """
+    Lay out images as an ultralytics dataset (labels are not needed for
+    calibration) and return the dataset YAML path
+    """
+    image_dir = root / "images" / "val"
+    image_dir.mkdir(parents=True)
+    for index, image in enumerate(images):
+        (image_dir / f"{index:06d}{image.suffix}").symlink_to(image.resolve())
+
+    data_yaml = root / "calibration.yaml"
+    data_yaml.write_text(yaml.safe_dump({
+        'path': str(root),
+        'train': 'images/val',
+        'val': 'images/val',
+        'names': class_names
+    }))
+    return data_yaml
+
+
+def quantize(model_path: Path, images_dir: Path, limit: int) -> Path:
+    """Export an INT8 OpenVINO model calibrated on images_dir"""
+    from ultralytics import YOLO
+
+    images = select_calibration_images(images_dir, limit)
+    if not images:
+        raise FileNotFoundError(f"No calibration images (*.jpg) found in {images_dir}")
+
+    print(f"📸 Calibrating on {len(images)} images from {images_dir}")
+    model = YOLO(str(model_path))
+
+    with tempfile.TemporaryDirectory(prefix="tadoba_calib_") as tmp:
+        data_yaml = write_calibration_dataset(images, Path(tmp), model.names)
+        print("🔧 Exporting INT8 OpenVINO model (this may take a few minutes)...")
+        model.export(format='openvino', int8=True, dynamic=True, data=str(data_yaml))
+
+    target = exported_model_path(str(model_path), 'openvino-int8')
+    (target / CALIBRATION_LIST).write_text("\n".join(str(p.resolve()) for p in images) + "\n")
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', type=Path, default=DEFAULT_MODEL)
+    parser.add_argument('--images', type=Path, default=DEFAULT_IMAGES,
+                        help='Directory of snapshots to calibrate on')
+    parser.add_argument('--limit', type=int, default=300,
+                        help='Max calibration images')
+    args = parser.parse_args()
+
+    print("🦁 Tadoba Wildlife Surveillance - INT8 Quantization")
+    print("=" * 60)
+    target = quantize(args.model, args.images, args.limit)
+    print("=" * 60)
+    print(f"✅ INT8 model ready: {target}")
+    print("   Next: python compare_quantized.py  (accuracy check)")
+    print("   Then: INFERENCE_RUNTIME=openvino-int8 python worker.py")
+
+
+if __name__ == "__main__":
+    main()
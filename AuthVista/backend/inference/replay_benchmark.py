@@ -0,0 +1,311 @@
+"""
+Offline Replay Benchmark
+Replays a video file or a directory of JPEGs as N simulated cameras through
+the worker's own frame pipeline (scheduler, decode, motion gate, batching,
+inference, tracking, snapshots, outbox) against a local stub backend, and
+reports sustained FPS, per-stage latency percentiles and peak RSS as JSON
+
+Worker settings (INFERENCE_RUNTIME, INFERENCE_EXECUTOR, MAX_BATCH_SIZE,
+MOTION_GATE_ENABLED, ...) come from the environment exactly as for
+worker.py, so runs of different worker versions or settings are comparable.
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+import cv2
+import numpy as np
+from loguru import logger
+
+sys.path.append(str(Path(__file__).parent))
+
+DEFAULT_MODEL = Path(__file__).parent.parent / "models" / "yolov8n.pt"
+
+
+class StubBackendHandler(BaseHTTPRequestHandler):
+    """Accepts POST /api/detections/batch and echoes every detection as created"""
+
+    created = 0
+
+    def do_POST(self):
+        batch = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'[]')
+        created = []
+        for detection in batch:
+            StubBackendHandler.created += 1
+            created.append({**detection, 'id': StubBackendHandler.created})
+
+        body = json.dumps({'created': created, 'rejected': []}).encode()
+        self.send_response(201)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_backend() -> ThreadingHTTPServer:
+    """Stub backend on a free local port, served from a daemon thread"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubBackendHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class StubSocket:
+    """Stands in for the Socket.IO client: counts emitted events"""
+
+    connected = True
+
+    def __init__(self):
+        self.events: Dict[str, int] = {}
+
+    async def emit(self, event: str, data=None):
+        self.events[event] = self.events.get(event, 0) + 1
+
+
+def load_source(source: Path, max_frames: int, jpeg_quality: int) -> List[bytes]:
+    """JPEG bytes of the first max_frames frames of a video file or JPEG directory"""
+    if source.is_dir():
+        paths = sorted(source.glob('**/*.jpg'))[:max_frames]
+        return [path.read_bytes() for path in paths]
+
+    capture = cv2.VideoCapture(str(source))
+    frames = []
+    try:
+        while len(frames) < max_frames:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+            if ok:
+                frames.append(encoded.tobytes())
+    finally:
+        capture.release()
+    return frames
+
+
+async def simulate_camera(worker, camera_id: int, frames: List[bytes], offset: int,
+                          fps: float, duration: float) -> int:
+    """Send frames at a fixed rate, looping over the source; returns frames sent"""
+    loop = asyncio.get_running_loop()
+    interval = 1.0 / fps
+    end = loop.time() + duration
+    next_send = loop.time()
+    sent = 0
+
+    while loop.time() < end:
+        await worker.process_frame({
+            'jpeg': frames[(offset + sent) % len(frames)],
+            'camera_id': camera_id,
+            'timestamp': datetime.utcnow().isoformat()
+        })
+        sent += 1
+        next_send += interval
+        await asyncio.sleep(max(0.0, next_send - loop.time()))
+    return sent
+
+
+async def drain(worker, timeout: float):
+    """Wait until every scheduled frame is processed and the outbox is empty"""
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    while loop.time() < end and (worker.scheduler.depth or worker.in_flight):
+        await asyncio.sleep(0.05)
+    await worker.outbox.flush()
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Count and p50/p95/p99 in milliseconds"""
+    if not samples:
+        return {'count': 0}
+    p50, p95, p99 = (round(float(value), 2) for value in np.percentile(np.array(samples) * 1000, [50, 95, 99]))
+    return {'count': len(samples), 'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+
+
+def child_pids() -> List[int]:
+    """PIDs of this process's live children (Linux /proc, empty elsewhere)"""
+    pids = []
+    for children in Path('/proc/self/task').glob('*/children'):
+        try:
+            pids.extend(int(pid) for pid in children.read_text().split())
+        except OSError:
+            continue
+    return pids
+
+
+def peak_rss_kib(pid: int) -> int:
+    """High-water RSS of a live process (VmHWM), 0 if it is gone"""
+    try:
+        for line in Path(f'/proc/{pid}/status').read_text().splitlines():
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def peak_rss_mb() -> Dict[str, float]:
+    """
+    Peak resident set size of this process and of its largest live child
+
+    Call while the inference processes are still running: RUSAGE_CHILDREN
+    only covers reaped children, so they are read from /proc instead.
+    """
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = max((peak_rss_kib(pid) for pid in child_pids()), default=0)
+    return {'worker': round(own / 1024, 1), 'largest_child': round(children / 1024, 1)}
+
+
+def worker_version() -> str:
+    """Git commit of the worker code, if available"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+async def replay(args, frames: List[bytes]) -> Dict:
+    import worker as worker_module
+
+    # Before the run: git must not be among the children measured below
+    version = worker_version()
+    worker = worker_module.YOLOInferenceWorker()
+    worker.sio = StubSocket()
+    worker.metrics.keep_samples()
+
+    # Same startup as the worker, minus the backend connection
+    started = time.perf_counter()
+    await worker.start_pipeline(asyncio.create_task(worker.prepare_model()))
+    startup_seconds = time.perf_counter() - started
+
+    try:
+        started = time.perf_counter()
+        spacing = max(1, len(frames) // args.cameras)
+        sent = await asyncio.gather(*(
+            simulate_camera(worker, camera_id, frames, camera_id * spacing, args.fps, args.duration)
+            for camera_id in range(1, args.cameras + 1)
+        ))
+        await drain(worker, args.drain_timeout)
+        elapsed = time.perf_counter() - started
+
+        frame_counters = worker.scheduler.totals()
+        motion_skipped = worker.motion.totals()['skipped'] if worker.motion is not None else 0
+        return {
+            'worker_version': version,
+            'started_at': datetime.utcnow().isoformat(),
+            'source': str(args.source),
+            'source_frames': len(frames),
+            'cameras': args.cameras,
+            'fps_per_camera': args.fps,
+            'duration_seconds': round(elapsed, 2),
+            'settings': {
+                'runtime': worker_module.INFERENCE_RUNTIME,
+                'executor': worker_module.INFERENCE_EXECUTOR,
+                'processes': worker_module.INFERENCE_PROCESSES,
+                'max_batch_size': worker_module.MAX_BATCH_SIZE,
+                'max_batch_wait_ms': worker_module.MAX_BATCH_WAIT_MS,
+                'max_in_flight': worker_module.MAX_IN_FLIGHT,
+                'imgsz': worker_module.DEFAULT_IMGSZ,
+                'motion_gate': worker_module.MOTION_GATE_ENABLED,
+                'tracking': worker_module.TRACKING_ENABLED
+            },
+            'startup_seconds': round(startup_seconds, 2),
+            'frames': {
+                'offered': sum(sent),
+                'inferred': worker.frames_processed,
+                'motion_skipped': motion_skipped,
+                'replaced': frame_counters['replaced'],
+                'stale': frame_counters['stale']
+            },
+            'offered_fps': round(sum(sent) / elapsed, 1),
+            'sustained_fps': round(worker.frames_processed / elapsed, 1),
+            'stages': {stage: percentiles(samples) for stage, samples in worker.metrics.samples.items()},
+            'detections_saved': worker.outbox.saved,
+            'snapshots_written': worker.snapshots.written,
+            'peak_rss_mb': peak_rss_mb()
+        }
+    finally:
+        await worker.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('source', type=Path, help='Video file or directory of JPEGs')
+    parser.add_argument('--model', default=str(DEFAULT_MODEL))
+    parser.add_argument('--cameras', type=int, default=4, help='Simulated cameras')
+    parser.add_argument('--fps', type=float, default=5, help='Frames per second per camera')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to replay')
+    parser.add_argument('--max-frames', type=int, default=300, help='Source frames to load (looped)')
+    parser.add_argument('--jpeg-quality', type=int, default=85, help='Quality when encoding video frames')
+    parser.add_argument('--drain-timeout', type=float, default=30,
+                        help='Max seconds to wait for queued frames after the replay')
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--json', type=Path, help='Write results to this file')
+    args = parser.parse_args()
+
+    print("🦁 Tadoba Wildlife Surveillance - Replay Benchmark")
+    print("=" * 70)
+
+    if not Path(args.model).exists():
+        print(f"❌ Model not found at: {args.model}")
+        print("💡 Run: python download_model.py")
+        return
+
+    frames = load_source(args.source, args.max_frames, args.jpeg_quality)
+    if not frames:
+        print(f"❌ No frames found in {args.source}")
+        return
+
+    # The worker reads its settings at import: point it at the stub backend
+    # and keep snapshots, spool and metrics out of the real deployment
+    backend = start_stub_backend()
+    scratch = Path(tempfile.mkdtemp(prefix='replay-benchmark-'))
+    os.environ.update({
+        'MODEL_PATH': args.model,
+        'BACKEND_URL': f"http://127.0.0.1:{backend.server_address[1]}",
+        'SNAPSHOT_DIR': str(scratch / 'snapshots'),
+        'OUTBOX_SPOOL_PATH': str(scratch / 'spool' / 'detections.jsonl'),
+        'METRICS_PORT': '0'
+    })
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+
+    print(f"🎞️ {len(frames)} source frames, {args.cameras} cameras at {args.fps} fps "
+          f"for {args.duration:.0f}s")
+    results = asyncio.run(replay(args, frames))
+    backend.shutdown()
+
+    print(f"📊 {results['frames']['offered']} frames offered ({results['offered_fps']} fps), "
+          f"{results['frames']['inferred']} inferred ({results['sustained_fps']} fps sustained), "
+          f"{results['frames']['motion_skipped']} skipped as static, "
+          f"{results['frames']['replaced'] + results['frames']['stale']} dropped")
+    for stage, stats in results['stages'].items():
+        if stats['count']:
+            print(f"   {stage:<10} p50 {stats['p50_ms']:8.1f}ms  p95 {stats['p95_ms']:8.1f}ms  "
+                  f"p99 {stats['p99_ms']:8.1f}ms  ({stats['count']})")
+    print(f"🧠 Peak RSS: {results['peak_rss_mb']['worker']} MB worker, "
+          f"{results['peak_rss_mb']['largest_child']} MB largest child")
+    print(f"🗂️ Scratch files in {scratch}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Inference resolution for the YOLO Inference Worker
+Picks the model input size (imgsz) per frame: fixed per camera, or
+adaptive to how far behind the worker is
+"""
+import time
+from typing import Any, Iterable, Optional, Tuple
+
+# YOLOv8 input sizes must be multiples of the model stride
+IMGSZ_STRIDE = 32
+
+
+def round_imgsz(imgsz: float) -> int:
+    """Nearest valid input size"""
+    return max(IMGSZ_STRIDE, int(round(imgsz / IMGSZ_STRIDE)) * IMGSZ_STRIDE)
+
+
+def frame_imgsz(imgsz: int, frame_shape: Tuple[int, ...]) -> int:
+    """Cap an input size at the frame's long side: upscaling small frames only costs time"""
+    long_side = max(frame_shape[:2])
+    cap = -(-long_side // IMGSZ_STRIDE) * IMGSZ_STRIDE
+    return min(round_imgsz(imgsz), cap)
+
+
+class AdaptiveResolution:
+    """
+    Worker-wide input size for cameras in adaptive mode
+    - Fed the inference-stage latency (batch wait plus predict) of frames
+      inferred at the adaptive size only; fixed-size cameras do not steer it
+    - Steps down the size ladder while the smoothed latency is above
+      target_ms (the worker is behind)
+    - Steps back up while it is below half of target_ms (spare capacity)
+    - At most one step per cooldown seconds, so every size gets measured
+      before the next change
+    """
+
+    def __init__(
+        self,
+        sizes: Iterable[int] = (320, 416, 512, 640),
+        target_ms: float = 500,
+        cooldown: float = 5,
+        smoothing: float = 0.2
+    ):
+        """
+        Args:
+            sizes: Input sizes to choose from; starts at the largest
+            target_ms: Inference-stage latency the worker should stay under
+            cooldown: Min seconds between two size changes
+            smoothing: Weight of the newest latency in the moving average
+        """
+        self.sizes = sorted({round_imgsz(size) for size in sizes})
+        self.index = len(self.sizes) - 1
+        self.target_ms = target_ms
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+
+        self.latency_ms: Optional[float] = None
+        self.last_change = time.monotonic()
+
+        # Stats
+        self.changes = 0
+
+    @property
+    def imgsz(self) -> int:
+        return self.sizes[self.index]
+
+    def record(self, latency_ms: float) -> Optional[int]:
+        """
+        Feed the inference-stage latency of one frame inferred at the adaptive size
+
+        Returns:
+            The new input size when it changed, else None
+        """
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += self.smoothing * (latency_ms - self.latency_ms)
+
+        now = time.monotonic()
+        if now - self.last_change < self.cooldown:
+            return None
+
+        if self.latency_ms > self.target_ms and self.index > 0:
+            self.index -= 1
+        elif self.latency_ms < self.target_ms / 2 and self.index < len(self.sizes) - 1:
+            self.index += 1
+        else:
+            return None
+
+        # Start measuring the new size from scratch
+        self.latency_ms = None
+        self.last_change = now
+        self.changes += 1
+        return self.imgsz
+
+    def target(self, setting: Any) -> int:
+        """Input size for a camera's setting (int or 'adaptive'), before any frame is seen"""
+        return self.imgsz if setting == 'adaptive' else int(setting)
+
+    def choose(self, setting: Any, frame_shape: Tuple[int, ...]) -> int:
+        """Input size for a frame given its camera's setting (int or 'adaptive')"""
+        return frame_imgsz(self.target(setting), frame_shape)
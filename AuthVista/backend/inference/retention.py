@@ -0,0 +1,164 @@
+"""
+Snapshot retention for the YOLO Inference Worker
+Keeps SNAPSHOT_DIR under a byte quota and a maximum age, deleting the
+oldest snapshots first but never those linked to open incidents
+"""
+import os
+import re
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from loguru import logger
+
+# Day shard directories written by SnapshotWriter
+DAY_DIR = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+class SnapshotRetention:
+    """
+    Retention sweep over the sharded snapshot directory
+    - Snapshots older than max_age_days are deleted
+    - While the directory is above max_bytes, the oldest remaining
+      snapshots are deleted until it is below again
+    - Protected paths (snapshots of open incidents) are always kept
+    - Unsharded snapshots left in the top directory by older workers are
+      treated as the oldest
+    - Empty shard directories of past days are removed
+    """
+
+    def __init__(self, snapshot_dir: Path, max_bytes: int = 0, max_age_days: float = 0):
+        """
+        Args:
+            snapshot_dir: SNAPSHOT_DIR of the SnapshotWriter
+            max_bytes: Byte quota, 0 for none
+            max_age_days: Max snapshot age in days, 0 for none
+        """
+        self.snapshot_dir = Path(snapshot_dir)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+
+        # Stats
+        self.sweeps = 0
+        self.deleted_files = 0
+        self.deleted_bytes = 0
+        self.last_usage_bytes = 0
+        self.last_protected_kept = 0
+
+    def _day_dirs(self) -> List[Path]:
+        """Day shards, oldest first"""
+        try:
+            entries = [Path(e.path) for e in os.scandir(self.snapshot_dir)
+                       if e.is_dir() and DAY_DIR.match(e.name)]
+        except FileNotFoundError:
+            return []
+        return sorted(entries)
+
+    @staticmethod
+    def _files(directory: Path, recursive: bool) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of the snapshots in a directory, oldest first"""
+        files = []
+        stack = [directory]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(Path(entry.path))
+                elif entry.name.endswith('.jpg'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, os.path.abspath(entry.path)))
+        files.sort()
+        return files
+
+    def _snapshots(self) -> Iterable[Tuple[float, int, str]]:
+        """All snapshots, oldest first: legacy top-level files, then each day"""
+        yield from self._files(self.snapshot_dir, recursive=False)
+        for day in self._day_dirs():
+            yield from self._files(day, recursive=True)
+
+    def sweep(self, protected: Set[str]) -> Dict[str, int]:
+        """
+        Enforce age and quota once (blocking, runs off the event loop)
+
+        Args:
+            protected: Snapshot paths that must be kept (any form, resolved here)
+
+        Returns:
+            Files and bytes deleted, remaining usage and protected files kept
+        """
+        keep = {os.path.abspath(path) for path in protected}
+        snapshots = list(self._snapshots())
+        usage = sum(size for _, size, _ in snapshots)
+        cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days else None
+
+        deleted_files = deleted_bytes = protected_kept = 0
+        for mtime, size, path in snapshots:
+            expired = cutoff is not None and mtime < cutoff
+            over_quota = self.max_bytes and usage > self.max_bytes
+            if not expired and not over_quota:
+                # Oldest first: everything after this is newer and fits
+                break
+            if path in keep:
+                protected_kept += 1
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"⚠️ Could not delete snapshot {path}: {e}")
+                continue
+            usage -= size
+            deleted_files += 1
+            deleted_bytes += size
+
+        self._remove_empty_dirs()
+
+        self.sweeps += 1
+        self.deleted_files += deleted_files
+        self.deleted_bytes += deleted_bytes
+        self.last_usage_bytes = usage
+        self.last_protected_kept = protected_kept
+        if self.max_bytes and usage > self.max_bytes:
+            logger.warning(f"⚠️ Snapshots still use {usage / 1e9:.2f} GB of a "
+                           f"{self.max_bytes / 1e9:.2f} GB quota ({protected_kept} protected)")
+        return {
+            'deleted_files': deleted_files,
+            'deleted_bytes': deleted_bytes,
+            'usage_bytes': usage,
+            'protected_kept': protected_kept
+        }
+
+    def _remove_empty_dirs(self):
+        """Drop empty shards of days before yesterday (late writes may still land in yesterday's)"""
+        recent = {(date.today() - timedelta(days=n)).isoformat() for n in (0, 1)}
+        for day in self._day_dirs():
+            if day.name in recent:
+                continue
+            for camera_dir in list(day.iterdir()):
+                if camera_dir.is_dir():
+                    try:
+                        camera_dir.rmdir()
+                    except OSError:
+                        pass
+            try:
+                day.rmdir()
+            except OSError:
+                pass
+
+    def totals(self) -> Dict[str, Optional[int]]:
+        return {
+            'sweeps': self.sweeps,
+            'deleted_files': self.deleted_files,
+            'deleted_bytes': self.deleted_bytes,
+            'usage_bytes': self.last_usage_bytes,
+            'protected_kept': self.last_protected_kept
+        }
@@ -0,0 +1,150 @@
+"""
+Inference runtime selection for the YOLO Inference Worker
+Exports the PyTorch model to a CPU-optimized format on first use, caches the
+exported artifact next to the model, and loads the selected runtime
+"""
+import hashlib
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import cv2
+import numpy as np
+from loguru import logger
+
+# Runtime name -> ultralytics export format (None: use the .pt as is)
+RUNTIME_FORMATS = {
+    'torch': None,
+    'onnx': 'onnx',
+    'openvino': 'openvino',
+    'openvino-int8': 'openvino',
+}
+
+# Runtimes whose export needs a calibration set (built by quantize_model.py)
+CALIBRATED_RUNTIMES = {'openvino-int8'}
+
+
+def exported_model_path(model_path: str, runtime: str) -> Path:
+    """Where ultralytics writes the exported model for a runtime"""
+    path = Path(model_path)
+    if runtime == 'onnx':
+        return path.with_suffix('.onnx')
+    if runtime == 'openvino':
+        return path.parent / f"{path.stem}_openvino_model"
+    if runtime == 'openvino-int8':
+        return path.parent / f"{path.stem}_int8_openvino_model"
+    return path
+
+
+def ensure_exported(model_path: str, runtime: str) -> str:
+    """
+    Return the model path to load for a runtime, exporting it if needed
+
+    The export is reused as long as it is newer than the .pt file, so only
+    the first start (or a model update) pays the export cost.
+    """
+    if runtime not in RUNTIME_FORMATS:
+        raise ValueError(f"Unknown inference runtime: {runtime} "
+                         f"(expected one of {', '.join(RUNTIME_FORMATS)})")
+
+    export_format = RUNTIME_FORMATS[runtime]
+    if export_format is None:
+        return model_path
+
+    target = exported_model_path(model_path, runtime)
+    if target.exists() and target.stat().st_mtime >= Path(model_path).stat().st_mtime:
+        logger.info(f"📦 Using cached {runtime} model: {target}")
+        return str(target)
+
+    if runtime in CALIBRATED_RUNTIMES:
+        raise FileNotFoundError(f"No up-to-date {runtime} model at {target}. "
+                                f"Run: python quantize_model.py --model {model_path}")
+
+    from ultralytics import YOLO
+
+    logger.info(f"🔧 Exporting {model_path} to {runtime} (first start only)...")
+    start = time.perf_counter()
+    # Dynamic axes so batched predict calls work on the exported model
+    exported = YOLO(model_path).export(format=export_format, dynamic=True)
+    logger.success(f"✅ Exported {runtime} model in {time.perf_counter() - start:.1f}s: {exported}")
+    return str(exported)
+
+
+def model_version(model_path: str) -> str:
+    """Version of a model file: its name plus a hash of its contents, e.g. yolov8n-3f1c0b2a9d4e"""
+    digest = hashlib.sha256()
+    with open(model_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return f"{Path(model_path).stem}-{digest.hexdigest()[:12]}"
+
+
+def load_model(model_path: str, runtime: str = 'torch'):
+    """Load the YOLO model for the selected runtime"""
+    from ultralytics import YOLO
+
+    path = ensure_exported(model_path, runtime)
+    return YOLO(path, task='detect')
+
+
+def warm_up(model, batch_size: int = 1) -> float:
+    """
+    Run throwaway predicts so the first real frames do not pay one-time costs
+    (graph compilation, allocations, thread pool start-up)
+
+    Args:
+        model: Loaded YOLO model
+        batch_size: Largest batch the model will see; warmed as well as single frames
+
+    Returns:
+        Seconds spent warming up
+    """
+    start = time.perf_counter()
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    for size in sorted({1, max(1, batch_size)}):
+        model.predict([frame] * size, verbose=False)
+    return time.perf_counter() - start
+
+
+def load_sample_frames(directory: Path, limit: int = 16) -> List[np.ndarray]:
+    """
+    Frames for latency comparisons: the newest JPEGs in a directory
+    (e.g. saved snapshots), or synthetic 720p frames if there are none
+    """
+    paths = sorted(Path(directory).glob('**/*.jpg'), key=lambda p: p.stat().st_mtime, reverse=True)
+    frames = [frame for frame in (cv2.imread(str(p)) for p in paths[:limit]) if frame is not None]
+    if frames:
+        return frames
+
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8) for _ in range(min(limit, 4))]
+
+
+def time_predict(model, frames: List, runs: int = 3) -> float:
+    """Mean predict latency per frame in milliseconds (after one warm-up pass)"""
+    for frame in frames[:1]:
+        model.predict(frame, verbose=False)
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        for frame in frames:
+            model.predict(frame, verbose=False)
+    return (time.perf_counter() - start) / (runs * len(frames)) * 1000
+
+
+def compare_runtimes(model_path: str, runtime: str, frames: List, runs: int = 3) -> Dict[str, float]:
+    """
+    Latency of a runtime against the PyTorch baseline on the same frames
+
+    Returns:
+        {'torch_ms', '<runtime>_ms', 'speedup'} per-frame latencies
+    """
+    baseline_ms = time_predict(load_model(model_path, 'torch'), frames, runs)
+    report = {'torch_ms': round(baseline_ms, 2)}
+
+    if runtime != 'torch':
+        runtime_ms = time_predict(load_model(model_path, runtime), frames, runs)
+        report[f"{runtime}_ms"] = round(runtime_ms, 2)
+        report['speedup'] = round(baseline_ms / runtime_ms, 2)
+
+    return report
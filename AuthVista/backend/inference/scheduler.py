@@ -0,0 +1,130 @@
+"""
+Per-camera frame scheduler for the YOLO Inference Worker
+One slot per camera: a newer frame replaces an unprocessed older one, a
+camera has at most one frame in flight, and frames older than the deadline
+are dropped instead of processed
+"""
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+
+def frame_age_seconds(timestamp: Optional[str], received_at: datetime) -> float:
+    """
+    Age of a frame based on its capture timestamp
+
+    Timestamps without a timezone are taken as UTC (as sent by the worker
+    and web client). Missing or unparsable timestamps fall back to the
+    time the worker received the frame.
+    """
+    now = datetime.now(timezone.utc)
+    captured_at = received_at
+    if timestamp:
+        try:
+            captured_at = datetime.fromisoformat(timestamp)
+            if captured_at.tzinfo is None:
+                captured_at = captured_at.replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            pass
+    return (now - captured_at).total_seconds()
+
+
+class CameraCounters:
+    """Frame counters for one camera"""
+
+    __slots__ = ('received', 'replaced', 'stale', 'dispatched')
+
+    def __init__(self):
+        self.received = 0
+        self.replaced = 0
+        self.stale = 0
+        self.dispatched = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class LatestFrameScheduler:
+    """
+    Latest-frame-wins scheduler
+    - put() never blocks and never grows beyond one frame per camera
+    - get() hands out cameras round-robin in the order they became ready,
+      so a burst from one camera cannot starve the others
+    - A camera whose frame is in flight is not ready again until done() is
+      called for it: its newer frames keep replacing each other in the
+      slot, and per-camera state (tracks, motion background) sees its
+      frames one at a time, in order
+    - Frames whose timestamp is older than deadline_ms are counted as
+      stale and skipped (deadline_ms <= 0 disables the check)
+    """
+
+    def __init__(self, deadline_ms: float = 2000):
+        self.deadline = deadline_ms / 1000
+        self.slots: Dict[Any, Tuple[Any, Optional[str], datetime]] = {}
+        self.ready: Deque[Any] = deque()
+        # Cameras with a frame between get() and done()
+        self.in_flight: Set[Any] = set()
+        self.counters: Dict[Any, CameraCounters] = {}
+        self._available = asyncio.Event()
+
+    def put(self, camera_id: Any, frame: Any, timestamp: Optional[str] = None):
+        """Offer a frame; replaces the camera's pending frame if there is one"""
+        counters = self.counters.setdefault(camera_id, CameraCounters())
+        counters.received += 1
+
+        if camera_id in self.slots:
+            counters.replaced += 1
+        elif camera_id not in self.in_flight:
+            self.ready.append(camera_id)
+
+        self.slots[camera_id] = (frame, timestamp, datetime.now(timezone.utc))
+        self._available.set()
+
+    async def get(self) -> Tuple[Any, Any]:
+        """
+        Wait for the next fresh frame, in round-robin camera order
+
+        Returns:
+            (camera_id, frame); call done(camera_id) once the frame is processed
+        """
+        while True:
+            while not self.ready:
+                self._available.clear()
+                await self._available.wait()
+
+            camera_id = self.ready.popleft()
+            frame, timestamp, received_at = self.slots.pop(camera_id)
+            counters = self.counters[camera_id]
+
+            if self.deadline > 0 and frame_age_seconds(timestamp, received_at) > self.deadline:
+                counters.stale += 1
+                continue
+
+            counters.dispatched += 1
+            self.in_flight.add(camera_id)
+            return camera_id, frame
+
+    def done(self, camera_id: Any):
+        """The camera's frame is processed; its pending frame, if any, becomes ready"""
+        self.in_flight.discard(camera_id)
+        if camera_id in self.slots:
+            self.ready.append(camera_id)
+            self._available.set()
+
+    @property
+    def depth(self) -> int:
+        """Frames waiting to be processed (at most one per camera, besides the one in flight)"""
+        return len(self.slots)
+
+    def totals(self) -> Dict[str, int]:
+        """Counters summed over all cameras"""
+        totals = CameraCounters().as_dict()
+        for counters in list(self.counters.values()):
+            for name, value in counters.as_dict().items():
+                totals[name] += value
+        return totals
+
+    def per_camera(self) -> Dict[Any, Dict[str, int]]:
+        """Counters for each camera seen so far"""
+        return {camera_id: counters.as_dict() for camera_id, counters in list(self.counters.items())}
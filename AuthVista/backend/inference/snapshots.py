@@ -0,0 +1,171 @@
+"""
+Background snapshot writer for the YOLO Inference Worker
+Annotates and encodes detection snapshots on a bounded thread pool
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+from loguru import logger
+
+
+def annotate_frame(frame: np.ndarray, detections: List[Dict]) -> np.ndarray:
+    """Draw detection boxes and labels on a copy of the frame"""
+    annotated_frame = frame.copy()
+
+    for detection in detections:
+        bbox = detection['bbox']
+        class_name = detection['detection_class']
+        confidence = detection['confidence']
+
+        # Extract corners
+        x1, y1 = int(bbox['x1']), int(bbox['y1'])
+        x2, y2 = int(bbox['x2']), int(bbox['y2'])
+
+        # Draw rectangle
+        color = (0, 255, 0)  # Green
+        if class_name == 'person':
+            color = (0, 0, 255)  # Red for human intrusion
+
+        cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, 2)
+
+        # Draw label
+        label = f"{class_name} {confidence:.2%}"
+        label_size, _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
+        cv2.rectangle(
+            annotated_frame,
+            (x1, y1 - label_size[1] - 10),
+            (x1 + label_size[0], y1),
+            color,
+            -1
+        )
+        cv2.putText(
+            annotated_frame,
+            label,
+            (x1, y1 - 5),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.5,
+            (255, 255, 255),
+            2
+        )
+
+    return annotated_frame
+
+
+class SnapshotWriter:
+    """
+    Bounded background pool for snapshot annotation, encoding and disk writes
+    - submit() returns the final snapshot path immediately
+    - Files are written to a temp name and renamed, so a path that exists
+      always holds a complete JPEG
+    - Files are sharded into <date>/cam<id>/ directories, so no directory
+      grows without bound and retention can drop whole days
+    - When max_pending writes are queued, new snapshots are skipped rather
+      than stalling inference
+    """
+
+    def __init__(
+        self,
+        snapshot_dir: Path,
+        workers: int = 2,
+        max_pending: int = 16,
+        jpeg_quality: int = 85,
+        on_written: Optional[Callable[[float], None]] = None
+    ):
+        self.snapshot_dir = Path(snapshot_dir)
+        self.max_pending = max(1, max_pending)
+        self.jpeg_quality = jpeg_quality
+        # Called from the pool thread with the seconds each write took
+        self.on_written = on_written
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, workers),
+            thread_name_prefix='snapshot'
+        )
+
+        self._lock = threading.Lock()
+        self.pending = 0
+        # Shard directories known to exist
+        self._dirs = set()
+
+        # Stats
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def snapshot_path(self, camera_id) -> Path:
+        """Path the next snapshot for this camera will be written to"""
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S_%f")
+        return self.snapshot_dir / now.strftime("%Y-%m-%d") / f"cam{camera_id}" / f"cam{camera_id}_{timestamp}.jpg"
+
+    def submit(self, frame: np.ndarray, detections: List[Dict], camera_id) -> Optional[str]:
+        """
+        Queue a snapshot write (never blocks)
+
+        Args:
+            frame: OpenCV frame (not modified)
+            detections: Detections to draw
+            camera_id: Camera ID
+
+        Returns:
+            Path the snapshot will be written to, or None if it was skipped
+        """
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.skipped += 1
+                return None
+            self.pending += 1
+
+        path = self.snapshot_path(camera_id)
+        try:
+            self.executor.submit(self._write, frame, detections, path)
+        except RuntimeError:
+            # Executor already shut down
+            with self._lock:
+                self.pending -= 1
+            return None
+        return str(path)
+
+    def _write(self, frame: np.ndarray, detections: List[Dict], path: Path):
+        """Annotate, encode and write one snapshot (runs on the pool)"""
+        start = time.perf_counter()
+        try:
+            annotated_frame = annotate_frame(frame, detections)
+            ok, encoded = cv2.imencode(
+                '.jpg', annotated_frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+            )
+            if not ok:
+                raise ValueError("JPEG encoding failed")
+
+            if path.parent not in self._dirs:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._dirs.add(path.parent)
+
+            tmp_path = path.with_name(path.name + '.tmp')
+            tmp_path.write_bytes(encoded.tobytes())
+            os.replace(tmp_path, path)
+
+            with self._lock:
+                self.written += 1
+            if self.on_written is not None:
+                self.on_written(time.perf_counter() - start)
+            logger.debug(f"📸 Snapshot saved: {path}")
+
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            logger.error(f"❌ Error saving snapshot: {e}")
+
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting snapshots; optionally wait for queued writes"""
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,182 @@
+"""
+Direct stream ingestion for the YOLO Inference Worker
+RTSP / IP cameras are pulled by the worker itself instead of being relayed
+frame by frame through the backend
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import cv2
+import numpy as np
+from loguru import logger
+
+
+class StreamReader:
+    """
+    Reader thread for one camera stream
+    - Grabs every frame so the decoder never falls behind the live stream,
+      but only decodes (retrieves) at the camera's fps
+    - Hands each decoded frame to on_frame; the scheduler keeps only the
+      latest per camera, so nothing queues up behind a slow model
+    - Reconnects with exponential backoff when the stream fails or ends
+    """
+
+    def __init__(
+        self,
+        camera_id: Any,
+        url: str,
+        fps: float,
+        on_frame: Callable[[Any, np.ndarray, str], None],
+        max_backoff: float = 30
+    ):
+        self.camera_id = camera_id
+        self.url = url
+        self.fps = max(float(fps or 1), 0.1)
+        self.on_frame = on_frame
+        self.max_backoff = max_backoff
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"stream-{camera_id}", daemon=True)
+
+        # Stats
+        self.connected = False
+        self.frames = 0
+        self.grabbed = 0
+        self.reconnects = 0
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None):
+        self._thread.join(timeout)
+
+    def _open(self) -> Optional[cv2.VideoCapture]:
+        capture = cv2.VideoCapture(self.url, cv2.CAP_FFMPEG)
+        if not capture.isOpened():
+            capture.release()
+            return None
+        # Keep the backend buffer small so retrieved frames are current
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return capture
+
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            capture = self._open()
+            if capture is None:
+                failures += 1
+                delay = min(self.max_backoff, 2 ** (failures - 1))
+                logger.warning(f"📹 Camera {self.camera_id}: cannot open stream, retrying in {delay:.0f}s")
+                self._stop.wait(delay)
+                continue
+
+            if failures:
+                self.reconnects += 1
+            logger.info(f"📹 Camera {self.camera_id}: stream connected ({self.fps:g} fps)")
+            self.connected = True
+            try:
+                if self._read(capture):
+                    failures = 0
+            finally:
+                self.connected = False
+                capture.release()
+
+            if not self._stop.is_set():
+                failures += 1
+                delay = min(self.max_backoff, 2 ** (failures - 1))
+                logger.warning(f"📹 Camera {self.camera_id}: stream lost, reconnecting in {delay:.0f}s")
+                self._stop.wait(delay)
+
+    def _read(self, capture: cv2.VideoCapture) -> bool:
+        """Read until the stream fails or stop(); True if any frame was delivered"""
+        interval = 1.0 / self.fps
+        next_due = time.monotonic()
+        delivered = False
+
+        while not self._stop.is_set():
+            if not capture.grab():
+                return delivered
+            self.grabbed += 1
+
+            now = time.monotonic()
+            if now < next_due:
+                continue
+
+            ok, frame = capture.retrieve()
+            if not ok or frame is None:
+                return delivered
+            next_due = max(next_due + interval, now)
+
+            self.frames += 1
+            delivered = True
+            self.on_frame(self.camera_id, frame, datetime.utcnow().isoformat())
+        return delivered
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'connected': self.connected,
+            'frames': self.frames,
+            'grabbed': self.grabbed,
+            'reconnects': self.reconnects
+        }
+
+
+class StreamManager:
+    """
+    Reader threads for the streams this worker was assigned in camera:config
+    """
+
+    def __init__(
+        self,
+        on_frame: Callable[[Any, np.ndarray, str], None],
+        max_backoff: float = 30,
+        rtsp_transport: str = 'tcp'
+    ):
+        self.on_frame = on_frame
+        self.max_backoff = max_backoff
+        self.readers: Dict[str, StreamReader] = {}
+
+        # FFmpeg reads its capture options from the environment
+        if rtsp_transport:
+            os.environ.setdefault('OPENCV_FFMPEG_CAPTURE_OPTIONS', f"rtsp_transport;{rtsp_transport}")
+
+    def update(self, camera_id: Any, stream: Optional[Dict]) -> Optional[StreamReader]:
+        """
+        Start, restart or stop the camera's reader for a camera:config
+        'stream' entry ({'url': ..., 'fps': ...} or None)
+        """
+        key = str(camera_id)
+        current = self.readers.get(key)
+        if current is not None and stream and (current.url, current.fps) == (stream['url'], float(stream.get('fps') or 1)):
+            return current
+
+        if current is not None:
+            current.stop()
+            del self.readers[key]
+            logger.info(f"📹 Camera {camera_id}: stopped pulling stream")
+
+        if not stream or not stream.get('url'):
+            return None
+
+        reader = StreamReader(camera_id, stream['url'], stream.get('fps') or 1,
+                              self.on_frame, max_backoff=self.max_backoff)
+        self.readers[key] = reader
+        reader.start()
+        return reader
+
+    def stop_all(self, wait: bool = True):
+        for reader in self.readers.values():
+            reader.stop()
+        if wait:
+            for reader in self.readers.values():
+                reader.join(timeout=2)
+        self.readers.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {camera_id: reader.stats() for camera_id, reader in list(self.readers.items())}
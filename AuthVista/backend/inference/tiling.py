@@ -0,0 +1,137 @@
+"""
+Tiled inference for high-resolution cameras
+Splits a frame into overlapping tiles (plus, optionally, the whole frame)
+that run as one batch, then merges the results with cross-tile NMS
+"""
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from parsing import offset_detection
+
+
+def tile_origins(length: int, tiles: int, overlap: float) -> Tuple[int, List[int]]:
+    """
+    Equal-size tiles covering [0, length) with at least the given overlap
+
+    Returns:
+        (tile size, start offset of each tile)
+    """
+    if tiles <= 1:
+        return length, [0]
+    size = min(length, math.ceil(length / (tiles - (tiles - 1) * overlap)))
+    step = (length - size) / (tiles - 1)
+    return size, [int(round(i * step)) for i in range(tiles)]
+
+
+def merge_detections(detections: List[Dict], threshold: float) -> List[Dict]:
+    """
+    Class-wise greedy NMS over detections from all tiles
+
+    Overlap is intersection over the smaller box, so the partial box of an
+    object cut by a tile edge is suppressed by the complete one.
+    """
+    if len(detections) < 2:
+        return detections
+
+    boxes = np.array([[d['bbox']['x1'], d['bbox']['y1'], d['bbox']['x2'], d['bbox']['y2']]
+                      for d in detections])
+    scores = np.array([d['confidence'] for d in detections])
+    classes = np.array([d['detection_class'] for d in detections], dtype=object)
+    areas = np.clip(boxes[:, 2] - boxes[:, 0], 0, None) * np.clip(boxes[:, 3] - boxes[:, 1], 0, None)
+
+    keep = []
+    order = np.argsort(-scores)
+    while len(order):
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        x1 = np.maximum(boxes[best, 0], boxes[rest, 0])
+        y1 = np.maximum(boxes[best, 1], boxes[rest, 1])
+        x2 = np.minimum(boxes[best, 2], boxes[rest, 2])
+        y2 = np.minimum(boxes[best, 3], boxes[rest, 3])
+        inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+        smaller = np.maximum(np.minimum(areas[best], areas[rest]), 1e-9)
+        suppressed = (inter / smaller >= threshold) & (classes[rest] == classes[best])
+        order = rest[~suppressed]
+
+    return [detections[i] for i in sorted(keep)]
+
+
+class TileLayout:
+    """
+    Tiling of one camera
+    - rows x cols tiles of equal size, overlapping by at least `overlap`
+      (fraction of the tile size) so objects on a seam are whole in one tile
+    - full_frame adds the downscaled whole frame to the batch, for objects
+      larger than a tile
+    """
+
+    def __init__(self, rows: int = 2, cols: int = 2, overlap: float = 0.2,
+                 full_frame: bool = True, nms_threshold: float = 0.6):
+        self.rows = max(1, int(rows))
+        self.cols = max(1, int(cols))
+        self.overlap = min(max(float(overlap), 0.0), 0.9)
+        self.full_frame = bool(full_frame)
+        self.nms_threshold = nms_threshold
+
+    @property
+    def name(self) -> str:
+        """Layout label used in stats, e.g. '2x2+full'"""
+        return f"{self.rows}x{self.cols}{'+full' if self.full_frame else ''}"
+
+    def applies(self, frame_shape: Tuple[int, ...], imgsz: int) -> bool:
+        """Tiling only pays off when the frame is larger than the model input"""
+        return max(frame_shape[:2]) > imgsz
+
+    def split(self, frame: np.ndarray) -> Tuple[List[np.ndarray], List[Tuple[int, int]]]:
+        """
+        Tiles (views, no copies) and their (x, y) offsets in the frame; the
+        whole frame comes last when full_frame is set
+        """
+        height, width = frame.shape[:2]
+        tile_h, ys = tile_origins(height, self.rows, self.overlap)
+        tile_w, xs = tile_origins(width, self.cols, self.overlap)
+
+        tiles, origins = [], []
+        for y in ys:
+            for x in xs:
+                tiles.append(frame[y:y + tile_h, x:x + tile_w])
+                origins.append((x, y))
+
+        if self.full_frame:
+            tiles.append(frame)
+            origins.append((0, 0))
+        return tiles, origins
+
+    def merge(self, results: List[List[Dict]], origins: List[Tuple[int, int]]) -> List[Dict]:
+        """Move tile detections to frame coordinates and remove cross-tile duplicates"""
+        detections = [
+            offset_detection(detection, dx, dy)
+            for tile_detections, (dx, dy) in zip(results, origins)
+            for detection in tile_detections
+        ]
+        return merge_detections(detections, self.nms_threshold)
+
+
+class TilingStats:
+    """Latency of tiled inference per tile layout"""
+
+    def __init__(self):
+        self.layouts: Dict[str, Dict[str, float]] = {}
+
+    def record(self, layout: str, tiles: int, seconds: float):
+        stats = self.layouts.setdefault(layout, {'frames': 0, 'tiles': tiles, 'seconds': 0.0})
+        stats['frames'] += 1
+        stats['seconds'] += seconds
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Per layout: frames, tiles per frame and average inference latency per frame"""
+        return {
+            layout: {
+                'frames': stats['frames'],
+                'tiles': stats['tiles'],
+                'avg_latency_ms': round(stats['seconds'] / stats['frames'] * 1000, 1)
+            }
+            for layout, stats in self.layouts.items()
+        }
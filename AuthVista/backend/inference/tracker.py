@@ -0,0 +1,245 @@
+"""
+Multi-object tracking for the YOLO Inference Worker
+Associates detections across frames per camera (Kalman prediction + IoU
+matching) so the backend stores track events instead of every detection
+"""
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+TRACK_START = 'start'
+TRACK_UPDATE = 'update'
+TRACK_END = 'end'
+
+
+def _to_cxcywh(bbox: Dict) -> np.ndarray:
+    return np.array([bbox['x'], bbox['y'], bbox['width'], bbox['height']], dtype=np.float64)
+
+
+def _to_xyxy(state: np.ndarray) -> np.ndarray:
+    cx, cy, w, h = state[:4]
+    return np.array([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2])
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of (N, 4) and (M, 4) corner boxes"""
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+class KalmanBoxFilter:
+    """
+    Constant-velocity Kalman filter over a box (cx, cy, w, h)
+    Noise scales with box height, and time steps are in seconds since
+    frames arrive at uneven rates (motion gate, dropped frames)
+    """
+
+    def __init__(self, bbox: Dict):
+        self.x = np.zeros(8)
+        self.x[:4] = _to_cxcywh(bbox)
+        h = max(self.x[3], 1.0)
+        self.P = np.diag(np.square([0.1 * h] * 4 + [h] * 4))
+        self.H = np.hstack([np.eye(4), np.zeros((4, 4))])
+
+    def predict(self, dt: float) -> np.ndarray:
+        """Advance the state by dt seconds; returns the predicted corner box"""
+        F = np.eye(8)
+        F[:4, 4:] = np.eye(4) * dt
+        h = max(self.x[3], 1.0)
+        Q = np.diag(np.square([0.05 * h] * 4 + [0.2 * h] * 4)) * max(dt, 1e-3)
+        self.x = F @ self.x
+        self.P = F @ self.P @ F.T + Q
+        return _to_xyxy(self.x)
+
+    def update(self, bbox: Dict):
+        """Correct the state with a measured box"""
+        h = max(bbox['height'], 1.0)
+        R = np.diag(np.square([0.05 * h] * 4))
+        residual = _to_cxcywh(bbox) - self.H @ self.x
+        S = self.H @ self.P @ self.H.T + R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ residual
+        self.P = (np.eye(8) - K @ self.H) @ self.P
+
+
+class Track:
+    """One object followed across frames of a camera"""
+
+    def __init__(self, detection: Dict, now: float):
+        self.track_id = uuid.uuid4().hex[:12]
+        self.detection_class = detection['detection_class']
+        self.filter = KalmanBoxFilter(detection['bbox'])
+        self.detection = detection
+        self.best_confidence = detection['confidence']
+        self.first_seen = now
+        self.last_seen = now
+        self.last_predict = now
+        self.last_reported = None
+        self.hits = 1
+        self.confirmed = False
+
+    def predict(self, now: float) -> np.ndarray:
+        box = self.filter.predict(now - self.last_predict)
+        self.last_predict = now
+        return box
+
+    def update(self, detection: Dict, now: float):
+        self.filter.update(detection['bbox'])
+        self.detection = detection
+        self.best_confidence = max(self.best_confidence, detection['confidence'])
+        self.last_seen = now
+        self.hits += 1
+
+    @property
+    def dwell_seconds(self) -> float:
+        return self.last_seen - self.first_seen
+
+    def event(self, kind: str) -> Dict:
+        """Detection dict for a track event (latest box, best confidence so far)"""
+        return {
+            **self.detection,
+            'confidence': self.best_confidence,
+            'track_id': self.track_id,
+            'track_event': kind,
+            'first_seen_at': datetime.fromtimestamp(self.first_seen, timezone.utc).isoformat(),
+            'last_seen_at': datetime.fromtimestamp(self.last_seen, timezone.utc).isoformat(),
+            'dwell_seconds': round(self.dwell_seconds, 2),
+            'frame_count': self.hits
+        }
+
+
+class CameraTracker:
+    """
+    Tracks for one camera
+    - Detections are matched to predicted track boxes of the same class by
+      IoU, greedily from the best overlap down
+    - A track is confirmed (start event) after min_hits matched frames, or
+      its class's entry in class_min_hits (e.g. 1 for people and vehicles,
+      so an intruder seen in a single processed frame is still reported)
+    - A confirmed track reports an update every update_interval seconds
+    - A track ends when it has not been matched for max_age seconds
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, min_hits: int = 2,
+                 max_age: float = 3, update_interval: float = 30,
+                 class_min_hits: Optional[Dict[str, int]] = None):
+        self.iou_threshold = iou_threshold
+        self.min_hits = min_hits
+        self.class_min_hits = class_min_hits or {}
+        self.max_age = max_age
+        self.update_interval = update_interval
+        self.tracks: List[Track] = []
+
+    def update(self, detections: List[Dict], now: float) -> Tuple[List[Optional[str]], List[Dict]]:
+        """
+        Feed one frame's detections
+
+        Returns:
+            (track ID per detection, None while a track is unconfirmed,
+             track events to persist)
+        """
+        predicted = np.array([track.predict(now) for track in self.tracks]).reshape(-1, 4)
+        measured = np.array([[d['bbox']['x1'], d['bbox']['y1'], d['bbox']['x2'], d['bbox']['y2']]
+                             for d in detections]).reshape(-1, 4)
+
+        assigned: List[Optional[Track]] = [None] * len(detections)
+        if len(self.tracks) and len(detections):
+            overlap = iou_matrix(predicted, measured)
+            for t, track in enumerate(self.tracks):
+                for d, detection in enumerate(detections):
+                    if detection['detection_class'] != track.detection_class:
+                        overlap[t, d] = 0.0
+
+            # Greedy assignment, best overlap first
+            for flat in np.argsort(overlap, axis=None)[::-1]:
+                t, d = np.unravel_index(flat, overlap.shape)
+                if overlap[t, d] < self.iou_threshold:
+                    break
+                track = self.tracks[t]
+                if assigned[d] is not None or track.last_seen == now:
+                    continue
+                track.update(detections[d], now)
+                assigned[d] = track
+
+        events = []
+        for d, detection in enumerate(detections):
+            if assigned[d] is None:
+                assigned[d] = Track(detection, now)
+                self.tracks.append(assigned[d])
+
+        for track in assigned:
+            min_hits = self.class_min_hits.get(track.detection_class, self.min_hits)
+            if not track.confirmed and track.hits >= min_hits:
+                track.confirmed = True
+                track.last_reported = now
+                events.append(track.event(TRACK_START))
+            elif track.confirmed and now - track.last_reported >= self.update_interval:
+                track.last_reported = now
+                events.append(track.event(TRACK_UPDATE))
+
+        events.extend(self.expire(now))
+        track_ids = [track.track_id if track.confirmed else None for track in assigned]
+        return track_ids, events
+
+    def expire(self, now: float) -> List[Dict]:
+        """End tracks not seen for max_age seconds; unconfirmed ones end silently"""
+        events, alive = [], []
+        for track in self.tracks:
+            if now - track.last_seen < self.max_age:
+                alive.append(track)
+            elif track.confirmed:
+                events.append(track.event(TRACK_END))
+        self.tracks = alive
+        return events
+
+
+class MultiCameraTracker:
+    """One CameraTracker per camera, with event counters"""
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self.cameras: Dict[Any, CameraTracker] = {}
+
+        # Stats
+        self.detections = 0
+        self.events = {TRACK_START: 0, TRACK_UPDATE: 0, TRACK_END: 0}
+
+    def update(self, camera_id: Any, detections: List[Dict],
+               now: Optional[float] = None) -> Tuple[List[Optional[str]], List[Dict]]:
+        """Track one frame of a camera; see CameraTracker.update()"""
+        tracker = self.cameras.get(camera_id)
+        if tracker is None:
+            tracker = self.cameras[camera_id] = CameraTracker(**self.settings)
+        track_ids, events = tracker.update(detections, time.time() if now is None else now)
+        self._count(len(detections), events)
+        return track_ids, events
+
+    def expire(self, now: Optional[float] = None) -> List[Dict]:
+        """End stale tracks of all cameras, e.g. cameras that stopped sending frames"""
+        now = time.time() if now is None else now
+        events = []
+        for camera_id, tracker in self.cameras.items():
+            for event in tracker.expire(now):
+                event['camera_id'] = event.get('camera_id', camera_id)
+                events.append(event)
+        self._count(0, events)
+        return events
+
+    def _count(self, detections: int, events: List[Dict]):
+        self.detections += detections
+        for event in events:
+            self.events[event['track_event']] += 1
+
+    @property
+    def active_tracks(self) -> int:
+        return sum(len(tracker.tracks) for tracker in self.cameras.values())
@@ -3,51 +3,165 @@ YOLO Inference Worker for Tadoba Wildlife Surveillance
 Processes video frames and detects wildlife using YOLOv8
 """
 import os
+import time
+
+# Reference point for the startup timing log (taken before the heavier imports)
+STARTUP_CLOCK = time.perf_counter()
+
 import asyncio
-import base64
+import gc
 import json
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import partial
+from typing import Dict, List, Optional, Set
 
-import cv2
 import numpy as np
-import requests
-from ultralytics import YOLO
 from loguru import logger
 import socketio
 from dotenv import load_dotenv
 
+from batching import FrameBatcher
+from camera_config import CameraConfigStore, DetectionSettings
+from classes import WILDLIFE_CLASSES, confidence_threshold
+from cascade import DetectionCascade, predict_crops
+from decoding import FrameDecoder
+from dedup import FrameCache
+from executors import (
+    create_cascade_executor,
+    create_cpu_executor,
+    create_inference_executor,
+    inference_process_ready,
+    predict_batch,
+    predict_batch_in_process,
+)
+from frame_protocol import frame_bytes
+from metrics import WorkerMetrics
+from motion import MotionGate
+from outbox import DetectionOutbox
+from parsing import scale_detection
+from resolution import AdaptiveResolution
+from retention import SnapshotRetention
+from runtime import compare_runtimes, ensure_exported, load_model, load_sample_frames, model_version, warm_up
+from scheduler import LatestFrameScheduler
+from snapshots import SnapshotWriter
+from streams import StreamManager
+from tiling import TilingStats
+from tracker import TRACK_END, MultiCameraTracker
+
+IMPORT_SECONDS = time.perf_counter() - STARTUP_CLOCK
+
 # Load environment variables
 load_dotenv()
 
 # Configuration
 BACKEND_URL = os.getenv('BACKEND_URL', 'http://localhost:8000')
 MODEL_PATH = os.getenv('MODEL_PATH', './models/yolov8n.pt')
-CONFIDENCE_THRESHOLD = float(os.getenv('CONFIDENCE_THRESHOLD', '0.5'))
+CONFIDENCE_THRESHOLD = confidence_threshold()
+
+# Inference runtime: torch, onnx or openvino (exported next to MODEL_PATH on first start)
+INFERENCE_RUNTIME = os.getenv('INFERENCE_RUNTIME', 'torch')
+# Log latency of INFERENCE_RUNTIME vs. the PyTorch baseline at startup
+RUNTIME_BENCHMARK = os.getenv('RUNTIME_BENCHMARK', 'false').lower() == 'true'
+# Swap in MODEL_PATH without a restart when the file is replaced, checked
+# every MODEL_WATCH_INTERVAL seconds (0 disables; model:swap events still work)
+MODEL_WATCH_INTERVAL = float(os.getenv('MODEL_WATCH_INTERVAL', '30'))
 SNAPSHOT_DIR = Path(os.getenv('SNAPSHOT_DIR', './snapshots'))
+SNAPSHOT_WRITERS = int(os.getenv('SNAPSHOT_WRITERS', '2'))
+SNAPSHOT_MAX_PENDING = int(os.getenv('SNAPSHOT_MAX_PENDING', '16'))
+SNAPSHOT_JPEG_QUALITY = int(os.getenv('SNAPSHOT_JPEG_QUALITY', '85'))
+# Snapshot retention: quota in GB and max age in days (0 = unlimited), checked
+# every SNAPSHOT_RETENTION_INTERVAL seconds; snapshots of open incidents are kept
+SNAPSHOT_MAX_GB = float(os.getenv('SNAPSHOT_MAX_GB', '0'))
+SNAPSHOT_MAX_AGE_DAYS = float(os.getenv('SNAPSHOT_MAX_AGE_DAYS', '0'))
+SNAPSHOT_RETENTION_INTERVAL = float(os.getenv('SNAPSHOT_RETENTION_INTERVAL', '300'))
+
+# Micro-batching: frames from all cameras share one predict call
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '8'))
+MAX_BATCH_WAIT_MS = float(os.getenv('MAX_BATCH_WAIT_MS', '20'))
+
+# Executors: keep decode/inference/encode off the Socket.IO event loop
+INFERENCE_EXECUTOR = os.getenv('INFERENCE_EXECUTOR', 'thread')  # thread | process
+INFERENCE_PROCESSES = int(os.getenv('INFERENCE_PROCESSES', '1'))
+# Process executor: pin each child to its own cores, torch threads per child (0 = one per core)
+INFERENCE_PIN_CORES = os.getenv('INFERENCE_PIN_CORES', 'true').lower() == 'true'
+INFERENCE_THREADS = int(os.getenv('INFERENCE_THREADS', '0'))
+CPU_WORKERS = int(os.getenv('CPU_WORKERS', '2'))
+MAX_IN_FLIGHT = int(os.getenv('MAX_IN_FLIGHT', '32'))
+
+# Decode JPEGs at 1/2, 1/4 or 1/8 scale when the source is that much larger
+# than the model input, and resize the rest of the way into reused buffers
+REDUCED_DECODE_ENABLED = os.getenv('REDUCED_DECODE_ENABLED', 'true').lower() == 'true'
+
+# Model input size for cameras without their own imgsz: pixels or 'adaptive'
+DEFAULT_IMGSZ = os.getenv('DEFAULT_IMGSZ', '640')
+# Adaptive imgsz: sizes to step through and the frame latency to stay under
+ADAPTIVE_IMGSZ_SIZES = [int(size) for size in os.getenv('ADAPTIVE_IMGSZ_SIZES', '320,416,512,640').split(',')]
+ADAPTIVE_TARGET_MS = float(os.getenv('ADAPTIVE_TARGET_MS', '500'))
+ADAPTIVE_COOLDOWN = float(os.getenv('ADAPTIVE_COOLDOWN', '5'))
+
+# Tracking: persist track start / periodic update / end instead of every detection
+TRACKING_ENABLED = os.getenv('TRACKING_ENABLED', 'true').lower() == 'true'
+TRACK_IOU_THRESHOLD = float(os.getenv('TRACK_IOU_THRESHOLD', '0.3'))
+TRACK_MIN_HITS = int(os.getenv('TRACK_MIN_HITS', '2'))
+# Per class overrides of TRACK_MIN_HITS (JSON): alert classes start a track on their first frame
+TRACK_CLASS_MIN_HITS = json.loads(os.getenv(
+    'TRACK_CLASS_MIN_HITS', '{"person": 1, "bicycle": 1, "car": 1, "motorcycle": 1}'
+))
+TRACK_MAX_AGE_SECONDS = float(os.getenv('TRACK_MAX_AGE_SECONDS', '3'))
+TRACK_UPDATE_SECONDS = float(os.getenv('TRACK_UPDATE_SECONDS', '30'))
+
+# Scheduling: one pending frame per camera, frames older than this are dropped
+FRAME_DEADLINE_MS = float(os.getenv('FRAME_DEADLINE_MS', '2000'))
+
+# Duplicate frames: reuse the last result for frames identical to the last
+# inferred one, for up to DEDUP_MAX_AGE seconds after it was inferred; cameras
+# resending the identical image for FROZEN_SECONDS are flagged
+DEDUP_ENABLED = os.getenv('DEDUP_ENABLED', 'true').lower() == 'true'
+DEDUP_MAX_AGE = float(os.getenv('DEDUP_MAX_AGE', '2'))
+FROZEN_SECONDS = float(os.getenv('FROZEN_SECONDS', '30'))
+
+# Motion gate: skip inference on static frames
+MOTION_GATE_ENABLED = os.getenv('MOTION_GATE_ENABLED', 'true').lower() == 'true'
+MOTION_SENSITIVITY = float(os.getenv('MOTION_SENSITIVITY', '0.01'))
+MOTION_PIXEL_THRESHOLD = int(os.getenv('MOTION_PIXEL_THRESHOLD', '25'))
+MOTION_FORCE_INTERVAL = float(os.getenv('MOTION_FORCE_INTERVAL', '10'))
+# Per camera overrides, e.g. {"3": {"sensitivity": 0.05, "force_interval": 30}}
+MOTION_CAMERA_SETTINGS = json.loads(os.getenv('MOTION_CAMERA_SETTINGS', '{}'))
+
+# Direct stream pull: RTSP / IP cameras assigned to this worker are read here
+# instead of being relayed through the backend
+STREAM_PULL_ENABLED = os.getenv('STREAM_PULL_ENABLED', 'true').lower() == 'true'
+STREAM_MAX_BACKOFF = float(os.getenv('STREAM_MAX_BACKOFF', '30'))
+STREAM_RTSP_TRANSPORT = os.getenv('STREAM_RTSP_TRANSPORT', 'tcp')
+
+# Cascade: a heavier second-stage model (classifier or detector) re-checks crops
+# of CASCADE_CLASSES detections, batched across cameras; no model disables it.
+# Cameras opt in with 'cascade' in their inference settings, else CASCADE_DEFAULT
+CASCADE_MODEL_PATH = os.getenv('CASCADE_MODEL_PATH', '')
+CASCADE_CLASSES = [name.strip() for name in
+                   os.getenv('CASCADE_CLASSES', 'person,bicycle,car,motorcycle').split(',') if name.strip()]
+CASCADE_CONFIDENCE = float(os.getenv('CASCADE_CONFIDENCE', '0.5'))
+CASCADE_IMGSZ = int(os.getenv('CASCADE_IMGSZ', '320'))
+CASCADE_PADDING = float(os.getenv('CASCADE_PADDING', '0.15'))
+CASCADE_MAX_BATCH_SIZE = int(os.getenv('CASCADE_MAX_BATCH_SIZE', '16'))
+CASCADE_MAX_WAIT_MS = float(os.getenv('CASCADE_MAX_WAIT_MS', '10'))
+CASCADE_DEFAULT = os.getenv('CASCADE_DEFAULT', 'false').lower() == 'true'
+
+# Prometheus metrics endpoint (http://<worker>:METRICS_PORT/metrics), 0 disables
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+
+# Detection outbox: batched posts, spooled to disk while the backend is down
+BACKEND_API_TOKEN = os.getenv('BACKEND_API_TOKEN')
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '50'))
+OUTBOX_FLUSH_MS = float(os.getenv('OUTBOX_FLUSH_MS', '500'))
+OUTBOX_RETRY_SECONDS = float(os.getenv('OUTBOX_RETRY_SECONDS', '5'))
+OUTBOX_SPOOL_PATH = Path(os.getenv('OUTBOX_SPOOL_PATH', './spool/detections.jsonl'))
 
 # Ensure snapshot directory exists
 SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
 
-# Wildlife classes we care about (COCO dataset)
-WILDLIFE_CLASSES = {
-    0: 'person',      # Human intrusion detection
-    1: 'bicycle',
-    2: 'car',
-    3: 'motorcycle',
-    14: 'bird',
-    15: 'cat',
-    16: 'dog',
-    17: 'horse',
-    18: 'sheep',
-    19: 'cow',
-    20: 'elephant',
-    21: 'bear',
-    22: 'zebra',
-    23: 'giraffe',
-}
-
 
 class YOLOInferenceWorker:
     """
@@ -61,10 +175,66 @@ class YOLOInferenceWorker:
     def __init__(self):
         logger.info("🦁 Initializing YOLO Inference Worker...")
         
-        # Load YOLO model
-        logger.info(f"📦 Loading YOLO model from: {MODEL_PATH}")
-        self.model = YOLO(MODEL_PATH)
-        logger.success(f"✅ YOLO model loaded successfully")
+        # YOLO model is loaded and warmed in start(), after connecting
+        # (process executor loads one copy per child instead)
+        self.model = None
+        self.ready = False
+        
+        # Active model; swap_model() replaces it between batches
+        self.model_path = MODEL_PATH
+        self.model_version = model_version(MODEL_PATH)
+        self.model_swaps = 0
+        # Process pools replaced after a child crashed
+        self.inference_restarts = 0
+        self.swap_lock = asyncio.Lock()
+        self.startup_timings = {'imports': IMPORT_SECONDS}
+        
+        # Background loops and one-off jobs, kept referenced until done
+        self.tasks: Set[asyncio.Task] = set()
+        
+        # Executors for blocking work
+        self.inference_executor = create_inference_executor(
+            INFERENCE_EXECUTOR, INFERENCE_PROCESSES, MODEL_PATH, INFERENCE_RUNTIME,
+            warm_up_batch=MAX_BATCH_SIZE,
+            pin_cores=INFERENCE_PIN_CORES,
+            threads=INFERENCE_THREADS
+        )
+        self.cpu_executor = create_cpu_executor(CPU_WORKERS)
+        
+        # JPEG decode at the scale the model needs, into per-camera buffers
+        self.decoder = FrameDecoder(enabled=REDUCED_DECODE_ENABLED)
+        
+        # Stage latency histograms (served on METRICS_PORT)
+        self.metrics = WorkerMetrics()
+        
+        # Snapshots are annotated and written in the background
+        self.snapshots = SnapshotWriter(
+            SNAPSHOT_DIR,
+            workers=SNAPSHOT_WRITERS,
+            max_pending=SNAPSHOT_MAX_PENDING,
+            jpeg_quality=SNAPSHOT_JPEG_QUALITY,
+            on_written=partial(self.metrics.observe, 'snapshot')
+        )
+        
+        # Quota and age limits on SNAPSHOT_DIR; protected paths come from the backend
+        self.retention = SnapshotRetention(
+            SNAPSHOT_DIR,
+            max_bytes=int(SNAPSHOT_MAX_GB * 1e9),
+            max_age_days=SNAPSHOT_MAX_AGE_DAYS
+        )
+        self.protected_snapshots: Optional[set] = None
+        
+        # Batched, spool-backed delivery of detections to the backend
+        self.outbox = DetectionOutbox(
+            BACKEND_URL,
+            OUTBOX_SPOOL_PATH,
+            batch_size=OUTBOX_BATCH_SIZE,
+            flush_interval_ms=OUTBOX_FLUSH_MS,
+            retry_seconds=OUTBOX_RETRY_SECONDS,
+            api_token=BACKEND_API_TOKEN,
+            on_saved=self.on_detections_saved,
+            on_post=self.metrics.observe_post
+        )
         
         # Initialize Socket.IO client
         self.sio = socketio.AsyncClient(
@@ -76,157 +246,471 @@ class YOLOInferenceWorker:
         self.sio.on('connect', self.on_connect)
         self.sio.on('disconnect', self.on_disconnect)
         self.sio.on('frame:ingest', self.process_frame)
+        self.sio.on('camera:config', self.on_camera_config)
+        self.sio.on('model:swap', self.on_model_swap)
+        
+        # Per-camera settings pushed by the backend (ROI, imgsz)
+        self.camera_config = CameraConfigStore(WILDLIFE_CLASSES, CONFIDENCE_THRESHOLD)
+        
+        # Reader threads for streams this worker pulls itself
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.streams = StreamManager(
+            self.on_stream_frame,
+            max_backoff=STREAM_MAX_BACKOFF,
+            rtsp_transport=STREAM_RTSP_TRANSPORT
+        )
+        
+        # Latency of tiled inference per tile layout
+        self.tiling_stats = TilingStats()
+        
+        # Input size for cameras in adaptive mode, driven by frame latency
+        self.resolution = AdaptiveResolution(
+            sizes=ADAPTIVE_IMGSZ_SIZES,
+            target_ms=ADAPTIVE_TARGET_MS,
+            cooldown=ADAPTIVE_COOLDOWN
+        )
+        
+        # One latest-frame slot per camera in front of the pipeline
+        self.scheduler = LatestFrameScheduler(deadline_ms=FRAME_DEADLINE_MS)
+        
+        # Result reuse for repeated frames and frozen camera detection
+        self.frame_cache = None
+        if DEDUP_ENABLED:
+            self.frame_cache = FrameCache(
+                max_age=DEDUP_MAX_AGE,
+                frozen_seconds=FROZEN_SECONDS
+            )
+        
+        # Cheap per-camera motion check before the model
+        self.motion = None
+        if MOTION_GATE_ENABLED:
+            self.motion = MotionGate(
+                sensitivity=MOTION_SENSITIVITY,
+                pixel_threshold=MOTION_PIXEL_THRESHOLD,
+                force_interval=MOTION_FORCE_INTERVAL,
+                camera_settings=MOTION_CAMERA_SETTINGS
+            )
+        
+        # Per-camera object tracks, so only track events reach the backend
+        self.tracker = None
+        if TRACKING_ENABLED:
+            self.tracker = MultiCameraTracker(
+                iou_threshold=TRACK_IOU_THRESHOLD,
+                min_hits=TRACK_MIN_HITS,
+                class_min_hits=TRACK_CLASS_MIN_HITS,
+                max_age=TRACK_MAX_AGE_SECONDS,
+                update_interval=TRACK_UPDATE_SECONDS
+            )
+        
+        # Cross-camera batching stage in front of the model
+        self.batcher = FrameBatcher(
+            lambda frames, group: self.infer_batch(frames, *group),
+            max_batch_size=MAX_BATCH_SIZE,
+            max_wait_ms=MAX_BATCH_WAIT_MS,
+            # One batch per child process in flight, so every child stays busy
+            max_concurrent_batches=INFERENCE_PROCESSES if INFERENCE_EXECUTOR == 'process' else 1
+        )
+        
+        # Second stage for expensive classes, with its own model thread and crop batches
+        self.cascade = None
+        self.cascade_model = None
+        if CASCADE_MODEL_PATH:
+            self.cascade = DetectionCascade(CASCADE_CLASSES, padding=CASCADE_PADDING)
+            self.cascade_executor = create_cascade_executor()
+            self.cascade_batcher = FrameBatcher(
+                self.verify_crops,
+                max_batch_size=CASCADE_MAX_BATCH_SIZE,
+                max_wait_ms=CASCADE_MAX_WAIT_MS
+            )
         
         # Stats
         self.frames_processed = 0
         self.detections_made = 0
         
+        # Frames currently between scheduler and frame:processed
+        self.in_flight = 0
+        
+        logger.info(f"📦 Model version: {self.model_version}")
         logger.info(f"🎯 Confidence threshold: {CONFIDENCE_THRESHOLD}")
+        logger.info(f"📦 Batching: up to {MAX_BATCH_SIZE} frames, "
+                    f"{MAX_BATCH_WAIT_MS:.0f}ms max wait")
+        logger.info(f"⚙️ Executor: {INFERENCE_EXECUTOR}, "
+                    f"max {MAX_IN_FLIGHT} frames in flight")
+        if INFERENCE_EXECUTOR == 'process':
+            logger.info(f"⚙️ Inference processes: {INFERENCE_PROCESSES}, "
+                        f"core pinning {'on' if INFERENCE_PIN_CORES else 'off'}, "
+                        f"{INFERENCE_THREADS or 'auto'} threads each")
+        logger.info(f"⏳ Frame deadline: {FRAME_DEADLINE_MS:.0f}ms")
+        if self.cascade is not None:
+            logger.info(f"🔍 Cascade: {CASCADE_MODEL_PATH} re-checks {', '.join(CASCADE_CLASSES)} "
+                        f"(cameras {'opt out' if CASCADE_DEFAULT else 'opt in'})")
         logger.info(f"📡 Backend URL: {BACKEND_URL}")
     
+    def registration(self) -> Dict:
+        """
+        worker:ready payload
+        
+        Capacity stays 0 while the model is warming up, so the backend can
+        tell a registered worker from one that is able to keep up.
+        """
+        return {
+            'worker_type': 'yolo_inference',
+            'model': Path(self.model_path).stem,
+            'model_version': self.model_version,
+            'runtime': INFERENCE_RUNTIME,
+            'confidence_threshold': CONFIDENCE_THRESHOLD,
+            'status': 'ready' if self.ready else 'warming',
+            'capacity': MAX_IN_FLIGHT if self.ready else 0,
+            'max_batch_size': MAX_BATCH_SIZE,
+            'stream_pull': STREAM_PULL_ENABLED,
+            'cascade_classes': CASCADE_CLASSES if self.cascade is not None else []
+        }
+    
     async def on_connect(self):
         """Handle Socket.IO connection"""
         logger.success(f"✅ Connected to backend at {BACKEND_URL}")
-        await self.sio.emit('worker:ready', {
-            'worker_type': 'yolo_inference',
-            'model': 'yolov8n',
-            'confidence_threshold': CONFIDENCE_THRESHOLD
-        })
+        await self.sio.emit('worker:ready', self.registration())
     
     async def on_disconnect(self):
         """Handle Socket.IO disconnection"""
         logger.warning("⚠️ Disconnected from backend")
+        # The backend hands our streams to other workers; it sends them
+        # back in camera:config after we reconnect
+        self.streams.stop_all(wait=False)
+    
+    async def on_camera_config(self, data: Dict):
+        """Apply per-camera settings sent by the backend"""
+        camera_id = data.get('camera_id')
+        roi = self.camera_config.update(data)
+        if self.motion is not None:
+            self.motion.configure(camera_id, data.get('motion'))
+        # Results inferred under the old settings are not reused
+        if self.frame_cache is not None:
+            self.frame_cache.invalidate(camera_id)
+        imgsz = data.get('imgsz') or f"default ({DEFAULT_IMGSZ})"
+        tiling = self.camera_config.tiling(camera_id)
+        layout = f", tiles {tiling.name}" if tiling is not None else ""
+        if roi is None:
+            logger.info(f"🔲 Camera {camera_id}: full frame, imgsz {imgsz}{layout}")
+        else:
+            logger.info(f"🔲 Camera {camera_id}: ROI with {len(roi.polygons)} polygon(s), "
+                        f"imgsz {imgsz}{layout}")
+        settings = self.camera_config.detection_settings(camera_id)
+        if settings != self.camera_config.default_detection:
+            classes = ', '.join(WILDLIFE_CLASSES[cls_id] for cls_id in settings.classes) or 'none'
+            logger.info(f"🎯 Camera {camera_id}: confidence {settings.conf}, "
+                        f"NMS IoU {settings.iou or 'default'}, classes {classes}")
+        
+        # Pull the stream here when the backend assigned it to this worker
+        if STREAM_PULL_ENABLED:
+            self.streams.update(camera_id, data.get('stream'))
+    
+    async def on_model_swap(self, data: Dict):
+        """Swap to the model file named by the backend (MODEL_PATH if none), in the background"""
+        model_path = (data or {}).get('model_path') or MODEL_PATH
+        self.spawn(self.swap_model(model_path))
+    
+    async def swap_model(self, model_path: str) -> bool:
+        """
+        Blue/green model swap
+        
+        The new model is exported, loaded and warmed next to the active one
+        (a new pool of inference processes with the process executor) while
+        frames keep flowing through the old one. The switch is a single
+        assignment on the event loop, so every batch runs entirely on one
+        model. The old model is only freed once the batches already handed
+        to it are done.
+        
+        Returns:
+            True if the new model is active
+        """
+        async with self.swap_lock:
+            loop = asyncio.get_running_loop()
+            try:
+                version = await asyncio.to_thread(model_version, model_path)
+            except OSError as e:
+                logger.error(f"❌ Model swap: cannot read {model_path}: {e}")
+                return False
+            if version == self.model_version:
+                logger.info(f"🔄 Model {version} is already active")
+                return False
+            
+            logger.info(f"🔄 Loading model {version} next to {self.model_version}...")
+            started = time.perf_counter()
+            executor = None
+            try:
+                await asyncio.to_thread(ensure_exported, model_path, INFERENCE_RUNTIME)
+                if INFERENCE_EXECUTOR == 'process':
+                    executor = create_inference_executor(
+                        INFERENCE_EXECUTOR, INFERENCE_PROCESSES, model_path, INFERENCE_RUNTIME,
+                        warm_up_batch=MAX_BATCH_SIZE,
+                        pin_cores=INFERENCE_PIN_CORES,
+                        threads=INFERENCE_THREADS
+                    )
+                    await self.start_inference_processes(executor)
+                else:
+                    model = await asyncio.to_thread(load_model, model_path, INFERENCE_RUNTIME)
+                    await asyncio.to_thread(warm_up, model, MAX_BATCH_SIZE)
+            except Exception as e:
+                logger.error(f"❌ Model swap to {version} failed, keeping {self.model_version}: {e}")
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                return False
+            
+            # Switch between batches: no await from here to the version update
+            previous = self.model_version
+            if executor is not None:
+                retired, self.inference_executor = self.inference_executor, executor
+            else:
+                retired, self.model = self.model, model
+            self.model_path, self.model_version = model_path, version
+            self.model_swaps += 1
+            logger.success(f"✅ Model {version} active (was {previous}), "
+                           f"loaded in {time.perf_counter() - started:.1f}s")
+            
+            if self.sio.connected:
+                await self.sio.emit('worker:ready', self.registration())
+            
+            # Batches already handed to the old model finish on it, then it is freed
+            if executor is not None:
+                await asyncio.to_thread(retired.shutdown, True)
+            else:
+                await loop.run_in_executor(self.inference_executor, gc.collect)
+            del retired
+            gc.collect()
+            logger.info(f"🔄 Model {previous} released")
+            return True
+    
+    async def watch_model(self):
+        """Swap to MODEL_PATH whenever the file is replaced"""
+        path = Path(MODEL_PATH)
+        last_mtime = path.stat().st_mtime
+        while True:
+            await asyncio.sleep(MODEL_WATCH_INTERVAL)
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if mtime != last_mtime:
+                last_mtime = mtime
+                await self.swap_model(MODEL_PATH)
+    
+    def on_stream_frame(self, camera_id, frame: np.ndarray, timestamp: str):
+        """Hand a decoded stream frame to the scheduler (called from reader threads)"""
+        data = {'camera_id': camera_id, 'timestamp': timestamp, 'image': frame}
+        self.loop.call_soon_threadsafe(self.scheduler.put, camera_id, data, timestamp)
     
     async def process_frame(self, data: Dict):
         """
-        Process incoming frame from webcam or RTSP stream
+        Accept an incoming frame from webcam or RTSP stream
+        
+        The frame goes into its camera's slot in the scheduler, replacing
+        any frame from that camera that has not been picked up yet. At most
+        MAX_IN_FLIGHT frames are processed at once, so memory stays bounded
+        when cameras send faster than the model can keep up.
         
         Args:
             data: {
-                'frame': 'base64_encoded_image',
+                'jpeg': bytes (binary attachment),
+                'frame': 'base64_encoded_image' (legacy clients, instead of 'jpeg'),
                 'camera_id': int,
                 'timestamp': str (ISO format),
                 'geofence_id': int (optional)
             }
         """
+        self.scheduler.put(data.get('camera_id'), data, data.get('timestamp'))
+    
+    async def run_pipeline(self):
+        """Pipeline slot: take the next scheduled frame and process it, forever"""
+        while True:
+            camera_id, data = await self.scheduler.get()
+            self.in_flight += 1
+            try:
+                await self._process_frame(data)
+            finally:
+                self.in_flight -= 1
+                self.scheduler.done(camera_id)
+    
+    def decode_target(self, camera_id) -> tuple:
+        """
+        Long side the model needs from a camera's frames and the part of the
+        frame that is inferred, for FrameDecoder.decode()
+        """
+        # Tiles need the full resolution
+        if self.camera_config.tiling(camera_id) is not None:
+            return None, (1.0, 1.0)
+        setting = self.camera_config.imgsz_setting(camera_id, DEFAULT_IMGSZ)
+        roi = self.camera_config.roi(camera_id)
+        return self.resolution.target(setting), roi.extent if roi is not None else (1.0, 1.0)
+    
+    async def _process_frame(self, data: Dict):
+        """Decode, infer, save and publish a single frame"""
+        loop = asyncio.get_running_loop()
+        camera_id = data.get('camera_id')
+        frame = None
+        snapshot_path = None
         try:
             frame_start = datetime.now()
+            started = time.perf_counter()
             
-            # Decode base64 frame
-            frame_b64 = data.get('frame')
-            if not frame_b64:
-                logger.error("❌ No frame data received")
-                return
-            
-            # Decode image
-            img_bytes = base64.b64decode(frame_b64)
-            nparr = np.frombuffer(img_bytes, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            # Pulled streams arrive decoded; relayed frames as raw JPEG bytes
+            # (binary protocol) or base64 (legacy clients)
+            frame = data.get('image')
+            img_bytes = None
+            scale = (1.0, 1.0)
+            if frame is None:
+                img_bytes = frame_bytes(data)
+                if not img_bytes:
+                    logger.error("❌ No frame data received")
+                    return
+                
+                # Decode image, reduced when the source is much larger than the model input
+                target, region = self.decode_target(camera_id)
+                stage_start = time.perf_counter()
+                frame, scale = await loop.run_in_executor(
+                    self.cpu_executor, self.decoder.decode, camera_id, img_bytes, target, region
+                )
+                self.metrics.observe('decode', time.perf_counter() - stage_start)
             
             if frame is None:
                 logger.error("❌ Failed to decode frame")
                 return
             
-            camera_id = data.get('camera_id')
             geofence_id = data.get('geofence_id')
             timestamp = data.get('timestamp', datetime.utcnow().isoformat())
             
             logger.debug(f"📸 Processing frame from camera {camera_id}")
             
-            # Run YOLO inference
-            results = self.model.predict(
-                frame,
-                conf=CONFIDENCE_THRESHOLD,
-                verbose=False
-            )
+            # Only the bounding region of the camera's ROI goes to the model
+            roi = self.camera_config.roi(camera_id)
+            model_input, origin = roi.crop(frame) if roi is not None else (frame, (0, 0))
             
-            # Parse detections
-            detections = []
-            for result in results:
-                boxes = result.boxes
-                
-                for i, box in enumerate(boxes):
-                    # Extract box data
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    conf = float(box.conf[0].cpu().numpy())
-                    cls_id = int(box.cls[0].cpu().numpy())
-                    
-                    # Filter for wildlife classes
-                    if cls_id not in WILDLIFE_CLASSES:
-                        continue
-                    
-                    class_name = WILDLIFE_CLASSES[cls_id]
-                    
-                    # Calculate bbox in YOLO format (center_x, center_y, width, height)
-                    width = x2 - x1
-                    height = y2 - y1
-                    center_x = x1 + width / 2
-                    center_y = y1 + height / 2
-                    
-                    bbox = {
-                        'x': float(center_x),
-                        'y': float(center_y),
-                        'width': float(width),
-                        'height': float(height),
-                        # Also include corners for drawing
-                        'x1': float(x1),
-                        'y1': float(y1),
-                        'x2': float(x2),
-                        'y2': float(y2)
-                    }
-                    
-                    detection = {
+            # Frozen cameras are not inferred; repeated frames reuse the last result
+            cached = None
+            if self.frame_cache is not None:
+                frame_digest, cached, frozen, frozen_changed = await loop.run_in_executor(
+                    self.cpu_executor, self.frame_cache.check, camera_id, model_input, img_bytes
+                )
+                if frozen_changed:
+                    await self.report_frozen(camera_id, frozen)
+                if frozen:
+                    await self.sio.emit('frame:processed', {
                         'camera_id': camera_id,
-                        'geofence_id': geofence_id,
-                        'detection_class': class_name,
-                        'confidence': float(conf),
-                        'bbox': bbox,
-                        'timestamp': timestamp
-                    }
-                    
-                    detections.append(detection)
-                    logger.info(f"🎯 Detected: {class_name} ({conf:.2%} confidence)")
-            
-            # Save snapshot if detections found
-            snapshot_path = None
-            if detections:
-                snapshot_path = await self.save_snapshot(frame, detections, camera_id)
-            
-            # Post detections to backend API
-            for detection in detections:
-                try:
-                    detection['snapshot_path'] = snapshot_path
-                    
-                    response = requests.post(
-                        f"{BACKEND_URL}/api/detections/",
-                        json=detection,
-                        timeout=5
-                    )
-                    
-                    if response.status_code == 200:
-                        detection_record = response.json()
-                        logger.success(f"✅ Detection saved: ID {detection_record.get('id')}")
-                        
-                        # Broadcast detection via Socket.IO
-                        await self.sio.emit('detection:created', detection_record)
-                        
-                        self.detections_made += 1
-                    else:
-                        logger.error(f"❌ Failed to save detection: {response.status_code}")
+                        'timestamp': timestamp,
+                        'detections_count': 0,
+                        'processing_time_ms': int((datetime.now() - frame_start).total_seconds() * 1000),
+                        'detections': [],
+                        'inference_skipped': 'frozen'
+                    })
+                    return
+            
+            # Skip the model when nothing in the scene has changed
+            if self.motion is not None and cached is None:
+                stage_start = time.perf_counter()
+                run_model, reason = await loop.run_in_executor(
+                    self.cpu_executor, self.motion.should_infer, camera_id, model_input
+                )
+                self.metrics.observe('motion', time.perf_counter() - stage_start)
+                if not run_model:
+                    await self.sio.emit('frame:processed', {
+                        'camera_id': camera_id,
+                        'timestamp': timestamp,
+                        'detections_count': 0,
+                        'processing_time_ms': int((datetime.now() - frame_start).total_seconds() * 1000),
+                        'detections': [],
+                        'inference_skipped': reason
+                    })
+                    return
+            
+            if cached is not None:
+                parsed, imgsz, tile_layout = cached.detections, cached.imgsz, cached.tile_layout
+            else:
+                # Run YOLO inference (batched with frames from other cameras at the
+                # same size and detection settings)
+                imgsz_setting = self.camera_config.imgsz_setting(camera_id, DEFAULT_IMGSZ)
+                imgsz = self.resolution.choose(imgsz_setting, model_input.shape)
+                settings = self.camera_config.detection_settings(camera_id)
+                tiling = self.camera_config.tiling(camera_id)
+                tile_layout = None
+                stage_start = time.perf_counter()
+                if tiling is not None and tiling.applies(model_input.shape, imgsz):
+                    parsed, imgsz = await self.infer_tiled(model_input, tiling, imgsz_setting, settings)
+                    tile_layout = tiling.name
+                else:
+                    parsed = await self.batcher.submit(model_input, camera_id, group=(imgsz, settings))
+                inference_seconds = time.perf_counter() - stage_start
+                self.metrics.observe('batch', inference_seconds)
                 
-                except Exception as e:
-                    logger.error(f"❌ Error posting detection: {e}")
+                # Only frames inferred at the adaptive size steer it
+                if imgsz_setting == 'adaptive':
+                    new_imgsz = self.resolution.record(inference_seconds * 1000)
+                    if new_imgsz is not None:
+                        logger.info(f"📐 Adaptive imgsz now {new_imgsz} "
+                                    f"(target {ADAPTIVE_TARGET_MS:.0f}ms per frame)")
+                
+                # Person / vehicle detections are confirmed by the second stage
+                if self.cascade is not None and parsed and self.camera_config.cascade(camera_id, CASCADE_DEFAULT):
+                    parsed = await self.verify_detections(model_input, parsed, camera_id, settings)
+                
+                if self.frame_cache is not None:
+                    self.frame_cache.store(camera_id, frame_digest, model_input.shape, parsed, imgsz, tile_layout)
+            
+            # Back to full-frame coordinates, without detections outside the ROI
+            if roi is not None:
+                parsed, dropped = roi.to_frame(parsed, origin, frame.shape)
+                self.camera_config.record(frame, model_input, dropped)
+            
+            # Detections are reported in pixels of the frame the camera sent
+            detections = []
+            for parsed_detection in parsed:
+                detection = {
+                    'camera_id': camera_id,
+                    'geofence_id': geofence_id,
+                    **scale_detection(parsed_detection, *scale),
+                    'timestamp': timestamp
+                }
+                detections.append(detection)
+                logger.info(f"🎯 Detected: {detection['detection_class']} "
+                            f"({detection['confidence']:.2%} confidence)")
+            
+            if self.motion is not None:
+                self.motion.record_result(camera_id, len(detections))
+            
+            # Persist track events (start / periodic update / end) instead of every detection
+            records = detections
+            if self.tracker is not None:
+                track_ids, records = self.tracker.update(camera_id, detections)
+                for detection, track_id in zip(detections, track_ids):
+                    detection['track_id'] = track_id
+            
+            # Queue snapshot if this frame produces records (path is final, write finishes later);
+            # boxes are drawn in the decoded frame's own coordinates
+            if any(record.get('track_event') != TRACK_END for record in records):
+                snapshot_path = self.snapshots.submit(frame, parsed, camera_id)
+            
+            # Queue records for the backend API (sent in batches by the outbox)
+            for record in records:
+                if record.get('track_event') != TRACK_END:
+                    record['snapshot_path'] = snapshot_path
+                    record['snapshot_url'] = snapshot_path
+                self.outbox.add(dict(record))
             
             # Update stats
-            self.frames_processed += 1
+            if cached is None:
+                self.frames_processed += 1
             
             # Broadcast frame processing result
             processing_time = (datetime.now() - frame_start).total_seconds()
+            if cached is None:
+                self.metrics.observe('frame', time.perf_counter() - started)
             await self.sio.emit('frame:processed', {
                 'camera_id': camera_id,
                 'timestamp': timestamp,
                 'detections_count': len(detections),
                 'processing_time_ms': int(processing_time * 1000),
+                'imgsz': imgsz,
+                'tile_layout': tile_layout,
+                'inference_reused': cached is not None,
                 'detections': detections  # Include bbox for client overlay
             })
             
@@ -236,101 +720,427 @@ class YOLOInferenceWorker:
         except Exception as e:
             logger.error(f"❌ Error processing frame: {e}")
             logger.exception(e)
+        
+        finally:
+            # The decode buffer is reused unless a queued snapshot still reads it
+            self.decoder.release(camera_id, frame, reusable=snapshot_path is None)
+    
+    async def report_frozen(self, camera_id, frozen: bool):
+        """Tell the backend a camera's image stopped (or resumed) changing"""
+        unchanged = self.frame_cache.frozen_seconds_for(camera_id)
+        if frozen:
+            logger.warning(f"🧊 Camera {camera_id}: image unchanged for {unchanged:.0f}s, "
+                           f"flagged frozen (not inferring)")
+        else:
+            logger.info(f"🧊 Camera {camera_id}: image changing again")
+        await self.sio.emit('camera:frozen', {
+            'camera_id': camera_id,
+            'frozen': frozen,
+            'unchanged_seconds': round(unchanged, 1),
+            'timestamp': datetime.utcnow().isoformat()
+        })
+    
+    async def expire_tracks(self):
+        """End tracks of cameras that stopped sending frames (or stopped being inferred)"""
+        while True:
+            await asyncio.sleep(1)
+            for event in self.tracker.expire():
+                self.outbox.add(event)
+    
+    async def enforce_retention(self):
+        """Sweep SNAPSHOT_DIR against the quota and max age, keeping incident snapshots"""
+        while True:
+            try:
+                response = await self.outbox.client.get('/api/detections/snapshots/protected')
+                response.raise_for_status()
+                self.protected_snapshots = set(response.json()['snapshots'])
+            except Exception as e:
+                if self.protected_snapshots is None:
+                    # Never delete without knowing which snapshots are evidence
+                    logger.warning(f"⚠️ Snapshot retention skipped, protected list unavailable: {e}")
+                    await asyncio.sleep(SNAPSHOT_RETENTION_INTERVAL)
+                    continue
+                logger.warning(f"⚠️ Protected snapshot list unavailable, using last one: {e}")
+            
+            try:
+                result = await asyncio.to_thread(self.retention.sweep, self.protected_snapshots)
+                if result['deleted_files']:
+                    logger.info(f"🧹 Snapshot retention: deleted {result['deleted_files']} files "
+                               f"({result['deleted_bytes'] / 1e6:.1f} MB), "
+                               f"{result['usage_bytes'] / 1e9:.2f} GB in use")
+            except Exception as e:
+                logger.error(f"❌ Snapshot retention failed: {e}")
+            await asyncio.sleep(SNAPSHOT_RETENTION_INTERVAL)
     
-    async def save_snapshot(
-        self,
-        frame: np.ndarray,
-        detections: List[Dict],
-        camera_id: int
-    ) -> str:
+    async def on_detections_saved(self, records: List[Dict]):
+        """Broadcast detections once the backend has stored them"""
+        for detection_record in records:
+            await self.sio.emit('detection:created', detection_record)
+        self.detections_made += len(records)
+    
+    async def infer_batch(self, frames: List[np.ndarray], imgsz: Optional[int] = None,
+                          settings: Optional[DetectionSettings] = None) -> List[List[Dict]]:
         """
-        Save annotated frame snapshot
+        Run YOLO inference on a batch of frames in a single predict call
+        
+        Runs on the inference executor so the event loop keeps serving
+        Socket.IO pings while the model is busy.
         
         Args:
-            frame: OpenCV frame
-            detections: List of detections with bboxes
-            camera_id: Camera ID
+            frames: Decoded frames, possibly from different cameras
+            imgsz: Model input size shared by the batch
+            settings: Confidence, classes and NMS IoU shared by the batch,
+                None for the worker defaults
             
         Returns:
-            Snapshot file path
+            One list of parsed detections per frame, in input order, each
+            tagged with the version of the model that produced it
         """
+        conf, classes, iou = settings or self.camera_config.default_detection
+        # Model (or process pool) and version are taken together, so a swap
+        # never splits a batch between two models
+        version, executor = self.model_version, self.inference_executor
+        if self.model is None:
+            job = partial(predict_batch_in_process, frames, conf, WILDLIFE_CLASSES, imgsz, classes, iou)
+        else:
+            job = partial(predict_batch, self.model, frames, conf, WILDLIFE_CLASSES, imgsz, classes, iou)
+        
+        loop = asyncio.get_running_loop()
         try:
-            # Draw bounding boxes
-            annotated_frame = frame.copy()
-            
-            for detection in detections:
-                bbox = detection['bbox']
-                class_name = detection['detection_class']
-                confidence = detection['confidence']
-                
-                # Extract corners
-                x1, y1 = int(bbox['x1']), int(bbox['y1'])
-                x2, y2 = int(bbox['x2']), int(bbox['y2'])
-                
-                # Draw rectangle
-                color = (0, 255, 0)  # Green
-                if class_name == 'person':
-                    color = (0, 0, 255)  # Red for human intrusion
-                
-                cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, 2)
-                
-                # Draw label
-                label = f"{class_name} {confidence:.2%}"
-                label_size, _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
-                cv2.rectangle(
-                    annotated_frame,
-                    (x1, y1 - label_size[1] - 10),
-                    (x1 + label_size[0], y1),
-                    color,
-                    -1
-                )
-                cv2.putText(
-                    annotated_frame,
-                    label,
-                    (x1, y1 - 5),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (255, 255, 255),
-                    2
-                )
-            
-            # Save snapshot
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            filename = f"cam{camera_id}_{timestamp}.jpg"
-            snapshot_path = SNAPSHOT_DIR / filename
-            
-            cv2.imwrite(str(snapshot_path), annotated_frame)
-            logger.debug(f"📸 Snapshot saved: {snapshot_path}")
+            detections, timings = await loop.run_in_executor(executor, job)
+        except BrokenProcessPool:
+            # A child died (segfault, OOM kill): this batch is lost, the
+            # following ones go to a fresh pool
+            await self.restart_inference_processes(executor)
+            raise
+        
+        self.metrics.batch_size.observe(len(frames))
+        for stage, seconds in timings.items():
+            self.metrics.observe(stage, seconds)
+        for frame_detections in detections:
+            for detection in frame_detections:
+                detection['model_version'] = version
+        return detections
+    
+    async def infer_tiled(self, frame: np.ndarray, tiling, imgsz_setting,
+                          settings: Optional[DetectionSettings] = None) -> tuple:
+        """
+        Run all tiles of a frame as one batch and merge them with cross-tile NMS
+        
+        Returns:
+            (merged detections in frame coordinates, imgsz used per tile)
+        """
+        tiles, origins = tiling.split(frame)
+        imgsz = self.resolution.choose(imgsz_setting, tiles[0].shape)
+        
+        started = time.perf_counter()
+        results = await self.infer_batch(tiles, imgsz, settings)
+        self.tiling_stats.record(tiling.name, len(tiles), time.perf_counter() - started)
+        
+        return tiling.merge(results, origins), imgsz
+    
+    async def verify_detections(self, frame: np.ndarray, detections: List[Dict], camera_id,
+                                settings: DetectionSettings) -> List[Dict]:
+        """Send crops of cascade-class detections through the second stage and apply its verdicts"""
+        indices, crops = self.cascade.crops(frame, detections)
+        if not indices:
+            return detections
+        verdicts = await asyncio.gather(*(
+            self.cascade_batcher.submit(crop, camera_id) for crop in crops
+        ))
+        # Relabeled detections still have to be in the camera's allow-list
+        allowed = {WILDLIFE_CLASSES[cls_id] for cls_id in settings.classes}
+        return [detection for detection in self.cascade.apply(detections, indices, verdicts)
+                if detection['detection_class'] in allowed]
+    
+    async def verify_crops(self, crops: List[np.ndarray], group=None) -> List:
+        """Run one batch of crops, from any camera, through the second-stage model"""
+        loop = asyncio.get_running_loop()
+        verdicts, seconds = await loop.run_in_executor(
+            self.cascade_executor, predict_crops, self.cascade_model, crops,
+            CASCADE_CONFIDENCE, WILDLIFE_CLASSES, CASCADE_IMGSZ
+        )
+        self.cascade.record_batch(seconds)
+        self.metrics.observe('cascade', seconds)
+        return verdicts
+    
+    def record_phase(self, phase: str, started: float):
+        """Store and log how long a startup phase took"""
+        self.startup_timings[phase] = time.perf_counter() - started
+        logger.info(f"⏱️ Startup phase '{phase}': {self.startup_timings[phase]:.2f}s")
+    
+    async def prepare_model(self):
+        """
+        Export, load and warm up the model off the event loop, then
+        re-register with capacity
+        
+        Runs alongside the backend connection. Frames that arrive meanwhile
+        wait in the scheduler (latest per camera, stale ones are dropped).
+        """
+        loop = asyncio.get_running_loop()
+        
+        # Export once up front so process children never race to export
+        started = time.perf_counter()
+        await asyncio.to_thread(ensure_exported, MODEL_PATH, INFERENCE_RUNTIME)
+        self.record_phase('export', started)
+        
+        if INFERENCE_EXECUTOR == 'process':
+            # One job per child spawns them all; each loads and warms its own
+            # model copy in the pool initializer before taking the job
+            started = time.perf_counter()
+            await self.start_inference_processes(self.inference_executor)
+            self.record_phase('load + warm-up', started)
+        else:
+            # Load and warm on the inference thread itself
+            logger.info(f"📦 Loading YOLO model from: {MODEL_PATH} ({INFERENCE_RUNTIME})")
+            started = time.perf_counter()
+            self.model = await loop.run_in_executor(
+                self.inference_executor, load_model, MODEL_PATH, INFERENCE_RUNTIME
+            )
+            self.record_phase('load', started)
             
-            return str(snapshot_path)
+            started = time.perf_counter()
+            await loop.run_in_executor(self.inference_executor, warm_up, self.model, MAX_BATCH_SIZE)
+            self.record_phase('warm-up', started)
         
-        except Exception as e:
-            logger.error(f"❌ Error saving snapshot: {e}")
-            return None
+        if self.cascade is not None:
+            logger.info(f"📦 Loading cascade model from: {CASCADE_MODEL_PATH}")
+            started = time.perf_counter()
+            self.cascade_model = await loop.run_in_executor(
+                self.cascade_executor, load_model, CASCADE_MODEL_PATH, 'torch'
+            )
+            await loop.run_in_executor(self.cascade_executor, warm_up, self.cascade_model, CASCADE_MAX_BATCH_SIZE)
+            self.record_phase('cascade', started)
+        
+        self.ready = True
+        logger.success(f"✅ YOLO model ready ({INFERENCE_RUNTIME})")
+        if self.sio.connected:
+            await self.sio.emit('worker:ready', self.registration())
+    
+    async def start_inference_processes(self, executor):
+        """
+        Spawn every child of a process pool and wait until all of them have
+        loaded and warmed the model (each readiness job holds its child
+        until the others arrive, so no child is skipped)
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, inference_process_ready)
+            for _ in range(max(1, INFERENCE_PROCESSES))
+        ))
+    
+    async def restart_inference_processes(self, broken):
+        """Replace a process pool broken by a crashed child with a fresh, warmed one"""
+        async with self.swap_lock:
+            # Every batch on the broken pool fails; only the first one restarts it
+            if self.inference_executor is not broken:
+                return
+            logger.error("💥 An inference process died, restarting the process pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            started = time.perf_counter()
+            executor = create_inference_executor(
+                INFERENCE_EXECUTOR, INFERENCE_PROCESSES, self.model_path, INFERENCE_RUNTIME,
+                warm_up_batch=MAX_BATCH_SIZE,
+                pin_cores=INFERENCE_PIN_CORES,
+                threads=INFERENCE_THREADS
+            )
+            try:
+                await self.start_inference_processes(executor)
+            except Exception as e:
+                # Left broken: the next batch tries again
+                logger.error(f"❌ Inference process pool restart failed: {e}")
+                executor.shutdown(wait=False, cancel_futures=True)
+                return
+            self.inference_executor = executor
+            self.inference_restarts += 1
+            logger.success(f"✅ Inference process pool restarted in {time.perf_counter() - started:.1f}s "
+                           f"({self.inference_restarts} restart(s) so far)")
+    
+    async def start_pipeline(self, model_ready: asyncio.Task):
+        """
+        Start the batch loop and outbox, then the pipeline slots once the
+        model is ready (shared by start() and replay_benchmark.py)
+        """
+        self.spawn(self.batcher.run())
+        if self.cascade is not None:
+            self.spawn(self.cascade_batcher.run())
+        await self.outbox.start()
+        if self.tracker is not None:
+            self.spawn(self.expire_tracks())
+        if SNAPSHOT_MAX_GB or SNAPSHOT_MAX_AGE_DAYS:
+            self.spawn(self.enforce_retention())
+        
+        await model_ready
+        if MODEL_WATCH_INTERVAL:
+            self.spawn(self.watch_model())
+        
+        # Pipeline slots bound the number of frames in flight
+        for _ in range(MAX_IN_FLIGHT):
+            self.spawn(self.run_pipeline())
+    
+    def spawn(self, coro) -> asyncio.Task:
+        """
+        Start a background task; the worker keeps a reference so it is not
+        garbage-collected mid-run, logs it if it fails and cancels it in close()
+        """
+        task = asyncio.create_task(coro, name=coro.__qualname__)
+        self.tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+    
+    def _task_done(self, task: asyncio.Task):
+        self.tasks.discard(task)
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.opt(exception=task.exception()).error(
+            f"❌ Background task {task.get_name()} failed: {task.exception()}"
+        )
+    
+    async def close(self):
+        """Stop background tasks and stream readers, flush the outbox and stop the executors"""
+        for task in list(self.tasks):
+            task.cancel()
+        self.streams.stop_all()
+        await self.outbox.close()
+        self.snapshots.shutdown(wait=True)
+        self.inference_executor.shutdown(wait=False, cancel_futures=True)
+        self.cpu_executor.shutdown(wait=False, cancel_futures=True)
+        if self.cascade is not None:
+            self.cascade_executor.shutdown(wait=False, cancel_futures=True)
+    
+    def log_runtime_benchmark(self):
+        """Log INFERENCE_RUNTIME latency against the PyTorch baseline on the same frames"""
+        frames = load_sample_frames(SNAPSHOT_DIR)
+        report = compare_runtimes(MODEL_PATH, INFERENCE_RUNTIME, frames)
+        if INFERENCE_RUNTIME == 'torch':
+            logger.info(f"⏱️ Runtime benchmark: torch {report['torch_ms']}ms/frame")
+            return
+        logger.info(f"⏱️ Runtime benchmark ({len(frames)} frames): "
+                    f"torch {report['torch_ms']}ms/frame, "
+                    f"{INFERENCE_RUNTIME} {report[INFERENCE_RUNTIME + '_ms']}ms/frame "
+                    f"({report['speedup']}x)")
     
     async def start(self):
         """Start the inference worker"""
         try:
             logger.info(f"🚀 Starting YOLO Inference Worker...")
-            logger.info(f"📡 Connecting to {BACKEND_URL}")
             
-            # Connect to backend Socket.IO
+            # Stream reader threads hand frames back to this loop
+            self.loop = asyncio.get_running_loop()
+            
+            if METRICS_PORT:
+                self.metrics.serve(METRICS_PORT, self)
+                logger.info(f"📈 Metrics on http://0.0.0.0:{METRICS_PORT}/metrics")
+            
+            # Model loads in the background while we connect and register
+            model_ready = asyncio.create_task(self.prepare_model())
+            
+            # Connect to backend Socket.IO (registers as warming, capacity 0)
+            logger.info(f"📡 Connecting to {BACKEND_URL}")
+            started = time.perf_counter()
             await self.sio.connect(
                 BACKEND_URL,
                 transports=['websocket'],
                 wait_timeout=10
             )
+            self.record_phase('connect', started)
+            
+            # Batch dispatch loop and detection outbox, then the pipeline slots
+            await self.start_pipeline(model_ready)
+            
+            phases = ", ".join(f"{phase} {seconds:.2f}s"
+                               for phase, seconds in self.startup_timings.items())
+            logger.success(f"✅ Worker started in {time.perf_counter() - STARTUP_CLOCK:.2f}s "
+                           f"({phases})")
+            
+            if RUNTIME_BENCHMARK:
+                await asyncio.to_thread(self.log_runtime_benchmark)
             
             # Keep worker alive
-            logger.success("✅ Worker started successfully")
             logger.info("👀 Waiting for frames...")
             
             while True:
                 await asyncio.sleep(10)
                 
                 # Log stats every 10 seconds
+                frame_counters = self.scheduler.totals()
                 logger.info(f"📊 Stats: {self.frames_processed} frames, "
-                           f"{self.detections_made} detections")
+                           f"{self.detections_made} detections, "
+                           f"{self.in_flight} in flight")
+                logger.info(f"🗂️ Scheduler: {frame_counters['received']} received, "
+                           f"{frame_counters['replaced']} replaced by newer, "
+                           f"{frame_counters['stale']} stale, "
+                           f"{self.scheduler.depth} queued")
+                for camera_id, counters in self.scheduler.per_camera().items():
+                    logger.debug(f"🗂️ Camera {camera_id}: {counters}")
+                for camera_id, stream in self.streams.stats().items():
+                    logger.info(f"📹 Stream {camera_id}: "
+                               f"{'connected' if stream['connected'] else 'reconnecting'}, "
+                               f"{stream['frames']} frames of {stream['grabbed']} grabbed, "
+                               f"{stream['reconnects']} reconnects")
+                if self.motion is not None:
+                    motion_counters = self.motion.totals()
+                    logger.info(f"🌿 Motion gate: {motion_counters['inferred']} inferred, "
+                               f"{motion_counters['skipped']} skipped as static")
+                    for camera_id, counters in self.motion.per_camera().items():
+                        logger.debug(f"🌿 Camera {camera_id}: {counters}")
+                if self.frame_cache is not None:
+                    cache_counters = self.frame_cache.totals()
+                    logger.info(f"🧊 Duplicates: {cache_counters['duplicates']} reused results, "
+                               f"{cache_counters['frozen_skipped']} frozen frames skipped, "
+                               f"{cache_counters['frozen_cameras']} cameras frozen")
+                decode_counters = self.decoder.totals()
+                logger.info(f"🖼️ Decode: {decode_counters['reduced']} of {decode_counters['frames']} "
+                           f"reduced, {decode_counters['resized']} resized, "
+                           f"{decode_counters['buffers_allocated']} buffers allocated")
+                if self.camera_config.rois:
+                    roi_counters = self.camera_config.totals()
+                    logger.info(f"🔲 ROI: {roi_counters['cameras']} cameras, "
+                               f"{roi_counters['pixel_share']:.0%} of pixels inferred, "
+                               f"{roi_counters['detections_dropped']} detections dropped")
+                logger.info(f"📐 Adaptive imgsz: {self.resolution.imgsz} "
+                           f"({self.resolution.changes} changes)")
+                if self.tracker is not None:
+                    events = self.tracker.events
+                    logger.info(f"🐾 Tracks: {self.tracker.active_tracks} active, "
+                               f"{self.tracker.detections} detections -> "
+                               f"{events['start']} starts, {events['update']} updates, "
+                               f"{events['end']} ends")
+                if self.cascade is not None:
+                    cascade_counters = self.cascade.totals()
+                    logger.info(f"🔍 Cascade: {cascade_counters['crops']} crops in "
+                               f"{cascade_counters['batches']} batches, "
+                               f"{cascade_counters['avg_crop_ms']}ms per crop, "
+                               f"{cascade_counters['overturn_rate']:.1%} overturned")
+                    for class_name, stats in self.cascade.report().items():
+                        logger.info(f"🔍 Cascade {class_name}: {stats['confirmed']} confirmed, "
+                                   f"{stats['relabeled']} relabeled, {stats['rejected']} rejected")
+                logger.info(f"📸 Snapshots: {self.snapshots.written} written, "
+                           f"{self.snapshots.skipped} skipped, "
+                           f"{self.snapshots.pending} pending")
+                if self.retention.sweeps:
+                    retention_counters = self.retention.totals()
+                    logger.info(f"🧹 Retention: {retention_counters['usage_bytes'] / 1e9:.2f} GB in use, "
+                               f"{retention_counters['deleted_files']} deleted, "
+                               f"{retention_counters['protected_kept']} protected kept")
+                logger.info(f"📮 Outbox: {self.outbox.saved} saved, "
+                           f"{self.outbox.rejected} rejected, "
+                           f"{self.outbox.spooled} spooled")
+                
+                logger.info(f"📦 Inference throughput: {self.batcher.overall_fps():.1f} fps "
+                           f"since first batch")
+                batch_report = self.batcher.throughput_report()
+                untiled_ms = (sum(s['avg_latency_ms'] * s['batches'] for s in batch_report.values())
+                              / max(1, sum(s['batches'] for s in batch_report.values())))
+                for layout, stats in self.tiling_stats.report().items():
+                    cost = f" ({stats['avg_latency_ms'] / untiled_ms:.1f}x untiled)" if untiled_ms else ""
+                    logger.info(f"🧩 Tiles {layout}: {stats['frames']} frames, "
+                               f"{stats['tiles']} tiles each, "
+                               f"{stats['avg_latency_ms']}ms avg{cost}")
+                for size, stats in batch_report.items():
+                    logger.info(f"📦 Batch size {size}: {stats['fps']} fps "
+                               f"({stats['batches']} batches, "
+                               f"{stats['avg_latency_ms']}ms avg)")
         
         except KeyboardInterrupt:
             logger.info("🛑 Shutting down worker...")
@@ -340,6 +1150,9 @@ class YOLOInferenceWorker:
             logger.error(f"❌ Worker error: {e}")
             logger.exception(e)
             await self.sio.disconnect()
+        
+        finally:
+            await self.close()
 
 
 async def main():
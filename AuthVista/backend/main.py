@@ -8,14 +8,16 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
+import asyncio
+import base64
 import logging
 from dotenv import load_dotenv
 
-from database import get_db, init_db
-from models import User, UserRole
-from schemas import UserCreate, UserResponse, Token, UserLogin
+from database import SessionLocal, get_db, init_db
+from models import Camera, CameraStatus, CameraType, User, UserRole
+from schemas import ModelSwapRequest, UserCreate, UserResponse, Token, UserLogin
 import socketio
 
 load_dotenv()
@@ -248,6 +250,9 @@ def health_check():
 # Connected workers tracking
 connected_workers = {}
 
+# Stream cameras pulled directly by a worker: camera_id -> worker sid
+stream_owners: Dict[int, str] = {}
+
 @sio.event
 async def connect(sid, environ):
     """Client connected to WebSocket"""
@@ -262,22 +267,166 @@ async def disconnect(sid):
     if sid in connected_workers:
         worker_info = connected_workers.pop(sid)
         logger.info(f"Worker disconnected: {worker_info['worker_type']}")
-
-@sio.event
+        
+        # Hand the streams it pulled to the remaining workers
+        orphaned = {camera_id for camera_id, owner in stream_owners.items() if owner == sid}
+        for camera_id in orphaned:
+            stream_owners.pop(camera_id, None)
+        if orphaned:
+            for config in await asyncio.to_thread(load_camera_configs):
+                if config['camera_id'] in orphaned:
+                    await push_camera_config(config)
+
+@sio.on('worker:ready')
 async def worker_ready(sid, data):
-    """Inference worker registered"""
+    """
+    Inference worker registered
+    
+    Workers register as soon as they connect (status 'warming', capacity 0)
+    and register again with their capacity once the model is warmed up.
+    """
     connected_workers[sid] = data
     logger.info(f"Worker ready: {data['worker_type']} (sid: {sid})")
-    logger.info(f"  Model: {data.get('model', 'unknown')}")
+    logger.info(f"  Model: {data.get('model', 'unknown')} ({data.get('model_version', 'unknown version')})")
     logger.info(f"  Confidence: {data.get('confidence_threshold', 'unknown')}")
+    logger.info(f"  Status: {data.get('status', 'ready')}, capacity: {data.get('capacity', 'unknown')}")
     await sio.emit('worker:registered', {'status': 'registered', 'sid': sid}, room=sid)
+    
+    # Send per-camera inference settings (ROI, streams to pull etc.) the worker needs
+    for config in await asyncio.to_thread(load_camera_configs):
+        await sio.emit('camera:config', worker_camera_config(config, sid), room=sid)
+
+# camera_metadata keys that inference workers receive in camera:config
+CAMERA_CONFIG_KEYS = ('roi', 'imgsz', 'tiling', 'cascade', 'confidence', 'classes', 'iou', 'motion')
+
+# Camera types whose stream a worker pulls itself instead of the backend relaying frames
+STREAM_CAMERA_TYPES = (CameraType.RTSP, CameraType.IP)
+
+def camera_config(camera: Camera) -> dict:
+    """camera:config payload: inference settings kept in camera_metadata"""
+    metadata = camera.camera_metadata or {}
+    config = {key: metadata.get(key) for key in CAMERA_CONFIG_KEYS}
+    config['camera_id'] = camera.id
+    config['stream'] = None
+    if camera.type in STREAM_CAMERA_TYPES and camera.url and camera.is_active:
+        config['stream'] = {'url': camera.url, 'fps': camera.fps or 5}
+    return config
+
+def load_camera_configs() -> List[dict]:
+    """camera:config payloads for all active cameras that have settings or a stream"""
+    db = SessionLocal()
+    try:
+        cameras = db.query(Camera).filter(Camera.is_active == True).all()
+        configs = [camera_config(camera) for camera in cameras]
+        return [config for config in configs
+                if config['stream'] or any(config.get(key) is not None for key in CAMERA_CONFIG_KEYS)]
+    finally:
+        db.close()
+
+def stream_owner(camera_id: int) -> Optional[str]:
+    """
+    Worker that pulls a camera's stream: the current owner while it is
+    connected, else the stream-pulling worker with the fewest streams
+    """
+    workers = [sid for sid, worker in connected_workers.items()
+               if worker.get('worker_type') == 'yolo_inference' and worker.get('stream_pull')]
+    owner = stream_owners.get(camera_id)
+    if owner in workers:
+        return owner
+    
+    stream_owners.pop(camera_id, None)
+    if not workers:
+        return None
+    owner = min(workers, key=lambda sid: sum(1 for o in stream_owners.values() if o == sid))
+    stream_owners[camera_id] = owner
+    logger.info(f"Camera {camera_id} stream assigned to worker {owner}")
+    return owner
+
+def worker_camera_config(config: dict, sid: str) -> dict:
+    """camera:config for one worker: only the stream's owner gets the stream"""
+    if not config.get('stream'):
+        stream_owners.pop(config['camera_id'], None)
+        return config
+    if stream_owner(config['camera_id']) == sid:
+        return config
+    return {**config, 'stream': None}
+
+async def push_camera_config(config: dict):
+    """Send updated camera settings to every connected inference worker"""
+    for sid, worker in list(connected_workers.items()):
+        if worker.get('worker_type') == 'yolo_inference':
+            await sio.emit('camera:config', worker_camera_config(config, sid), room=sid)
+
+@app.post("/api/workers/model-swap")
+async def swap_worker_model(
+    request: ModelSwapRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Roll out a new model to every connected inference worker without a restart
+    
+    Each worker loads and warms the model next to its current one, switches
+    between batches and re-registers with the new model_version. Without
+    model_path, workers reload their MODEL_PATH (e.g. after the file was
+    replaced). Admin only.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can swap worker models"
+        )
+    
+    workers = [sid for sid, worker in connected_workers.items()
+               if worker.get('worker_type') == 'yolo_inference']
+    for sid in workers:
+        await sio.emit('model:swap', {'model_path': request.model_path}, room=sid)
+    return {
+        "workers": len(workers),
+        "model_path": request.model_path,
+        "active_versions": sorted({connected_workers[sid].get('model_version') or 'unknown'
+                                   for sid in workers})
+    }
 
-@sio.event
+def pulled_by_worker(camera_id) -> bool:
+    """True if a worker reads this camera's stream itself"""
+    try:
+        return int(camera_id) in stream_owners
+    except (TypeError, ValueError):
+        return False
+
+def to_binary_frame(data: dict) -> dict:
+    """
+    Convert a legacy base64 frame payload to the binary frame protocol
+    
+    Binary payloads carry raw JPEG bytes in 'jpeg', which Socket.IO sends as
+    a binary attachment. Payloads that are already binary are returned as is.
+    """
+    if isinstance(data.get('jpeg'), (bytes, bytearray)) or not data.get('frame'):
+        return data
+    
+    frame_b64 = data['frame']
+    if frame_b64.startswith('data:'):
+        frame_b64 = frame_b64.split(',', 1)[1]
+    
+    header = {key: value for key, value in data.items() if key != 'frame'}
+    header['jpeg'] = base64.b64decode(frame_b64)
+    return header
+
+@sio.on('frame:ingest')
 async def frame_ingest(sid, data):
     """
     Frame received from webcam/RTSP for inference
     Forward to inference worker
+    
+    Accepts raw JPEG bytes in 'jpeg' (binary attachment) or a base64 'frame'
+    string from older clients; workers always receive the binary form.
     """
+    # Stream cameras are pulled by their worker directly, relaying would
+    # process the camera twice
+    if pulled_by_worker(data.get('camera_id')):
+        logger.debug(f"Camera {data.get('camera_id')} is pulled by a worker, not relaying")
+        return
+    
     # Broadcast to all connected inference workers
     worker_count = len([w for w in connected_workers.values() if w.get('worker_type') == 'yolo_inference'])
     
@@ -286,7 +435,18 @@ async def frame_ingest(sid, data):
         await sio.emit('error', {'message': 'No inference workers available'}, room=sid)
         return
     
+    # Warming workers still get frames: they keep the latest per camera
+    # and start on it as soon as the model is ready
+    if not any(w.get('capacity', 1) > 0 for w in connected_workers.values()
+               if w.get('worker_type') == 'yolo_inference'):
+        logger.debug("Inference workers still warming up")
+    
     # Forward frame to inference workers
+    try:
+        data = to_binary_frame(data)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Dropping malformed frame from {sid}: {e}")
+        return
     await sio.emit('frame:ingest', data)
 
 @sio.event
@@ -307,6 +467,40 @@ async def frame_processed(sid, data):
     """
     await sio.emit('frame:processed', data)
 
+def set_camera_status(camera_id: int, camera_status: CameraStatus):
+    """Store a camera's status reported by an inference worker"""
+    db = SessionLocal()
+    try:
+        camera = db.query(Camera).filter(Camera.id == camera_id).first()
+        if camera is not None:
+            camera.status = camera_status
+            db.commit()
+    finally:
+        db.close()
+
+@sio.on('camera:frozen')
+async def camera_frozen(sid, data):
+    """
+    Inference worker reports a camera that keeps sending the identical
+    image (hung camera or encoder), or that is changing again
+    
+    The camera is marked 'error' while frozen and 'online' once it
+    recovers, and clients are told either way.
+    """
+    camera_id = data.get('camera_id')
+    if data.get('frozen'):
+        logger.warning(f"Camera {camera_id} frozen: image unchanged for "
+                       f"{data.get('unchanged_seconds', 0):.0f}s")
+    else:
+        logger.info(f"Camera {camera_id} image changing again")
+    
+    try:
+        camera_status = CameraStatus.ERROR if data.get('frozen') else CameraStatus.ONLINE
+        await asyncio.to_thread(set_camera_status, int(camera_id), camera_status)
+    except (TypeError, ValueError):
+        logger.warning(f"camera:frozen with invalid camera_id {camera_id!r}")
+    await sio.emit('camera:frozen', data)
+
 # Function to broadcast detection events (called from inference worker)
 async def broadcast_detection(detection_data: dict):
     """Broadcast detection to all connected clients"""
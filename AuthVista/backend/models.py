@@ -135,6 +135,14 @@ class Detection(Base):
     location = Column(Geometry('POINT', srid=4326), index=True)  # PostGIS spatial index
     geofence_id = Column(Integer, ForeignKey("geofences.id"), index=True)  # Index for geofence queries
     detected_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Object track (set by the inference worker's tracker; one row per track event)
+    track_id = Column(String, index=True)  # Index for track history queries
+    track_event = Column(String)  # start, update or end
+    first_seen_at = Column(DateTime(timezone=True))
+    last_seen_at = Column(DateTime(timezone=True))
+    dwell_seconds = Column(Float)
+    frame_count = Column(Integer)  # Frames the object was detected in so far
+    model_version = Column(String, index=True)  # Worker model that produced the detection
     
     # Relationships
     camera = relationship("Camera", back_populates="detections")
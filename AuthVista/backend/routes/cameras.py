@@ -1,28 +1,30 @@
 """
 Camera API routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 
 from database import get_db
 from models import Camera, User
-from schemas import CameraCreate, CameraResponse, CameraUpdate
-from main import get_current_user
+from schemas import CameraCreate, CameraInferenceSettings, CameraResponse, CameraRoi, CameraUpdate
+from main import camera_config, get_current_user, push_camera_config
 
 router = APIRouter(prefix="/api/cameras", tags=["cameras"])
 
 @router.post("/", response_model=CameraResponse, status_code=status.HTTP_201_CREATED)
 def create_camera(
     camera: CameraCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Register a new camera
     
-    Requires authentication. Creates a camera with specified type (laptop, RTSP, IP, dashcam)
+    Requires authentication. Creates a camera with specified type (laptop, RTSP, IP, dashcam).
+    RTSP and IP cameras with a URL are pulled by an inference worker directly.
     """
     db_camera = Camera(
         name=camera.name,
@@ -31,13 +33,14 @@ def create_camera(
         latitude=camera.latitude,
         longitude=camera.longitude,
         heading=camera.heading,
-        metadata=camera.metadata,
+        camera_metadata=camera.metadata,
         created_by=current_user.id
     )
     db.add(db_camera)
     db.commit()
     db.refresh(db_camera)
     
+    background_tasks.add_task(push_camera_config, camera_config(db_camera))
     return db_camera
 
 @router.get("/", response_model=List[CameraResponse])
@@ -92,11 +95,16 @@ def get_camera(
 def update_camera(
     camera_id: int,
     camera_update: CameraUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Update a camera's information
+    
+    URL, fps or type changes of stream cameras reach the pulling worker
+    immediately, as do inference settings in metadata (e.g. confidence,
+    classes, iou), which workers apply without a restart.
     """
     db_camera = db.query(Camera).filter(Camera.id == camera_id).first()
     if not db_camera:
@@ -114,17 +122,160 @@ def update_camera(
     
     # Update fields
     update_data = camera_update.dict(exclude_unset=True)
+    metadata_update = update_data.pop('metadata', None)
     for field, value in update_data.items():
         setattr(db_camera, field, value)
     
+    # Merge metadata, reassigning the dict so SQLAlchemy sees the JSON column change
+    if metadata_update is not None:
+        metadata = dict(db_camera.camera_metadata or {})
+        for key, value in metadata_update.items():
+            if value is None:
+                metadata.pop(key, None)
+            else:
+                metadata[key] = value
+        db_camera.camera_metadata = metadata
+    
     db.commit()
     db.refresh(db_camera)
     
+    background_tasks.add_task(push_camera_config, camera_config(db_camera))
     return db_camera
 
+@router.get("/{camera_id}/roi", response_model=CameraRoi)
+def get_camera_roi(
+    camera_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get a camera's inference region of interest
+    """
+    camera = db.query(Camera).filter(Camera.id == camera_id).first()
+    if not camera:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Camera with id {camera_id} not found"
+        )
+    
+    return (camera.camera_metadata or {}).get('roi') or CameraRoi()
+
+@router.put("/{camera_id}/roi", response_model=CameraRoi)
+def update_camera_roi(
+    camera_id: int,
+    roi: CameraRoi,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Set a camera's inference region of interest
+    
+    Inference workers only run the model on the bounding region of the
+    polygons and drop detections outside them. An empty polygon list
+    restores the full frame. Connected workers get the change immediately.
+    """
+    db_camera = db.query(Camera).filter(Camera.id == camera_id).first()
+    if not db_camera:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Camera with id {camera_id} not found"
+        )
+    
+    # Check permissions
+    if db_camera.created_by != current_user.id and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this camera"
+        )
+    
+    # Reassign the dict so SQLAlchemy sees the JSON column change
+    metadata = dict(db_camera.camera_metadata or {})
+    metadata['roi'] = roi.dict() if roi.polygons else None
+    db_camera.camera_metadata = metadata
+    db.commit()
+    db.refresh(db_camera)
+    
+    background_tasks.add_task(push_camera_config, camera_config(db_camera))
+    return roi
+
+@router.get("/{camera_id}/inference", response_model=CameraInferenceSettings)
+def get_camera_inference_settings(
+    camera_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get a camera's inference settings
+    """
+    camera = db.query(Camera).filter(Camera.id == camera_id).first()
+    if not camera:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Camera with id {camera_id} not found"
+        )
+    
+    metadata = camera.camera_metadata or {}
+    return {field: metadata.get(field) for field in CameraInferenceSettings.__fields__}
+
+@router.put("/{camera_id}/inference", response_model=CameraInferenceSettings)
+def update_camera_inference_settings(
+    camera_id: int,
+    settings: CameraInferenceSettings,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Set a camera's inference settings
+    
+    - imgsz: model input size, e.g. 320 for a close-range webcam or 1280
+      for a wide 4K view; 'adaptive' lets the worker lower it while it is
+      behind and raise it again when there is spare capacity
+    - tiling: split large frames (e.g. 4K) into overlapping tiles that run
+      as one batch, so distant objects keep enough pixels
+    - cascade: re-check person and vehicle detections with the worker's
+      heavier second-stage model (e.g. for cameras covering core zones)
+    - confidence, classes, iou: minimum confidence, class names to report
+      and NMS IoU threshold, passed into the model's predict call
+    - motion: motion gate sensitivity, forced interval or enabled, e.g.
+      a higher sensitivity for a camera facing swaying vegetation
+    
+    Fields left out or null fall back to the worker defaults. Connected
+    workers get the change immediately.
+    """
+    db_camera = db.query(Camera).filter(Camera.id == camera_id).first()
+    if not db_camera:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Camera with id {camera_id} not found"
+        )
+    
+    # Check permissions
+    if db_camera.created_by != current_user.id and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this camera"
+        )
+    
+    # Reassign the dict so SQLAlchemy sees the JSON column change
+    metadata = dict(db_camera.camera_metadata or {})
+    for field, value in settings.dict().items():
+        if value is None:
+            metadata.pop(field, None)
+        else:
+            metadata[field] = value
+    db_camera.camera_metadata = metadata
+    db.commit()
+    db.refresh(db_camera)
+    
+    background_tasks.add_task(push_camera_config, camera_config(db_camera))
+    return settings
+
 @router.delete("/{camera_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_camera(
     camera_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -149,6 +300,8 @@ def delete_camera(
     db_camera.is_active = False
     db.commit()
     
+    # Stops the worker pulling its stream, if any
+    background_tasks.add_task(push_camera_config, camera_config(db_camera))
     return None
 
 @router.post("/{camera_id}/heartbeat")
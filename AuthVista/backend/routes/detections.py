@@ -3,29 +3,25 @@ Detection API routes
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 from geoalchemy2.elements import WKTElement
 from geoalchemy2.functions import ST_Contains
+from pydantic import ValidationError
 
 from database import get_db
-from models import Detection, Camera, Geofence, User
-from schemas import DetectionCreate, DetectionResponse
+from models import Detection, Camera, Geofence, Incident, IncidentStatus, User
+from schemas import DetectionCreate, DetectionResponse, DetectionBatchResponse
 from main import get_current_user
 
 router = APIRouter(prefix="/api/detections", tags=["detections"])
 
-@router.post("/", response_model=DetectionResponse, status_code=status.HTTP_201_CREATED)
-def create_detection(
-    detection: DetectionCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def _build_detection(detection: DetectionCreate, db: Session) -> Detection:
     """
-    Create a new detection record
+    Build a Detection row for a validated DetectionCreate
     
-    This endpoint is typically called by the inference worker when YOLO detects an object.
-    It automatically assigns the detection to a geofence if the camera has location data.
+    Resolves location from the camera and auto-assigns the geofence.
+    Raises 404 if the camera does not exist.
     """
     # Verify camera exists
     camera = db.query(Camera).filter(Camera.id == detection.camera_id).first()
@@ -48,7 +44,14 @@ def create_detection(
         snapshot_url=detection.snapshot_url,
         frame_id=detection.frame_id,
         latitude=lat,
-        longitude=lon
+        longitude=lon,
+        track_id=detection.track_id,
+        track_event=detection.track_event.value if detection.track_event else None,
+        first_seen_at=detection.first_seen_at,
+        last_seen_at=detection.last_seen_at,
+        dwell_seconds=detection.dwell_seconds,
+        frame_count=detection.frame_count,
+        model_version=detection.model_version
     )
     
     # Set PostGIS location if coordinates available
@@ -65,18 +68,67 @@ def create_detection(
         if geofence:
             db_detection.geofence_id = geofence.id
     
+    return db_detection
+
+@router.post("/", response_model=DetectionResponse, status_code=status.HTTP_201_CREATED)
+def create_detection(
+    detection: DetectionCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create a new detection record
+    
+    This endpoint is typically called by the inference worker when YOLO detects an object.
+    It automatically assigns the detection to a geofence if the camera has location data.
+    """
+    db_detection = _build_detection(detection, db)
+    
     db.add(db_detection)
     db.commit()
     db.refresh(db_detection)
     
     return db_detection
 
+@router.post("/batch", response_model=DetectionBatchResponse)
+def create_detections_batch(
+    detections: List[Dict[str, Any]],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many detection records in one request and one transaction
+    
+    Used by the inference worker outbox. Items are validated one by one so a
+    single bad detection is reported in `rejected` instead of failing the batch.
+    Created records are returned in request order.
+    """
+    db_detections = []
+    rejected = []
+    
+    for index, item in enumerate(detections):
+        try:
+            db_detections.append(_build_detection(DetectionCreate(**item), db))
+        except ValidationError as e:
+            rejected.append({"index": index, "error": str(e)})
+        except HTTPException as e:
+            rejected.append({"index": index, "error": str(e.detail)})
+    
+    db.add_all(db_detections)
+    db.commit()
+    for db_detection in db_detections:
+        db.refresh(db_detection)
+    
+    return {"created": db_detections, "rejected": rejected}
+
 @router.get("/", response_model=List[DetectionResponse])
 def list_detections(
     camera_id: Optional[int] = None,
     detection_class: Optional[str] = None,
     min_confidence: Optional[float] = None,
     geofence_id: Optional[int] = None,
+    track_id: Optional[str] = None,
+    track_event: Optional[str] = None,
     hours: Optional[int] = 24,  # Last N hours
     skip: int = 0,
     limit: int = 100,
@@ -91,6 +143,8 @@ def list_detections(
     - detection_class: Filter by class (person, car, weapon, etc.)
     - min_confidence: Minimum confidence threshold
     - geofence_id: Filter by geofence
+    - track_id: All events of one object track
+    - track_event: Filter by track event (start, update, end), e.g. 'end' for dwell times
     - hours: Look back period in hours (default: 24)
     """
     query = db.query(Detection)
@@ -108,10 +162,53 @@ def list_detections(
         query = query.filter(Detection.confidence >= min_confidence)
     if geofence_id:
         query = query.filter(Detection.geofence_id == geofence_id)
+    if track_id:
+        query = query.filter(Detection.track_id == track_id)
+    if track_event:
+        query = query.filter(Detection.track_event == track_event)
     
     detections = query.order_by(Detection.detected_at.desc()).offset(skip).limit(limit).all()
     return detections
 
+# Incidents whose evidence must be kept
+OPEN_INCIDENT_STATUSES = (IncidentStatus.OPEN, IncidentStatus.ACKNOWLEDGED, IncidentStatus.IN_PROGRESS)
+
+@router.get("/snapshots/protected")
+def list_protected_snapshots(
+    camera_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Snapshot paths that snapshot retention must not delete
+    
+    Used by the inference worker's retention manager. Covers the snapshots of
+    every detection linked to an open, acknowledged or in-progress incident,
+    and of every other event of the same object track.
+    
+    Query parameters:
+    - camera_id: Only snapshots of this camera
+    """
+    incident_detections = (
+        db.query(Detection.id, Detection.track_id)
+        .join(Incident, Incident.detection_id == Detection.id)
+        .filter(Incident.status.in_(OPEN_INCIDENT_STATUSES))
+        .all()
+    )
+    detection_ids = [row.id for row in incident_detections]
+    track_ids = [row.track_id for row in incident_detections if row.track_id]
+    if not detection_ids:
+        return {"snapshots": []}
+    
+    condition = Detection.id.in_(detection_ids)
+    if track_ids:
+        condition = condition | Detection.track_id.in_(track_ids)
+    query = db.query(Detection.snapshot_url).filter(condition, Detection.snapshot_url.isnot(None))
+    if camera_id:
+        query = query.filter(Detection.camera_id == camera_id)
+    
+    return {"snapshots": sorted({row.snapshot_url for row in query.all()})}
+
 @router.get("/{detection_id}", response_model=DetectionResponse)
 def get_detection(
     detection_id: int,
@@ -2,7 +2,7 @@
 Pydantic schemas for API request/response validation
 """
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal, Union
 from datetime import datetime
 from enum import Enum
 
@@ -19,6 +19,11 @@ class ZoneTypeEnum(str, Enum):
     BUFFER = "buffer"
     SAFE = "safe"
 
+class TrackEventEnum(str, Enum):
+    START = "start"
+    UPDATE = "update"
+    END = "end"
+
 class CameraTypeEnum(str, Enum):
     LAPTOP = "laptop"
     RTSP = "rtsp"
@@ -98,15 +103,94 @@ class CameraBase(BaseModel):
     longitude: Optional[float] = None
     heading: Optional[float] = None
 
+def validate_inference_metadata(metadata: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Check the inference settings in a camera's metadata like PUT /inference does"""
+    if metadata:
+        CameraInferenceSettings(**{key: value for key, value in metadata.items()
+                                   if key in CameraInferenceSettings.__fields__})
+    return metadata
+
 class CameraCreate(CameraBase):
     metadata: Dict[str, Any] = {}
 
+    _validate_metadata = validator('metadata', allow_reuse=True)(validate_inference_metadata)
+
 class CameraUpdate(BaseModel):
     name: Optional[str] = None
     url: Optional[str] = None
     status: Optional[str] = None
+    # Merged into camera_metadata; null values remove a key
     metadata: Optional[Dict[str, Any]] = None
 
+    _validate_metadata = validator('metadata', allow_reuse=True)(validate_inference_metadata)
+
+class CameraRoi(BaseModel):
+    """
+    Region of interest for inference, stored in camera_metadata['roi']
+    Polygons are lists of [x, y] points normalized to 0-1 of the frame size;
+    no polygons means the whole frame
+    """
+    polygons: List[List[List[float]]] = []
+    min_overlap: float = Field(0.5, ge=0, le=1)  # Fraction of a bbox that must lie inside the ROI
+
+    @validator('polygons')
+    def validate_polygons(cls, polygons):
+        for polygon in polygons:
+            if len(polygon) < 3:
+                raise ValueError('ROI polygons need at least 3 points')
+            for point in polygon:
+                if len(point) != 2 or not all(0 <= value <= 1 for value in point):
+                    raise ValueError('ROI points must be [x, y] pairs between 0 and 1')
+        return polygons
+
+class TilingSettings(BaseModel):
+    """Tiled inference: rows x cols overlapping tiles, plus the whole frame if full_frame"""
+    rows: int = Field(2, ge=1, le=8)
+    cols: int = Field(2, ge=1, le=8)
+    overlap: float = Field(0.2, ge=0, le=0.5)  # Fraction of a tile shared with its neighbour
+    full_frame: bool = True
+    nms_threshold: float = Field(0.6, gt=0, le=1)  # Overlap (of the smaller box) that merges two boxes
+
+class MotionSettings(BaseModel):
+    """Motion gate of one camera; null fields fall back to the worker's MOTION_* settings"""
+    sensitivity: Optional[float] = Field(None, gt=0, le=1)  # Fraction of changed pixels that counts as motion
+    force_interval: Optional[float] = Field(None, gt=0)  # Max seconds between inferences
+    enabled: Optional[bool] = None
+
+class CameraInferenceSettings(BaseModel):
+    """
+    Per-camera inference settings, stored in camera_metadata
+    imgsz: model input size in pixels, 'adaptive' to follow worker load,
+    or None for the model default
+    tiling: tiled inference for high-resolution cameras, None to disable
+    cascade: re-check person / vehicle detections with the second-stage
+    model, None for the worker default
+    confidence, classes, iou: detection filtering applied inside the
+    model's NMS, None for the worker's CONFIDENCE_THRESHOLD, all of its
+    classes and the model's default IoU
+    motion: motion gate sensitivity, forced interval and on/off, None for
+    the worker's MOTION_* settings
+    """
+    imgsz: Optional[Union[int, Literal['adaptive']]] = None
+    tiling: Optional[TilingSettings] = None
+    cascade: Optional[bool] = None
+    confidence: Optional[float] = Field(None, gt=0, lt=1)
+    classes: Optional[List[str]] = None  # Class names to report, e.g. ["person", "elephant"]
+    iou: Optional[float] = Field(None, gt=0, le=1)  # NMS IoU threshold
+    motion: Optional[MotionSettings] = None
+
+    @validator('imgsz')
+    def validate_imgsz(cls, imgsz):
+        if isinstance(imgsz, int) and not 64 <= imgsz <= 2048:
+            raise ValueError('imgsz must be between 64 and 2048 pixels')
+        return imgsz
+
+    @validator('classes')
+    def validate_classes(cls, classes):
+        if classes is not None and not classes:
+            raise ValueError('classes must name at least one class (null for all)')
+        return classes
+
 class CameraResponse(CameraBase):
     id: int
     status: str
@@ -135,6 +219,13 @@ class DetectionCreate(BaseModel):
     frame_id: Optional[str] = None
     latitude: Optional[float] = None
     longitude: Optional[float] = None
+    track_id: Optional[str] = None
+    track_event: Optional[TrackEventEnum] = None
+    first_seen_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+    dwell_seconds: Optional[float] = Field(None, ge=0.0)
+    frame_count: Optional[int] = Field(None, ge=0)
+    model_version: Optional[str] = None
 
 class DetectionResponse(BaseModel):
     id: int
@@ -147,10 +238,25 @@ class DetectionResponse(BaseModel):
     longitude: Optional[float]
     geofence_id: Optional[int]
     detected_at: datetime
+    track_id: Optional[str] = None
+    track_event: Optional[str] = None
+    first_seen_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+    dwell_seconds: Optional[float] = None
+    frame_count: Optional[int] = None
+    model_version: Optional[str] = None
     
     class Config:
         from_attributes = True
 
+class DetectionBatchRejection(BaseModel):
+    index: int
+    error: str
+
+class DetectionBatchResponse(BaseModel):
+    created: List[DetectionResponse]
+    rejected: List[DetectionBatchRejection] = []
+
 # ==================== WEBSOCKET MESSAGES ====================
 
 class DetectionEvent(BaseModel):
@@ -170,3 +276,9 @@ class AlertEvent(BaseModel):
     detection_id: Optional[int]
     snapshot_url: Optional[str]
     created_at: datetime
+
+# ==================== WORKER SCHEMAS ====================
+
+class ModelSwapRequest(BaseModel):
+    """Model file for inference workers to swap to, None to reload their MODEL_PATH"""
+    model_path: Optional[str] = None
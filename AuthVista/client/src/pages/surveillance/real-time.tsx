@@ -235,17 +235,23 @@ export default function SurveillanceRealTime() {
     // Draw video frame to canvas
     ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
     
-    // Convert canvas to base64 JPEG
-    const frameData = canvas.toDataURL('image/jpeg', 0.8);
-    const base64Frame = frameData.split(',')[1]; // Remove data:image/jpeg;base64, prefix
+    const timestamp = new Date().toISOString();
     
-    // Send frame to backend
-    socketRef.current.emit('frame:ingest', {
-      frame: base64Frame,
-      camera_id: parseInt(selectedCamera),
-      geofence_id: parseInt(selectedGeofence),
-      timestamp: new Date().toISOString()
-    });
+    // Encode canvas to JPEG and send raw bytes as a binary attachment
+    // (no base64 inflation; the backend still accepts base64 'frame' payloads)
+    canvas.toBlob(async (blob) => {
+      if (!blob || !socketRef.current?.connected) return;
+      
+      const jpeg = await blob.arrayBuffer();
+      
+      // Send frame to backend
+      socketRef.current.emit('frame:ingest', {
+        jpeg,
+        camera_id: parseInt(selectedCamera),
+        geofence_id: parseInt(selectedGeofence),
+        timestamp
+      });
+    }, 'image/jpeg', 0.8);
   }, [selectedCamera, selectedGeofence]);
   
   // Draw bounding boxes on canvas overlay